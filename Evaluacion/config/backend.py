@@ -0,0 +1,237 @@
+import threading
+import weakref
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+
+class BackendBD(ABC):
+    """Base común de los motores de BD usados por los modelos.
+
+    Cada motor implementa conectar/desconectar, la entrega y devolución de
+    conexiones y la ejecución idempotente de DDL; el manejo de transacciones y el registro
+    de cursores reutilizables es compartido.
+    """
+
+    dialecto = None
+
+    def __init__(self, stmtcachesize: int = 40, arraysize: int = 500, prefetchrows: int = 100):
+        """Inicializa el estado compartido por todos los motores.
+
+        arraysize y prefetchrows son los valores por defecto de iterar_filas().
+        """
+        self.connection = None
+        self.stmtcachesize = stmtcachesize
+        self.arraysize = arraysize
+        self.prefetchrows = prefetchrows
+        self._cursores = weakref.WeakKeyDictionary()
+        self._lock_cursores = threading.Lock()
+        self._aciertos_cursor = 0
+        self._fallos_cursor = 0
+        self._local = threading.local()
+
+    @abstractmethod
+    def conectar(self):
+        """Abre la conexión (o el pool) con la BD."""
+
+    @abstractmethod
+    def desconectar(self):
+        """Cierra la conexión (o el pool) con la BD."""
+
+    @abstractmethod
+    def ejecutar_ddl(self, cursor, ddl: str):
+        """Ejecuta una sentencia DDL ignorando los errores de objeto ya existente."""
+
+    @abstractmethod
+    def plan_ejecucion(self, cursor, sql: str, parametros=None) -> list:
+        """Devuelve, línea a línea, el plan de ejecución que el motor elige para sql."""
+
+    @abstractmethod
+    def _adquirir_conexion(self):
+        """Entrega una conexión lista para usar."""
+
+    def _liberar_conexion(self, conn):
+        """Devuelve una conexión entregada por _adquirir_conexion."""
+
+    def _iniciar_transaccion(self, conn):
+        """Marca el inicio explícito de una transacción si el motor lo requiere."""
+
+    def obtener_cursor(self):
+        """Genera y devuelve un cursor para la BD (modo conexión única)."""
+        if not self.connection:
+            self.conectar()
+        return self.connection.cursor()
+
+    @contextmanager
+    def conexion(self):
+        """Entrega una conexión para usar dentro de un bloque with.
+
+        La conexión se devuelve al motor al salir del bloque. Dentro de
+        transaccion() se entrega la conexión de la transacción en curso del hilo.
+        """
+        conn_transaccion = getattr(self._local, 'conn', None)
+        if conn_transaccion is not None:
+            yield conn_transaccion
+            return
+
+        conn = self._adquirir_conexion()
+        try:
+            yield conn
+        finally:
+            self._liberar_conexion(conn)
+
+    @contextmanager
+    def transaccion(self):
+        """Abre un ámbito transaccional que confirma una sola vez al salir.
+
+        Los ámbitos anidados en el mismo hilo reutilizan la conexión y se protegen con
+        un SAVEPOINT: si fallan solo se deshace su parte y la excepción se propaga.
+        """
+        estado = self._local
+        if getattr(estado, 'conn', None) is not None:
+            estado.nivel += 1
+            nombre = f"sp_nivel_{estado.nivel}"
+            try:
+                self._ejecutar_control(estado.conn, f"SAVEPOINT {nombre}")
+                try:
+                    yield estado.conn
+                except BaseException:
+                    self._ejecutar_control(estado.conn, f"ROLLBACK TO SAVEPOINT {nombre}")
+                    raise
+            finally:
+                estado.nivel -= 1
+            return
+
+        with self.conexion() as conn:
+            estado.conn = conn
+            estado.nivel = 0
+            try:
+                self._iniciar_transaccion(conn)
+                yield conn
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+            finally:
+                estado.conn = None
+
+    def iterar_filas(self, sql: str, parametros=None, arraysize: int = None, prefetchrows: int = None,
+                     fabrica=None):
+        """Genera las filas de una consulta a medida que llegan desde la BD.
+
+        La primera fila llega con la ejecución (prefetchrows) y el resto en lotes de
+        arraysize, por lo que la memoria usada no depende del tamaño de la tabla. La
+        conexión queda tomada hasta que el generador se agota o se cierra. Con fabrica,
+        cada fila se entrega como fabrica(*columnas) (rowfactory del cursor).
+        """
+        with self.conexion() as conn, conn.cursor() as cursor:
+            cursor.arraysize = arraysize or self.arraysize
+            cursor.prefetchrows = prefetchrows or self.prefetchrows
+            if parametros is None:
+                cursor.execute(sql)
+            else:
+                cursor.execute(sql, parametros)
+            if fabrica is not None:
+                cursor.rowfactory = fabrica
+            yield from cursor
+
+    def pagina_filas(self, sql: str, parametros: dict, tamano: int, fabrica=None):
+        """Ejecuta una consulta paginada por clave y devuelve (filas, hay_mas).
+
+        sql debe terminar en FETCH FIRST :limite ROWS ONLY; se pide una fila extra
+        para saber si existe una página siguiente sin contar la tabla completa.
+        """
+        parametros = dict(parametros, limite=tamano + 1)
+        with self.conexion() as conn, conn.cursor() as cursor:
+            cursor.arraysize = tamano + 1
+            cursor.prefetchrows = tamano + 2
+            cursor.execute(sql, parametros)
+            if fabrica is not None:
+                cursor.rowfactory = fabrica
+            filas = cursor.fetchall()
+        return filas[:tamano], len(filas) > tamano
+
+    def pagina_segmentos(self, segmentos, tamano: int, fabrica=None):
+        """Llena una página recorriendo varias consultas en orden y devuelve (filas, hay_mas).
+
+        segmentos es una lista de (sql, parametros) como los de pagina_filas; el siguiente
+        solo se consulta si el anterior no alcanzó a llenar la página.
+        """
+        filas = []
+        for sql, parametros in segmentos:
+            resto, hay_mas = self.pagina_filas(sql, parametros, tamano - len(filas), fabrica)
+            filas.extend(resto)
+            if hay_mas:
+                return filas, True
+        return filas, False
+
+    def _ejecutar_control(self, conn, sentencia: str):
+        """Ejecuta una sentencia de control de transacción (SAVEPOINT, ROLLBACK TO)."""
+        with conn.cursor() as cursor:
+            cursor.execute(sentencia)
+
+    def cursor_reutilizable(self, conn, sql: str):
+        """Devuelve un cursor de la conexión dedicado a la sentencia sql.
+
+        El cursor se conserva entre llamadas, por lo que ejecutar de nuevo la misma
+        sentencia no requiere volver a prepararla. No debe cerrarse al terminar.
+
+        La reutilización entre llamadas solo ocurre en modo de conexión única. Con pool,
+        el cursor dura lo que dura el bloque conexion() y se cierra al devolver la sesión
+        (ver _soltar_cursores); entre bloques solo evita el reparseo la caché de
+        sentencias de la sesión (stmtcachesize), y estadisticas_sentencias() cuenta fallos.
+        """
+        with self._lock_cursores:
+            por_sentencia = self._cursores.get(conn)
+            if por_sentencia is None:
+                por_sentencia = {}
+                self._cursores[conn] = por_sentencia
+            cursor = por_sentencia.get(sql)
+            if cursor is not None:
+                self._aciertos_cursor += 1
+                return cursor
+            self._fallos_cursor += 1
+        cursor = conn.cursor()
+        cursor.prepare(sql)
+        with self._lock_cursores:
+            por_sentencia[sql] = cursor
+        return cursor
+
+    def _soltar_cursores(self, conn):
+        """Cierra los cursores reutilizables de una conexión que se devuelve al pool.
+
+        Cada pool.acquire() entrega un objeto de conexión nuevo, por lo que sus cursores
+        no volverían a usarse; la sesión conserva igual su caché de sentencias.
+        """
+        with self._lock_cursores:
+            por_sentencia = self._cursores.pop(conn, None)
+        for cursor in (por_sentencia or {}).values():
+            try:
+                cursor.close()
+            except Exception:
+                pass
+
+    def _cerrar_cursores(self):
+        """Cierra los cursores reutilizables de todas las conexiones."""
+        with self._lock_cursores:
+            registros = list(self._cursores.values())
+            self._cursores.clear()
+        for por_sentencia in registros:
+            for cursor in por_sentencia.values():
+                try:
+                    cursor.close()
+                except Exception:
+                    pass
+
+    def estadisticas_sentencias(self) -> dict:
+        """Devuelve aciertos y fallos del registro de cursores reutilizables."""
+        with self._lock_cursores:
+            return {
+                'aciertos': self._aciertos_cursor,
+                'fallos': self._fallos_cursor,
+                'cursores_abiertos': sum(len(c) for c in self._cursores.values()),
+                'stmtcachesize': self.stmtcachesize
+            }
+
+    def estadisticas_pool(self) -> dict:
+        """Devuelve el estado de las conexiones del motor."""
+        return {'modo': 'conexion_unica', 'ocupadas': 1 if self.connection else 0,
+                'abiertas': 1 if self.connection else 0}
@@ -0,0 +1,241 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+
+import oracledb
+
+
+class ConexionOracleAsync:
+    """Conexión Oracle para asyncio (oracledb.connect_async / create_pool_async).
+
+    Ofrece la misma interfaz que BackendBD (conexion, transaccion, iterar_filas,
+    pagina_filas) pero con corrutinas, de modo que un solo bucle de eventos puede
+    tener muchas consultas en curso a la vez. El esquema se valida con la conexión
+    síncrona (validar_tablas) antes de usar esta clase.
+    """
+
+    dialecto = "oracle"
+
+    def __init__(self, usuario: str, password: str, url: str, usar_pool: bool = True,
+                 pool_min: int = 1, pool_max: int = 16, pool_incremento: int = 1, pool_espera_ms: int = 5000,
+                 stmtcachesize: int = 40, arraysize: int = 500, prefetchrows: int = 100):
+        """Inicializa la conexión con credenciales y URL.
+
+        Con usar_pool=True (por defecto) cada tarea toma su propia sesión del pool,
+        que es lo que permite ejecutar consultas en paralelo; con False todas las
+        tareas comparten una única conexión y sus consultas se serializan.
+        """
+        self.usuario = usuario
+        self.password = password
+        self.url = url
+        self.usar_pool = usar_pool
+        self.pool_min = pool_min
+        self.pool_max = pool_max
+        self.pool_incremento = pool_incremento
+        self.pool_espera_ms = pool_espera_ms
+        self.stmtcachesize = stmtcachesize
+        self.arraysize = arraysize
+        self.prefetchrows = prefetchrows
+        self.connection = None
+        self.pool = None
+        self._lock_conexion = asyncio.Lock()
+        self._transacciones = {}
+        self._adquisiciones = 0
+        self._espera_total = 0.0
+        self._espera_maxima = 0.0
+
+    async def conectar(self):
+        """Crea el pool (o la conexión única) con la BD."""
+        try:
+            if self.usar_pool:
+                self.pool = oracledb.create_pool_async(
+                    user=self.usuario,
+                    password=self.password,
+                    dsn=self.url,
+                    min=self.pool_min,
+                    max=self.pool_max,
+                    increment=self.pool_incremento,
+                    getmode=oracledb.POOL_GETMODE_TIMEDWAIT,
+                    wait_timeout=self.pool_espera_ms,
+                    stmtcachesize=self.stmtcachesize
+                )
+                print(f"[INFO]: Pool asíncrono creado (min={self.pool_min}, max={self.pool_max}).")
+            else:
+                self.connection = await oracledb.connect_async(
+                    user=self.usuario,
+                    password=self.password,
+                    dsn=self.url,
+                    stmtcachesize=self.stmtcachesize
+                )
+                print("[INFO]: Conectado a BD (asyncio) correctamente.")
+        except oracledb.DatabaseError as e:
+            error, = e.args
+            print(f"[ERROR]: No se pudo conectar a BD → {error.message}")
+
+    async def desconectar(self):
+        """Cierra el pool o la conexión única si existen."""
+        if self.pool:
+            await self.pool.close(force=True)
+            self.pool = None
+            print("[INFO]: Pool asíncrono cerrado correctamente.")
+        if self.connection:
+            await self.connection.close()
+            self.connection = None
+            print("[INFO]: Conexión a BD cerrada correctamente.")
+
+    async def _adquirir_conexion(self):
+        """Entrega una sesión del pool, o la conexión única en exclusiva."""
+        if not self.usar_pool:
+            await self._lock_conexion.acquire()
+            if not self.connection:
+                await self.conectar()
+            return self.connection
+
+        if not self.pool:
+            await self.conectar()
+        inicio = time.perf_counter()
+        conn = await self.pool.acquire()
+        espera = time.perf_counter() - inicio
+        self._adquisiciones += 1
+        self._espera_total += espera
+        self._espera_maxima = max(self._espera_maxima, espera)
+        return conn
+
+    async def _liberar_conexion(self, conn):
+        """Devuelve la sesión al pool o libera la conexión única."""
+        if not self.usar_pool:
+            self._lock_conexion.release()
+        elif self.pool:
+            await self.pool.release(conn)
+
+    @asynccontextmanager
+    async def conexion(self):
+        """Entrega una conexión para usar dentro de un bloque async with.
+
+        Dentro de transaccion() se entrega la conexión de la transacción en curso de la tarea.
+        """
+        estado = self._transacciones.get(asyncio.current_task())
+        if estado is not None:
+            yield estado['conn']
+            return
+
+        conn = await self._adquirir_conexion()
+        try:
+            yield conn
+        finally:
+            await self._liberar_conexion(conn)
+
+    @asynccontextmanager
+    async def transaccion(self):
+        """Abre un ámbito transaccional que confirma una sola vez al salir.
+
+        El estado se guarda por tarea de asyncio (como threading.local en BackendBD);
+        los ámbitos anidados de la misma tarea se protegen con un SAVEPOINT.
+        """
+        tarea = asyncio.current_task()
+        estado = self._transacciones.get(tarea)
+        if estado is not None:
+            estado['nivel'] += 1
+            nombre = f"sp_nivel_{estado['nivel']}"
+            try:
+                await self._ejecutar_control(estado['conn'], f"SAVEPOINT {nombre}")
+                try:
+                    yield estado['conn']
+                except BaseException:
+                    await self._ejecutar_control(estado['conn'], f"ROLLBACK TO SAVEPOINT {nombre}")
+                    raise
+            finally:
+                estado['nivel'] -= 1
+            return
+
+        async with self.conexion() as conn:
+            self._transacciones[tarea] = {'conn': conn, 'nivel': 0}
+            try:
+                yield conn
+                await conn.commit()
+            except BaseException:
+                await conn.rollback()
+                raise
+            finally:
+                del self._transacciones[tarea]
+
+    async def _ejecutar_control(self, conn, sentencia: str):
+        """Ejecuta una sentencia de control de transacción (SAVEPOINT, ROLLBACK TO)."""
+        with conn.cursor() as cursor:
+            await cursor.execute(sentencia)
+
+    async def obtener_fila(self, sql: str, parametros=None):
+        """Ejecuta una consulta y devuelve su primera fila (o None)."""
+        async with self.conexion() as conn:
+            with conn.cursor() as cursor:
+                await cursor.execute(sql, parametros)
+                return await cursor.fetchone()
+
+    async def obtener_filas(self, sql: str, parametros=None) -> list:
+        """Ejecuta una consulta y devuelve todas sus filas."""
+        async with self.conexion() as conn:
+            with conn.cursor() as cursor:
+                cursor.arraysize = self.arraysize
+                await cursor.execute(sql, parametros)
+                return await cursor.fetchall()
+
+    async def ejecutar(self, sql: str, parametros=None) -> int:
+        """Ejecuta una sentencia DML dentro de transaccion() y devuelve las filas afectadas."""
+        async with self.transaccion() as conn:
+            with conn.cursor() as cursor:
+                await cursor.execute(sql, parametros)
+                return cursor.rowcount
+
+    async def iterar_filas(self, sql: str, parametros=None, arraysize: int = None, prefetchrows: int = None,
+                           fabrica=None):
+        """Genera (async for) las filas de una consulta a medida que llegan desde la BD."""
+        async with self.conexion() as conn:
+            with conn.cursor() as cursor:
+                cursor.arraysize = arraysize or self.arraysize
+                cursor.prefetchrows = prefetchrows or self.prefetchrows
+                await cursor.execute(sql, parametros)
+                if fabrica is not None:
+                    cursor.rowfactory = fabrica
+                async for fila in cursor:
+                    yield fila
+
+    async def pagina_filas(self, sql: str, parametros: dict, tamano: int, fabrica=None):
+        """Ejecuta una consulta paginada por clave y devuelve (filas, hay_mas); ver BackendBD.pagina_filas."""
+        parametros = dict(parametros, limite=tamano + 1)
+        async with self.conexion() as conn:
+            with conn.cursor() as cursor:
+                cursor.arraysize = tamano + 1
+                cursor.prefetchrows = tamano + 2
+                await cursor.execute(sql, parametros)
+                if fabrica is not None:
+                    cursor.rowfactory = fabrica
+                filas = await cursor.fetchall()
+        return filas[:tamano], len(filas) > tamano
+
+    async def pagina_segmentos(self, segmentos, tamano: int, fabrica=None):
+        """Llena una página recorriendo varias consultas en orden; ver BackendBD.pagina_segmentos."""
+        filas = []
+        for sql, parametros in segmentos:
+            resto, hay_mas = await self.pagina_filas(sql, parametros, tamano - len(filas), fabrica)
+            filas.extend(resto)
+            if hay_mas:
+                return filas, True
+        return filas, False
+
+    def estadisticas_pool(self) -> dict:
+        """Devuelve el estado del pool: sesiones ocupadas, abiertas y tiempos de espera."""
+        if not self.pool:
+            return {'modo': 'conexion_unica', 'ocupadas': 1 if self._lock_conexion.locked() else 0,
+                    'abiertas': 1 if self.connection else 0}
+        adquisiciones = self._adquisiciones
+        return {
+            'modo': 'pool_async',
+            'ocupadas': self.pool.busy,
+            'abiertas': self.pool.opened,
+            'minimo': self.pool.min,
+            'maximo': self.pool.max,
+            'adquisiciones': adquisiciones,
+            'espera_total_ms': self._espera_total * 1000,
+            'espera_promedio_ms': (self._espera_total / adquisiciones * 1000) if adquisiciones else 0.0,
+            'espera_maxima_ms': self._espera_maxima * 1000
+        }
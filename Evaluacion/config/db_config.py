@@ -1,221 +1,156 @@
+import threading
+import time
+
 import oracledb
 
-class ConexionOracle:
+from config.backend import BackendBD
+from config.migraciones import aplicar_migraciones
+
+class ConexionOracle(BackendBD):
     """Clase para conexión de BD Oracle."""
 
-    def __init__(self, usuario: str, password: str, url: str):
-        """Inicializa la conexión con credenciales y URL."""
+    dialecto = "oracle"
+
+    def __init__(self, usuario: str, password: str, url: str, usar_pool: bool = False,
+                 pool_min: int = 1, pool_max: int = 4, pool_incremento: int = 1, pool_espera_ms: int = 5000,
+                 stmtcachesize: int = 40, arraysize: int = 500, prefetchrows: int = 100):
+        """Inicializa la conexión con credenciales y URL.
+
+        Con usar_pool=True se crea un pool de sesiones (oracledb.create_pool) en lugar
+        de la conexión única; pool_espera_ms es el tiempo máximo de espera por una sesión libre.
+        stmtcachesize es el tamaño de la caché de sentencias de cada conexión; arraysize
+        y prefetchrows ajustan la lectura por lotes de los listados.
+        """
+        super().__init__(stmtcachesize, arraysize, prefetchrows)
         self.usuario = usuario
         self.password = password
         self.url = url
-        self.connection = None
+        self.usar_pool = usar_pool
+        self.pool_min = pool_min
+        self.pool_max = pool_max
+        self.pool_incremento = pool_incremento
+        self.pool_espera_ms = pool_espera_ms
+        self.pool = None
+        self._lock_stats = threading.Lock()
+        self._adquisiciones = 0
+        self._espera_total = 0.0
+        self._espera_maxima = 0.0
 
     def conectar(self):
         """Genera la conexión con la BD según datos recibidos."""
         try:
-            self.connection = oracledb.connect(
-                user=self.usuario,
-                password=self.password,
-                dsn=self.url
-            )
-            print("[INFO]: Conectado a BD correctamente.")
+            if self.usar_pool:
+                self.pool = oracledb.create_pool(
+                    user=self.usuario,
+                    password=self.password,
+                    dsn=self.url,
+                    min=self.pool_min,
+                    max=self.pool_max,
+                    increment=self.pool_incremento,
+                    getmode=oracledb.POOL_GETMODE_TIMEDWAIT,
+                    wait_timeout=self.pool_espera_ms,
+                    stmtcachesize=self.stmtcachesize
+                )
+                print(f"[INFO]: Pool de conexiones creado (min={self.pool_min}, max={self.pool_max}).")
+            else:
+                self.connection = oracledb.connect(
+                    user=self.usuario,
+                    password=self.password,
+                    dsn=self.url,
+                    stmtcachesize=self.stmtcachesize
+                )
+                print("[INFO]: Conectado a BD correctamente.")
         except oracledb.DatabaseError as e:
             error, = e.args
             print(f"[ERROR]: No se pudo conectar a BD → {error.message}")
 
     def desconectar(self):
-        """Finaliza la conexión activa si existe."""
+        """Finaliza la conexión activa (o el pool) si existe."""
+        self._cerrar_cursores()
+        if self.pool:
+            self.pool.close(force=True)
+            self.pool = None
+            print("[INFO]: Pool de conexiones cerrado correctamente.")
         if self.connection:
             self.connection.close()
             self.connection = None
             print("[INFO]: Conexión a BD cerrada correctamente.")
 
-    def obtener_cursor(self):
-        """Genera y devuelve un cursor para la BD."""
-        if not self.connection:
+    def ejecutar_ddl(self, cursor, ddl: str):
+        """Ejecuta el DDL en un bloque PL/SQL que ignora los errores de objeto ya existente.
+
+        ORA-00955 (nombre en uso), ORA-01430 (columna existente), ORA-01408 (columnas ya
+        indexadas), ORA-02260/02261 (clave ya definida) y ORA-02275 (FK existente).
+        """
+        cursor.execute(f"""
+            BEGIN
+                EXECUTE IMMEDIATE '{ddl.replace("'", "''")}';
+            EXCEPTION
+                WHEN OTHERS THEN
+                    IF SQLCODE NOT IN (-955, -1430, -1408, -2260, -2261, -2275) THEN RAISE; END IF;
+            END;
+        """)
+
+    def plan_ejecucion(self, cursor, sql: str, parametros=None) -> list:
+        """Obtiene el plan con EXPLAIN PLAN y DBMS_XPLAN; los binds no necesitan valores."""
+        cursor.execute(f"EXPLAIN PLAN FOR {sql}")
+        cursor.execute("SELECT plan_table_output FROM TABLE(DBMS_XPLAN.DISPLAY())")
+        return [fila[0] for fila in cursor.fetchall()]
+
+    def _adquirir_conexion(self):
+        """Entrega la conexión única o una sesión del pool."""
+        if not self.usar_pool:
+            if not self.connection:
+                self.conectar()
+            return self.connection
+
+        if not self.pool:
             self.conectar()
-        return self.connection.cursor()
+        inicio = time.perf_counter()
+        conn = self.pool.acquire()
+        self._registrar_espera(time.perf_counter() - inicio)
+        return conn
+
+    def _liberar_conexion(self, conn):
+        """Devuelve la sesión al pool; la conexión única se mantiene abierta."""
+        if self.usar_pool and self.pool:
+            self._soltar_cursores(conn)
+            self.pool.release(conn)
+
+    def _registrar_espera(self, segundos: float):
+        """Acumula el tiempo que se esperó por una sesión del pool."""
+        with self._lock_stats:
+            self._adquisiciones += 1
+            self._espera_total += segundos
+            self._espera_maxima = max(self._espera_maxima, segundos)
+
+    def estadisticas_pool(self) -> dict:
+        """Devuelve el estado del pool: sesiones ocupadas, abiertas y tiempos de espera."""
+        with self._lock_stats:
+            adquisiciones = self._adquisiciones
+            espera_total = self._espera_total
+            espera_maxima = self._espera_maxima
+        if not self.pool:
+            return super().estadisticas_pool()
+        return {
+            'modo': 'pool',
+            'ocupadas': self.pool.busy,
+            'abiertas': self.pool.opened,
+            'minimo': self.pool.min,
+            'maximo': self.pool.max,
+            'adquisiciones': adquisiciones,
+            'espera_total_ms': espera_total * 1000,
+            'espera_promedio_ms': (espera_total / adquisiciones * 1000) if adquisiciones else 0.0,
+            'espera_maxima_ms': espera_maxima * 1000
+        }
 
 
 
 
 def validar_tablas(db):
-    """Crea las tablas necesarias si no existen."""
-
-
-
-    sql_usuario = """
-        BEGIN
-            EXECUTE IMMEDIATE '
-                CREATE TABLE rr_usuario (
-                    id NUMBER GENERATED BY DEFAULT AS IDENTITY,
-                    nombre_usuario VARCHAR2(60) UNIQUE,
-                    clave VARCHAR2(255),
-                    nombre VARCHAR2(100),
-                    apellido VARCHAR2(100),
-                    fecha_nacimiento DATE,
-                    telefono VARCHAR2(50),
-                    email VARCHAR2(100),
-                    tipo VARCHAR2(20),
-                    CONSTRAINT pk_usuario PRIMARY KEY (id)
-                )
-            ';
-        EXCEPTION
-            WHEN OTHERS THEN
-                IF SQLCODE != -955 THEN RAISE; END IF;
-        END;
-    """
-
-    sql_paciente = """
-        BEGIN
-            EXECUTE IMMEDIATE '
-                CREATE TABLE rr_paciente (
-                    id_paciente NUMBER PRIMARY KEY,
-                    comuna VARCHAR2(100),
-                    fecha_primera_visita DATE,
-                    CONSTRAINT fk_paciente_usuario FOREIGN KEY (id_paciente) REFERENCES rr_usuario(id)
-                )
-            ';
-        EXCEPTION
-            WHEN OTHERS THEN
-                IF SQLCODE != -955 THEN RAISE; END IF;
-        END;
-    """
-
-    sql_medico = """
-        BEGIN
-            EXECUTE IMMEDIATE '
-                CREATE TABLE rr_medico (
-                    id_medico NUMBER PRIMARY KEY,
-                    especialidad VARCHAR2(100),
-                    horario_atencion VARCHAR2(100),
-                    fecha_ingreso DATE,
-                    CONSTRAINT fk_medico_usuario FOREIGN KEY (id_medico) REFERENCES rr_usuario(id)
-                )
-            ';
-        EXCEPTION
-            WHEN OTHERS THEN
-                IF SQLCODE != -955 THEN RAISE; END IF;
-        END;
-    """
-
-    sql_insumos = """
-        BEGIN
-            EXECUTE IMMEDIATE '
-                CREATE TABLE rr_insumos (
-                    id NUMBER GENERATED BY DEFAULT AS IDENTITY,
-                    nombre VARCHAR2(100),
-                    tipo VARCHAR2(50),
-                    stock NUMBER,
-                    costo_usd NUMBER,
-                    CONSTRAINT pk_insumos PRIMARY KEY (id)
-                )
-            ';
-        EXCEPTION
-            WHEN OTHERS THEN
-                IF SQLCODE != -955 THEN RAISE; END IF;
-        END;
-    """
-
-    sql_recetas = """
-        BEGIN
-            EXECUTE IMMEDIATE '
-                CREATE TABLE rr_recetas (
-                    id NUMBER GENERATED BY DEFAULT AS IDENTITY,
-                    id_paciente NUMBER,
-                    id_medico NUMBER,
-                    descripcion VARCHAR2(500),
-                    medicamentos_recetados VARCHAR2(500),
-                    costo_clp NUMBER,
-                    CONSTRAINT pk_recetas PRIMARY KEY (id),
-                    CONSTRAINT fk_recetas_paciente FOREIGN KEY (id_paciente) REFERENCES rr_paciente(id_paciente),
-                    CONSTRAINT fk_recetas_medico FOREIGN KEY (id_medico) REFERENCES rr_medico(id_medico)
-                )
-            ';
-        EXCEPTION
-            WHEN OTHERS THEN
-                IF SQLCODE != -955 THEN RAISE; END IF;
-        END;
-    """
-
-
-    sql_consultas = """
-        BEGIN
-            EXECUTE IMMEDIATE '
-                CREATE TABLE rr_consultas (
-                    id NUMBER GENERATED BY DEFAULT AS IDENTITY,
-                    id_paciente NUMBER,
-                    id_medico NUMBER,
-                    id_receta NUMBER,
-                    fecha DATE,
-                    comentarios VARCHAR2(500),
-                    valor NUMBER,
-                    CONSTRAINT pk_consultas PRIMARY KEY (id),
-                    CONSTRAINT fk_consultas_paciente FOREIGN KEY (id_paciente) REFERENCES rr_paciente(id_paciente),
-                    CONSTRAINT fk_consultas_medico FOREIGN KEY (id_medico) REFERENCES rr_medico(id_medico),
-                    CONSTRAINT fk_consultas_receta FOREIGN KEY (id_receta) REFERENCES rr_recetas(id)
-                )
-            ';
-        EXCEPTION
-            WHEN OTHERS THEN
-                IF SQLCODE != -955 THEN RAISE; END IF;
-        END;
-    """
-
-    sql_agenda = """
-        BEGIN
-            EXECUTE IMMEDIATE '
-                CREATE TABLE rr_agenda (
-                    id NUMBER GENERATED BY DEFAULT AS IDENTITY,
-                    id_paciente NUMBER,
-                    id_medico NUMBER,
-                    fecha_consulta DATE,
-                    estado VARCHAR2(20),
-                    CONSTRAINT pk_agenda PRIMARY KEY (id),
-                    CONSTRAINT fk_agenda_paciente FOREIGN KEY (id_paciente) REFERENCES rr_paciente(id_paciente),
-                    CONSTRAINT fk_agenda_medico FOREIGN KEY (id_medico) REFERENCES rr_medico(id_medico)
-                )
-            ';
-        EXCEPTION
-            WHEN OTHERS THEN
-                IF SQLCODE != -955 THEN RAISE; END IF;
-        END;
-    """
-
-    sql_receta_insumos = """
-        BEGIN
-            EXECUTE IMMEDIATE '
-                CREATE TABLE rr_receta_insumos (
-                    id NUMBER GENERATED BY DEFAULT AS IDENTITY,
-                    id_receta NUMBER NOT NULL,
-                    id_insumo NUMBER NOT NULL,
-                    cantidad NUMBER DEFAULT 1,
-                    CONSTRAINT pk_receta_insumos PRIMARY KEY (id),
-                    CONSTRAINT fk_ri_receta FOREIGN KEY (id_receta) REFERENCES rr_recetas(id),
-                    CONSTRAINT fk_ri_insumo FOREIGN KEY (id_insumo) REFERENCES rr_insumos(id)
-                )
-            ';
-        EXCEPTION
-            WHEN OTHERS THEN
-                IF SQLCODE != -955 THEN RAISE; END IF;
-        END;
-    """
-
-
-
-
-    cursor = db.obtener_cursor()
-    sentencias = [sql_usuario, sql_paciente, sql_medico, sql_insumos, sql_recetas, sql_consultas, sql_agenda, sql_receta_insumos]
-
+    """Lleva el esquema a la última versión; si ya está al día solo consulta la versión."""
     try:
-        for sql in sentencias:
-            cursor.execute(sql)
-
-        db.connection.commit()
-        print("[INFO]: Tablas validadas/creadas correctamente")
+        version = aplicar_migraciones(db)
+        print(f"[INFO]: Esquema de BD validado (versión {version}).")
     except Exception as e:
-        db.connection.rollback()
         print("[ERROR]: Error al crear tablas:", e)
-    finally:
-        if cursor:
-            cursor.close()
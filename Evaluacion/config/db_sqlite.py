@@ -0,0 +1,210 @@
+import re
+import sqlite3
+import threading
+from datetime import datetime
+from functools import lru_cache
+
+from config.backend import BackendBD
+
+_RE_RETURNING = re.compile(r"\s+RETURNING\s+\w+\s+INTO\s+:(\w+)", re.IGNORECASE)
+_RE_TO_DATE = re.compile(r"TO_DATE\(\s*(:\w+)\s*,\s*'[^']*'\s*\)", re.IGNORECASE)
+_RE_SYSDATE = re.compile(r"\bSYSDATE\b", re.IGNORECASE)
+_RE_FETCH_FIRST = re.compile(r"\bFETCH\s+FIRST\s+(:?\w+)\s+ROWS\s+ONLY\b", re.IGNORECASE)
+_RE_BIND_POSICIONAL = re.compile(r"'[^']*'|:(\d+)")
+_RE_IDENTIDAD = re.compile(r"\bNUMBER\s+GENERATED\s+BY\s+DEFAULT\s+AS\s+IDENTITY\b", re.IGNORECASE)
+_RE_CREATE = re.compile(r"^\s*CREATE\s+(TABLE|INDEX|UNIQUE\s+INDEX)\s+", re.IGNORECASE)
+
+
+def _convertir_fecha(valor: bytes):
+    """Convierte las columnas DATE guardadas como texto ISO en datetime, como lo entrega Oracle."""
+    return datetime.fromisoformat(valor.decode())
+
+
+def _adaptar_fecha(valor: datetime) -> str:
+    """Guarda los datetime con el mismo formato que datetime() y CURRENT_TIMESTAMP."""
+    return valor.isoformat(" ")
+
+
+sqlite3.register_converter("DATE", _convertir_fecha)
+sqlite3.register_adapter(datetime, _adaptar_fecha)
+
+
+@lru_cache(maxsize=256)
+def traducir_sql(sql: str):
+    """Traduce una sentencia escrita para Oracle al dialecto de SQLite.
+
+    Devuelve la sentencia traducida y el nombre del bind de RETURNING ... INTO (o None).
+    """
+    retorno = _RE_RETURNING.search(sql)
+    nombre_retorno = retorno.group(1) if retorno else None
+    sql = _RE_RETURNING.sub("", sql)
+    sql = _RE_TO_DATE.sub(r"datetime(\1)", sql)
+    sql = _RE_SYSDATE.sub("CURRENT_TIMESTAMP", sql)
+    sql = _RE_FETCH_FIRST.sub(r"LIMIT \1", sql)
+    sql = _RE_BIND_POSICIONAL.sub(lambda m: "?" if m.group(1) else m.group(0), sql)
+    return sql, nombre_retorno
+
+
+class VariableSalida:
+    """Equivalente a cursor.var() de oracledb para recibir el id de RETURNING ... INTO."""
+
+    def __init__(self, tipo=int):
+        self.tipo = tipo
+        self.valores = []
+
+    def getvalue(self, pos: int = 0):
+        return self.valores
+
+
+class ErrorLote:
+    """Equivalente a los errores de cursor.getbatcherrors() de oracledb."""
+
+    def __init__(self, offset: int, message: str):
+        self.offset = offset
+        self.message = message
+
+
+class CursorSQLite(sqlite3.Cursor):
+    """Cursor de SQLite que acepta las sentencias y binds escritos para oracledb."""
+
+    prefetchrows = 2
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def var(self, tipo=int):
+        return VariableSalida(tipo)
+
+    @property
+    def rowfactory(self):
+        return getattr(self, '_rowfactory', None)
+
+    @rowfactory.setter
+    def rowfactory(self, fabrica):
+        """Equivalente a cursor.rowfactory de oracledb: cada fila se entrega como fabrica(*columnas)."""
+        self._rowfactory = fabrica
+        self.row_factory = (lambda cursor, fila: fabrica(*fila)) if fabrica is not None else None
+
+    def prepare(self, sql: str):
+        """SQLite guarda en caché las sentencias por texto; solo se valida la traducción."""
+        traducir_sql(sql)
+
+    def execute(self, sql, parametros=None):
+        sql_traducido, nombre_retorno = traducir_sql(sql)
+        salida = None
+        if isinstance(parametros, dict):
+            if nombre_retorno and isinstance(parametros.get(nombre_retorno), VariableSalida):
+                salida = parametros[nombre_retorno]
+            parametros = {k: v for k, v in parametros.items() if not isinstance(v, VariableSalida)}
+        elif parametros is not None:
+            salida = next((v for v in parametros if isinstance(v, VariableSalida)), None)
+            parametros = [v for v in parametros if not isinstance(v, VariableSalida)]
+        super().execute(sql_traducido, parametros if parametros is not None else ())
+        if salida is not None:
+            salida.valores = [self.lastrowid]
+        return self
+
+    def executemany(self, sql, filas, batcherrors: bool = False):
+        """Ejecuta la sentencia para cada fila.
+
+        Con batcherrors=True las filas que fallan no detienen el lote: se ejecutan una a
+        una y los errores quedan disponibles en getbatcherrors(), como en oracledb.
+        """
+        sql_traducido, _ = traducir_sql(sql)
+        self._errores_lote = []
+        if not batcherrors:
+            super().executemany(sql_traducido, filas)
+            return self
+        for posicion, fila in enumerate(filas):
+            try:
+                super().execute(sql_traducido, fila)
+            except sqlite3.DatabaseError as e:
+                self._errores_lote.append(ErrorLote(posicion, str(e)))
+        return self
+
+    def getbatcherrors(self) -> list:
+        return list(getattr(self, '_errores_lote', []))
+
+
+class ConexionSQLiteRaw(sqlite3.Connection):
+    """Conexión SQLite cuyos cursores entienden el SQL de los modelos."""
+
+    def cursor(self, factory=CursorSQLite):
+        return super().cursor(factory)
+
+
+class ConexionSQLite(BackendBD):
+    """Motor SQLite en proceso para pruebas locales, mediciones y modo sin conexión.
+
+    Ejecuta los mismos métodos de los modelos traduciendo TO_DATE, SYSDATE,
+    RETURNING ... INTO, columnas identidad y binds posicionales de Oracle.
+    """
+
+    dialecto = "sqlite"
+
+    def __init__(self, ruta: str = ":memory:", stmtcachesize: int = 40, arraysize: int = 500):
+        """Inicializa el motor con la ruta del archivo (o ':memory:')."""
+        super().__init__(stmtcachesize, arraysize)
+        self.ruta = ruta
+        self._lock = threading.RLock()
+
+    def conectar(self):
+        """Abre la conexión SQLite con claves foráneas activas."""
+        try:
+            self.connection = sqlite3.connect(
+                self.ruta,
+                factory=ConexionSQLiteRaw,
+                detect_types=sqlite3.PARSE_DECLTYPES,
+                isolation_level=None,
+                check_same_thread=False,
+                cached_statements=self.stmtcachesize
+            )
+            self.connection.execute("PRAGMA foreign_keys = ON")
+            print(f"[INFO]: Conectado a SQLite ({self.ruta}) correctamente.")
+        except sqlite3.Error as e:
+            print(f"[ERROR]: No se pudo abrir SQLite → {e}")
+
+    def desconectar(self):
+        """Cierra la conexión SQLite si existe."""
+        self._cerrar_cursores()
+        if self.connection:
+            self.connection.close()
+            self.connection = None
+            print("[INFO]: Conexión a BD cerrada correctamente.")
+
+    def ejecutar_ddl(self, cursor, ddl: str):
+        """Traduce el DDL de Oracle (identidad, tipos) y lo ejecuta solo si el objeto no existe."""
+        ddl = _RE_IDENTIDAD.sub("INTEGER", ddl)
+        ddl = _RE_CREATE.sub(lambda m: f"CREATE {m.group(1).upper()} IF NOT EXISTS ", ddl)
+        try:
+            cursor.execute(ddl)
+        except sqlite3.OperationalError as e:
+            if "duplicate column" not in str(e):
+                raise
+
+    def plan_ejecucion(self, cursor, sql: str, parametros=None) -> list:
+        """Obtiene el plan con EXPLAIN QUERY PLAN usando los mismos binds de la consulta."""
+        cursor.execute(f"EXPLAIN QUERY PLAN {sql}", parametros)
+        return [fila[3] for fila in cursor.fetchall()]
+
+    def _adquirir_conexion(self):
+        """Entrega la conexión única; el bloqueo serializa su uso entre hilos."""
+        if not self.connection:
+            self.conectar()
+        self._lock.acquire()
+        return self.connection
+
+    def _liberar_conexion(self, conn):
+        self._lock.release()
+
+    def _iniciar_transaccion(self, conn):
+        """En modo autocommit la transacción se abre explícitamente."""
+        conn.execute("BEGIN")
+
+    def estadisticas_pool(self) -> dict:
+        """Devuelve el estado de la conexión SQLite."""
+        return {'modo': 'sqlite', 'ruta': self.ruta, 'abiertas': 1 if self.connection else 0}
@@ -0,0 +1,270 @@
+"""Migraciones versionadas del esquema de MediPlus.
+
+Cada migración es (versión, descripción, sentencias DDL). Las sentencias son
+idempotentes: el motor ignora los errores de objeto ya existente, por lo que
+volver a aplicar una migración interrumpida es seguro. Los cambios de datos se
+escriben como pasos: funciones que reciben db y aplican su DML en una transacción.
+"""
+from itertools import groupby
+
+SQL_VERSION_ESQUEMA = """
+CREATE TABLE rr_version_esquema (
+version NUMBER PRIMARY KEY,
+descripcion VARCHAR2(200),
+aplicada DATE
+)
+"""
+
+SQL_USUARIO = """
+CREATE TABLE rr_usuario (
+    id NUMBER GENERATED BY DEFAULT AS IDENTITY,
+    nombre_usuario VARCHAR2(60) UNIQUE,
+    clave VARCHAR2(255),
+    nombre VARCHAR2(100),
+    apellido VARCHAR2(100),
+    fecha_nacimiento DATE,
+    telefono VARCHAR2(50),
+    email VARCHAR2(100),
+    tipo VARCHAR2(20),
+    CONSTRAINT pk_usuario PRIMARY KEY (id)
+)
+"""
+
+SQL_PACIENTE = """
+CREATE TABLE rr_paciente (
+    id_paciente NUMBER PRIMARY KEY,
+    comuna VARCHAR2(100),
+    fecha_primera_visita DATE,
+    CONSTRAINT fk_paciente_usuario FOREIGN KEY (id_paciente) REFERENCES rr_usuario(id)
+)
+"""
+
+SQL_MEDICO = """
+CREATE TABLE rr_medico (
+    id_medico NUMBER PRIMARY KEY,
+    especialidad VARCHAR2(100),
+    horario_atencion VARCHAR2(100),
+    fecha_ingreso DATE,
+    CONSTRAINT fk_medico_usuario FOREIGN KEY (id_medico) REFERENCES rr_usuario(id)
+)
+"""
+
+SQL_INSUMOS = """
+CREATE TABLE rr_insumos (
+    id NUMBER GENERATED BY DEFAULT AS IDENTITY,
+    nombre VARCHAR2(100),
+    tipo VARCHAR2(50),
+    stock NUMBER,
+    costo_usd NUMBER,
+    CONSTRAINT pk_insumos PRIMARY KEY (id)
+)
+"""
+
+SQL_RECETAS = """
+CREATE TABLE rr_recetas (
+    id NUMBER GENERATED BY DEFAULT AS IDENTITY,
+    id_paciente NUMBER,
+    id_medico NUMBER,
+    descripcion VARCHAR2(500),
+    medicamentos_recetados VARCHAR2(500),
+    costo_clp NUMBER,
+    CONSTRAINT pk_recetas PRIMARY KEY (id),
+    CONSTRAINT fk_recetas_paciente FOREIGN KEY (id_paciente) REFERENCES rr_paciente(id_paciente),
+    CONSTRAINT fk_recetas_medico FOREIGN KEY (id_medico) REFERENCES rr_medico(id_medico)
+)
+"""
+
+SQL_CONSULTAS = """
+CREATE TABLE rr_consultas (
+    id NUMBER GENERATED BY DEFAULT AS IDENTITY,
+    id_paciente NUMBER,
+    id_medico NUMBER,
+    id_receta NUMBER,
+    fecha DATE,
+    comentarios VARCHAR2(500),
+    valor NUMBER,
+    CONSTRAINT pk_consultas PRIMARY KEY (id),
+    CONSTRAINT fk_consultas_paciente FOREIGN KEY (id_paciente) REFERENCES rr_paciente(id_paciente),
+    CONSTRAINT fk_consultas_medico FOREIGN KEY (id_medico) REFERENCES rr_medico(id_medico),
+    CONSTRAINT fk_consultas_receta FOREIGN KEY (id_receta) REFERENCES rr_recetas(id)
+)
+"""
+
+SQL_AGENDA = """
+CREATE TABLE rr_agenda (
+    id NUMBER GENERATED BY DEFAULT AS IDENTITY,
+    id_paciente NUMBER,
+    id_medico NUMBER,
+    fecha_consulta DATE,
+    estado VARCHAR2(20),
+    CONSTRAINT pk_agenda PRIMARY KEY (id),
+    CONSTRAINT fk_agenda_paciente FOREIGN KEY (id_paciente) REFERENCES rr_paciente(id_paciente),
+    CONSTRAINT fk_agenda_medico FOREIGN KEY (id_medico) REFERENCES rr_medico(id_medico)
+)
+"""
+
+SQL_RECETA_INSUMOS = """
+CREATE TABLE rr_receta_insumos (
+    id NUMBER GENERATED BY DEFAULT AS IDENTITY,
+    id_receta NUMBER NOT NULL,
+    id_insumo NUMBER NOT NULL,
+    cantidad NUMBER DEFAULT 1,
+    CONSTRAINT pk_receta_insumos PRIMARY KEY (id),
+    CONSTRAINT fk_ri_receta FOREIGN KEY (id_receta) REFERENCES rr_recetas(id),
+    CONSTRAINT fk_ri_insumo FOREIGN KEY (id_insumo) REFERENCES rr_insumos(id)
+)
+"""
+
+SQL_INDICES = [
+    "CREATE INDEX idx_consultas_pac_fecha ON rr_consultas (id_paciente, fecha)",
+    "CREATE INDEX idx_consultas_med_fecha ON rr_consultas (id_medico, fecha)",
+    "CREATE INDEX idx_consultas_receta ON rr_consultas (id_receta)",
+    "CREATE INDEX idx_consultas_fecha ON rr_consultas (fecha, id)",
+    "CREATE INDEX idx_agenda_med_fecha ON rr_agenda (id_medico, fecha_consulta)",
+    "CREATE INDEX idx_agenda_pac_fecha ON rr_agenda (id_paciente, fecha_consulta)",
+    "CREATE INDEX idx_agenda_fecha ON rr_agenda (fecha_consulta, id)",
+    "CREATE INDEX idx_recetas_paciente ON rr_recetas (id_paciente)",
+    "CREATE INDEX idx_recetas_medico ON rr_recetas (id_medico)",
+    "CREATE INDEX idx_ri_receta ON rr_receta_insumos (id_receta)",
+    "CREATE INDEX idx_ri_insumo ON rr_receta_insumos (id_insumo)",
+]
+
+SQL_IMPORTACION = """
+CREATE TABLE rr_importacion (
+    proceso VARCHAR2(30),
+    huella VARCHAR2(64),
+    origen VARCHAR2(300),
+    registros NUMBER DEFAULT 0,
+    lotes NUMBER DEFAULT 0,
+    estado VARCHAR2(20),
+    actualizada DATE,
+    CONSTRAINT pk_importacion PRIMARY KEY (proceso, huella)
+)
+"""
+
+# Las cargas repetidas de insumos.json dejaron insumos duplicados por (nombre, tipo).
+_SQL_INSUMOS_DUPLICADOS = """
+    SELECT i.id, i.nombre, i.tipo, i.stock, i.costo_usd
+    FROM rr_insumos i
+    JOIN (SELECT nombre, tipo FROM rr_insumos
+          WHERE nombre IS NOT NULL AND tipo IS NOT NULL
+          GROUP BY nombre, tipo HAVING COUNT(*) > 1) d ON i.nombre = d.nombre AND i.tipo = d.tipo
+    ORDER BY i.nombre, i.tipo, i.id
+"""
+
+
+def unificar_insumos_duplicados(db):
+    """Deja un solo insumo por (nombre, tipo) antes de crear el índice único.
+
+    Los duplicados con el mismo stock y costo se unifican en el de menor id, en una
+    transacción: sus recetas pasan a ese insumo y el resto se elimina, informando cada
+    id eliminado. Si algún duplicado tiene otro stock o costo no se elimina nada y la
+    migración se detiene con la lista de conflictos para resolverlos a mano.
+    """
+    with db.transaccion() as conn, conn.cursor() as cursor:
+        cursor.execute(_SQL_INSUMOS_DUPLICADOS)
+        grupos = [list(filas) for _, filas in groupby(cursor.fetchall(), key=lambda fila: (fila[1], fila[2]))]
+        conflictos = [g for g in grupos if len({(fila[3], fila[4]) for fila in g}) > 1]
+        if conflictos:
+            detalle = "; ".join(
+                f"{g[0][1]} ({g[0][2]}): " + ", ".join(f"id {f[0]} stock {f[3]} costo {f[4]}" for f in g)
+                for g in conflictos
+            )
+            raise RuntimeError(f"Insumos duplicados con valores distintos, unifíquelos a mano → {detalle}")
+        reemplazos = [(g[0][0], fila[0]) for g in grupos for fila in g[1:]]
+        if not reemplazos:
+            return
+        cursor.executemany("UPDATE rr_receta_insumos SET id_insumo = :1 WHERE id_insumo = :2", reemplazos)
+        cursor.executemany("DELETE FROM rr_insumos WHERE id = :1", [(duplicado,) for _, duplicado in reemplazos])
+    for conservado, duplicado in reemplazos:
+        print(f"[WARN]: Insumo duplicado {duplicado} eliminado; sus recetas pasan al insumo {conservado}.")
+
+
+SQL_INSUMOS_UNICOS = [
+    unificar_insumos_duplicados,
+    "CREATE UNIQUE INDEX uq_insumos_nombre_tipo ON rr_insumos (nombre, tipo)",
+]
+
+MIGRACIONES = [
+    (1, "Tablas base de usuarios, insumos, recetas, consultas y agenda", [
+        SQL_USUARIO,
+        SQL_PACIENTE,
+        SQL_MEDICO,
+        SQL_INSUMOS,
+        SQL_RECETAS,
+        SQL_CONSULTAS,
+        SQL_AGENDA,
+        SQL_RECETA_INSUMOS,
+    ]),
+    (2, "Índices para claves foráneas y columnas de filtro/orden de los listados", SQL_INDICES),
+    (3, "Índice para la paginación de usuarios por nombre", [
+        "CREATE INDEX idx_usuario_nombre ON rr_usuario (nombre, id)",
+    ]),
+    (4, "Insumos únicos por (nombre, tipo) para la carga idempotente", SQL_INSUMOS_UNICOS),
+    (5, "Puntos de control de las importaciones masivas", [SQL_IMPORTACION]),
+    (6, "Índice de recetas por paciente e id para el resumen del paciente", [
+        "CREATE INDEX idx_recetas_pac_id ON rr_recetas (id_paciente, id)",
+    ]),
+]
+
+
+def _tabla_inexistente(error: Exception) -> bool:
+    """Indica si el error es de tabla inexistente (ORA-00942 en Oracle, "no such table" en SQLite)."""
+    mensaje = str(error)
+    return "ORA-00942" in mensaje or "no such table" in mensaje
+
+
+def _clave_duplicada(error: Exception) -> bool:
+    """Indica si el error es de clave duplicada (ORA-00001 en Oracle, IntegrityError de unicidad en SQLite)."""
+    mensaje = str(error)
+    return "ORA-00001" in mensaje or "UNIQUE constraint failed" in mensaje
+
+
+def version_actual(cursor) -> int:
+    """Devuelve la versión registrada del esquema, o 0 si aún no existe la tabla de versiones.
+
+    Cualquier otro error (conexión caída, permisos, tiempo de espera) se propaga: tomarlo
+    como un esquema vacío volvería a aplicar todas las migraciones.
+    """
+    try:
+        cursor.execute("SELECT MAX(version) FROM rr_version_esquema")
+        fila = cursor.fetchone()
+    except Exception as e:
+        if not _tabla_inexistente(e):
+            raise
+        return 0
+    return int(fila[0]) if fila and fila[0] is not None else 0
+
+
+def aplicar_migraciones(db) -> int:
+    """Aplica en orden las migraciones pendientes y devuelve la versión final.
+
+    En un arranque en caliente solo se ejecuta la consulta de versión.
+    """
+    with db.conexion() as conn, conn.cursor() as cursor:
+        version = version_actual(cursor)
+        pendientes = [m for m in MIGRACIONES if m[0] > version]
+        if not pendientes:
+            return version
+
+        db.ejecutar_ddl(cursor, SQL_VERSION_ESQUEMA)
+        for numero, descripcion, sentencias in pendientes:
+            for ddl in sentencias:
+                if callable(ddl):
+                    ddl(db)
+                else:
+                    db.ejecutar_ddl(cursor, ddl)
+            try:
+                cursor.execute(
+                    "INSERT INTO rr_version_esquema (version, descripcion, aplicada) VALUES (:1, :2, SYSDATE)",
+                    (numero, descripcion)
+                )
+                conn.commit()
+            except Exception as e:
+                if not _clave_duplicada(e):
+                    raise
+                # Otra instancia registró la misma versión mientras se aplicaba.
+                conn.rollback()
+            print(f"[INFO]: Migración {numero} aplicada: {descripcion}.")
+            version = numero
+        return version
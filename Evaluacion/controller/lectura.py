@@ -0,0 +1,106 @@
+import csv
+import json
+
+# Lectura incremental de archivos de datos para las cargas masivas: los registros se
+# entregan uno a uno sin cargar el archivo completo en memoria.
+
+TAMANO_BLOQUE = 64 * 1024
+MAX_REGISTRO = 16 * 1024 * 1024  # Caracteres que puede ocupar un elemento del arreglo.
+_ESPACIOS = " \t\r\n"
+# Un valor que termina o falla a menos de esta distancia del final del bloque puede estar
+# cortado: un literal como "Infinity", un escape \uXXXX o un número como "1." o "2e".
+_MARGEN_CORTE = 8
+
+
+def iterar_json(ruta: str, tamano_bloque: int = TAMANO_BLOQUE, max_registro: int = MAX_REGISTRO):
+    """Genera los registros de un arreglo JSON o de un archivo NDJSON (un objeto por línea).
+
+    El formato se detecta por el primer carácter: '[' indica un arreglo, cualquier otro
+    se lee como NDJSON. Un registro mal formado, o un elemento del arreglo de más de
+    max_registro caracteres, lanza ValueError indicando su posición.
+    """
+    with open(ruta, "r", encoding="utf-8") as archivo:
+        inicio = archivo.read(1)
+        while inicio and inicio in _ESPACIOS:
+            inicio = archivo.read(1)
+        if inicio == "[":
+            yield from _iterar_arreglo(archivo, tamano_bloque, max_registro)
+        elif inicio:
+            yield from _iterar_ndjson(inicio + archivo.readline(), archivo)
+
+
+def _iterar_ndjson(primera_linea: str, archivo):
+    """Genera un registro por línea no vacía."""
+    for numero, linea in enumerate(_lineas(primera_linea, archivo), start=1):
+        if not linea.strip():
+            continue
+        try:
+            yield json.loads(linea)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"línea {numero} inválida: {e.msg}") from None
+
+
+def _lineas(primera_linea: str, archivo):
+    yield primera_linea
+    yield from archivo
+
+
+def _iterar_arreglo(archivo, tamano_bloque: int, max_registro: int):
+    """Genera los elementos de un arreglo JSON leyendo el archivo por bloques.
+
+    Solo se lee otro bloque cuando el elemento pudo quedar cortado en el borde del
+    buffer; cualquier otro error de formato se informa de inmediato.
+    """
+    decodificador = json.JSONDecoder()
+    buffer, pos, leidos, fin = "", 0, 0, False
+    esperando_valor, tras_coma = True, False
+    while True:
+        while pos < len(buffer) and buffer[pos] in _ESPACIOS:
+            pos += 1
+        if pos == len(buffer) and not fin:
+            leidos += pos
+            buffer, pos = archivo.read(tamano_bloque), 0
+            fin = not buffer
+            continue
+        if pos == len(buffer):
+            raise ValueError("arreglo JSON sin cerrar")
+
+        caracter = buffer[pos]
+        if caracter == "]":
+            if tras_coma:
+                raise ValueError(f"',' sin elemento antes de ']' en la posición {leidos + pos}")
+            return
+        if not esperando_valor:
+            if caracter != ",":
+                raise ValueError(f"se esperaba ',' en la posición {leidos + pos}")
+            pos += 1
+            esperando_valor = tras_coma = True
+            continue
+
+        try:
+            valor, final = decodificador.raw_decode(buffer, pos)
+            cortado = not fin and len(buffer) - final < _MARGEN_CORTE
+        except json.JSONDecodeError as e:
+            cortado = not fin and (len(buffer) - e.pos < _MARGEN_CORTE or e.msg.startswith("Unterminated string"))
+            if not cortado:
+                raise ValueError(f"registro inválido en la posición {leidos + e.pos}: {e.msg}") from None
+        if cortado:
+            if len(buffer) - pos > max_registro:
+                raise ValueError(f"el registro de la posición {leidos + pos} supera {max_registro} caracteres")
+            leidos += pos
+            mas = archivo.read(tamano_bloque)
+            fin = not mas
+            buffer, pos = buffer[pos:] + mas, 0
+            continue
+        yield valor
+        pos = final
+        esperando_valor = tras_coma = False
+        if pos > tamano_bloque:
+            leidos += pos
+            buffer, pos = buffer[pos:], 0
+
+
+def iterar_csv(ruta: str):
+    """Genera un diccionario por fila de un CSV con encabezados; los valores llegan como texto."""
+    with open(ruta, "r", newline="", encoding="utf-8-sig") as archivo:
+        yield from csv.DictReader(archivo)
@@ -1,7 +1,13 @@
 import re
 from model.objetos_m import InsumosModel, RecetasModel, ConsultasModel, AgendaModel
 from model.personas_m import PacienteModel, MedicoModel
+from model.importacion_m import CargadorInsumos, PuntoControl
+from model.validacion_m import ArchivoRechazos
 from view.objetos_v import InsumosView, RecetasView, ConsultasView, AgendaView
+from controller.paginacion import navegar_paginas
+from controller.lectura import iterar_json, iterar_csv
+from model.intercambio_m import TABLAS_CSV, exportar_csv
+from view.progreso_v import ProgresoView
 
 SUS_KEYS = [
     r";", r"--", r"/\*", r"\bOR\b", r"\bAND\b", r"\bUNION\b",
@@ -47,8 +53,7 @@ class ObjetosController:
 
             elif opcion == "2":
                 insumo = InsumosModel(self.db)
-                lista = insumo.listar_insumos()
-                self.insumos_view.mostrar_insumos(lista)
+                navegar_paginas(insumo.pagina_insumos, self.insumos_view.mostrar_insumos)
 
             elif opcion == "3":
                 try:
@@ -75,13 +80,20 @@ class ObjetosController:
                 print("[ERROR]: Opción inválida.")
 
     def cargar_insumos_json(self):
-        """Carga insumos desde datos/insumos.json y los inserta en BD."""
-        import json
+        """Carga insumos desde datos/insumos.json (arreglo o NDJSON); los existentes por (nombre, tipo) se actualizan.
+
+        El archivo se lee de forma incremental, por lo que su tamaño no afecta la memoria usada.
+        Una carga interrumpida se reanuda desde el último lote confirmado y los registros
+        inválidos se descartan antes de tocar la BD y quedan en datos/insumos.rechazos.ndjson.
+        """
         import os
         ruta = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'datos', 'insumos.json')
         try:
-            with open(ruta, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            punto = PuntoControl(self.db, "insumos", ruta)
+            punto.iniciar(repetir_completada=True)
+            with ArchivoRechazos.para(ruta, anexar=punto.registros > 0) as rechazos:
+                resultado = CargadorInsumos(self.db).cargar(iterar_json(ruta), punto, rechazos)
+            punto.completar()
         except FileNotFoundError:
             print("[ERROR]: No se encuentra el archivo datos/insumos.json")
             return
@@ -89,21 +101,86 @@ class ObjetosController:
             print(f"[ERROR]: No se pudo leer el JSON → {e}")
             return
 
-        cargados = 0
-        for item in data:
+        for nombre, error in resultado.errores:
+            print(f"[WARN]: No se pudo cargar insumo '{nombre}': {error}")
+        if rechazos.total:
+            print(f"[WARN]: {rechazos.total} registros rechazados guardados en {rechazos.ruta}")
+        print(f"[INFO]: Carga completada. Insumos insertados: {resultado.insertados}, "
+              f"actualizados: {resultado.actualizados}, sin cambios: {resultado.sin_cambios}")
+
+    def gestionar_csv(self):
+        """Importación y exportación masiva en CSV de insumos, consultas y agenda."""
+        while True:
+            print("\n--- Intercambio CSV ---")
+            print("1. Importar CSV")
+            print("2. Exportar CSV")
+            print("0. Volver")
+            opcion = input("Seleccione una opción: ").strip()
+
+            if opcion == "0":
+                break
+            if opcion not in ("1", "2"):
+                print("[ERROR]: Opción inválida.")
+                continue
+
+            tabla = input(f"Tabla ({'/'.join(TABLAS_CSV)}): ").strip().lower()
+            if tabla not in TABLAS_CSV:
+                print("[ERROR]: Tabla inválida.")
+                continue
+            ruta = input(f"Archivo [datos/{tabla}.csv]: ").strip() or f"datos/{tabla}.csv"
             try:
-                nombre = item.get('nombre')
-                tipo = item.get('tipo')
-                stock = int(item.get('stock') or 0)
-                costo_usd = float(item.get('costo_usd') or 0.0)
-                insumo = InsumosModel(self.db, nombre=nombre, tipo=tipo, stock=stock, costo_usd=costo_usd)
-                if insumo.crear_insumo():
-                    cargados += 1
-            except Exception as e:
-                print(f"[WARN]: No se pudo cargar insumo '{item}': {e}")
+                tamano_lote = int(input("Tamaño de lote [500]: ").strip() or 500)
+                if tamano_lote < 1:
+                    raise ValueError
+            except ValueError:
+                print("[ERROR]: Tamaño de lote inválido.")
+                continue
+
+            if opcion == "1":
+                self.importar_csv(tabla, ruta, tamano_lote)
+            else:
+                self.exportar_csv(tabla, ruta, tamano_lote)
 
-        print(f"[INFO]: Carga completada. Insumos insertados: {cargados}")
+    def importar_csv(self, tabla: str, ruta: str, tamano_lote: int = 500):
+        """Importa un CSV por lotes, con punto de control, archivo de rechazos y avance en pantalla."""
+        try:
+            punto = PuntoControl(self.db, f"csv_{tabla}", ruta)
+            punto.iniciar()
+            if punto.completada:
+                if input("¿Importarlo de nuevo? Las filas se insertarán otra vez (s/N): ").strip().lower() != "s":
+                    return
+                punto.reiniciar()
+            progreso = ProgresoView(f"Importando {tabla}", inicial=punto.registros)
+            with ArchivoRechazos.para(ruta, anexar=punto.registros > 0) as rechazos:
+                cargador = TABLAS_CSV[tabla].crear_cargador(self.db, tamano_lote)
+                resultado = cargador.cargar(iterar_csv(ruta), punto, rechazos, progreso)
+            progreso.terminar()
+            punto.completar()
+        except FileNotFoundError:
+            print(f"[ERROR]: No se encuentra el archivo {ruta}")
+            return
+        except Exception as e:
+            print(f"[ERROR]: No se pudo importar el CSV → {e}")
+            return
 
+        for fila, error in resultado.errores[:20]:
+            print(f"[WARN]: No se pudo cargar {fila}: {error}")
+        if len(resultado.errores) > 20:
+            print(f"[WARN]: ... y {len(resultado.errores) - 20} errores más.")
+        if rechazos.total:
+            print(f"[WARN]: {rechazos.total} registros rechazados guardados en {rechazos.ruta}")
+        print(f"[INFO]: Importación de {tabla} completada. {resultado.resumen()}")
+
+    def exportar_csv(self, tabla: str, ruta: str, tamano_lote: int = 500):
+        """Exporta una tabla a CSV mostrando el avance."""
+        progreso = ProgresoView(f"Exportando {tabla}")
+        try:
+            escritas = exportar_csv(self.db, tabla, ruta, tamano_lote, progreso)
+        except Exception as e:
+            print(f"\n[ERROR]: No se pudo exportar {tabla} → {e}")
+            return
+        progreso.terminar()
+        print(f"[INFO]: {escritas} filas de {tabla} exportadas a {ruta}.")
 
     def gestionar_recetas(self, medico: MedicoModel):
         """Gestión de Recetas"""
@@ -142,7 +219,8 @@ class ObjetosController:
                     receta_obj = RecetasModel(self.db, id=datos[0],
                                               paciente=PacienteModel(self.db, id=datos[1]),
                                               medico=MedicoModel(self.db, id=datos[2]),
-                                              descripcion=datos[3], medicamentos_recetados=datos[4], costo_clp=datos[5])
+                                              descripcion=datos[3], medicamentos_recetados=datos[4], costo_clp=datos[5],
+                                              insumos=receta_model.obtener_insumos(datos[0]))
                     self.recetas_view.mostrar_receta(receta_obj)
                 else:
                     print("[ERROR]: Receta no encontrada.")
@@ -158,13 +236,12 @@ class ObjetosController:
 
             elif opcion == "4":
                 receta_model = RecetasModel(self.db)
-                lista = receta_model.listar_recetas()
-                self.recetas_view.mostrar_recetas(lista)
+                navegar_paginas(receta_model.pagina_recetas, self.recetas_view.mostrar_recetas)
 
             elif opcion == "5":
            
                 insumo_model = InsumosModel(self.db)
-                disponibles = insumo_model.listar_insumos()
+                disponibles = insumo_model.listar_catalogo()
                 if disponibles:
                     print("\n[INFO]: Insumos disponibles (ID - Nombre - Tipo - Stock):")
                     for ins in disponibles:
@@ -181,12 +258,7 @@ class ObjetosController:
                 if not datos:
                     print("[ERROR]: Receta no encontrada.")
                 else:
-                
-                    insumo_validacion = None
-                    for ins in disponibles:
-                        if ins.id == id_insumo:
-                            insumo_validacion = ins
-                            break
+                    insumo_validacion = insumo_model.obtener_insumo(id_insumo)
                     receta_obj = RecetasModel(self.db, id=datos[0])
                     if receta_obj.agregar_insumo(id_insumo, cantidad):
                         if insumo_validacion:
@@ -229,8 +301,7 @@ class ObjetosController:
 
             elif opcion == "2":
                 consulta_model = ConsultasModel(self.db)
-                lista = consulta_model.listar_consultas()
-                self.consultas_view.mostrar_consultas(lista)
+                navegar_paginas(consulta_model.pagina_consultas, self.consultas_view.mostrar_consultas)
 
             elif opcion == "0":
                 break
@@ -273,8 +344,7 @@ class ObjetosController:
 
             elif opcion == "3":
                 agenda_model = AgendaModel(self.db)
-                lista = agenda_model.listar_agenda()
-                self.agenda_view.mostrar_agendas(lista)
+                navegar_paginas(agenda_model.pagina_agenda, self.agenda_view.mostrar_agendas)
 
             elif opcion == "0":
                 break
@@ -0,0 +1,33 @@
+TAMANO_PAGINA = 10
+
+
+def navegar_paginas(obtener_pagina, mostrar, tamano: int = TAMANO_PAGINA):
+    """Muestra un listado por páginas con navegación siguiente/anterior.
+
+    obtener_pagina(tamano, despues_de) devuelve (elementos, clave_siguiente). Se guardan
+    las claves de las páginas visitadas, así que volver atrás también es una búsqueda
+    por clave y ninguna página recorre las anteriores.
+    """
+    claves = [None]
+    while True:
+        elementos, siguiente = obtener_pagina(tamano, claves[-1])
+        mostrar(elementos)
+        if siguiente is None and len(claves) == 1:
+            return
+
+        print(f"\n--- Página {len(claves)} ---")
+        if siguiente is not None:
+            print("S. Página siguiente")
+        if len(claves) > 1:
+            print("A. Página anterior")
+        print("0. Volver")
+        opcion = input("Seleccione una opción: ").strip().upper()
+
+        if opcion == "S" and siguiente is not None:
+            claves.append(siguiente)
+        elif opcion == "A" and len(claves) > 1:
+            claves.pop()
+        elif opcion == "0":
+            return
+        else:
+            print("[ERROR]: Opción inválida.")
@@ -1,32 +1,56 @@
-import json
 import os
+from datetime import datetime
 from model.personas_m import PacienteModel, MedicoModel, UsuarioModel, AdministradorModel
+from model.importacion_m import ImportadorUsuarios, PuntoControl
+from model.validacion_m import ArchivoRechazos
+from model.sesion_m import AlmacenSesiones, Sesion
+from model.intentos_m import LimitadorIntentos
+from controller.paginacion import navegar_paginas
+from controller.lectura import iterar_json
 
 class UsuarioController:
-    def __init__(self, db):
+    def __init__(self, db, sesiones=None, limitador=None):
         self.db = db
         self.modelo = UsuarioModel(db)
+        self.sesiones = sesiones if sesiones is not None else AlmacenSesiones(cargar_perfil=self.cargar_perfil)
+        self.limitador = limitador or LimitadorIntentos()
 
-    def inicio_sesion(self):
+    def cargar_perfil(self, nombre_usuario):
+        """Perfil del usuario sin verificar la clave; lo usa AlmacenSesiones para sesiones de otros procesos."""
+        fila = self.modelo.obtener_sesion(nombre_usuario)
+        return self.modelo.perfil_desde_sesion(fila) if fila else None
+
+    def autorizar(self, token):
+        """Sesión vigente del token o None; no vuelve a verificar la clave."""
+        return self.sesiones.obtener(token)
+
+    def cerrar_sesion(self, sesion):
+        if sesion.token:
+            self.sesiones.cerrar(sesion.token)
+
+    def inicio_sesion(self, origen=None):
         print("\n--- Inicio de Sesión ---")
         usuario = input("Ingrese su nombre de usuario: ")
         clave = input("Ingrese su clave: ")
-        
-        datos_usuario = self.modelo.obtener_datos_login(usuario)
+
+        # Los intentos en exceso se rechazan antes de consultar la BD y de correr bcrypt.
+        if not self.limitador.permitido(usuario, origen):
+            print("[ERROR]: Demasiados intentos fallidos. Intente más tarde.")
+            return False, None
+
+        # Una sola consulta trae hash, usuario y rol. bcrypt se verifica en este mismo hilo: libera
+        # el GIL mientras calcula, pero el menú queda esperando hasta que termina.
+        datos_usuario = self.modelo.autenticar(usuario, clave)
 
         if datos_usuario:
-            hash_guardado = datos_usuario[0]
-            tipo_usuario = datos_usuario[1]
-            
-            import bcrypt
-            if bcrypt.checkpw(clave.encode('utf-8'), hash_guardado.encode('utf-8')):
-                print(f"\n[INFO]: Bienvenid@ {usuario} ({tipo_usuario}). Acceso concedido.")
-                user_data = self.modelo.ver_usuario(usuario)
-                if user_data:
-                    return True, {'id': user_data[0], 'nombre_usuario': user_data[1], 'nombre': user_data[2], 'apellido': user_data[3], 'fecha_nacimiento': user_data[4], 'tipo': user_data[5]}
-                return True, {'nombre_usuario': usuario, 'tipo': tipo_usuario}
-            else:
-                print("[ERROR]: Clave incorrecta.")
+            self.limitador.registrar_exito(usuario)
+            sesion = Sesion(self.modelo.perfil_desde_sesion(datos_usuario))
+            self.sesiones.abrir(sesion)
+            print(f"\n[INFO]: Bienvenid@ {sesion.nombre_usuario} ({sesion.tipo}). Acceso concedido.")
+            return True, sesion
+        self.limitador.registrar_fallo(usuario, origen)
+        if datos_usuario is False:
+            print("[ERROR]: Clave incorrecta.")
         else:
             print("[ERROR]: Usuario no encontrado.")
         return False, None
@@ -64,42 +88,39 @@ class UsuarioController:
             print("[ERROR]: No se pudo crear. Quizás el usuario ya existe.")
 
     def cargar_usuarios_json(self):
-        """Carga usuarios masivamente desde un archivo JSON."""
-        ruta = "datos/usuarios.json"
+        """Carga usuarios masivamente desde datos/usuarios.json (arreglo) o datos/usuarios.ndjson.
+
+        El archivo se lee de forma incremental y se inserta por lotes, así la memoria
+        usada no crece con la cantidad de registros. Una carga interrumpida se reanuda
+        desde el último lote confirmado y los registros inválidos se descartan antes de
+        tocar la BD y quedan en datos/usuarios.rechazos.ndjson.
+        """
+        ruta = next((r for r in ("datos/usuarios.json", "datos/usuarios.ndjson") if os.path.exists(r)), None)
         
-        if not os.path.exists(ruta):
-            print(f"[ERROR]: No se encuentra el archivo {ruta}")
+        if not ruta:
+            print("[ERROR]: No se encuentra el archivo datos/usuarios.json ni datos/usuarios.ndjson")
             return
 
         try:
-            with open(ruta, "r", encoding="utf-8") as archivo:
-                usuarios = json.load(archivo)
-            
-            contador = 0
-            for u in usuarios:
-                tipo = u.get("tipo")
-                if tipo == "paciente":
-                    modelo = PacienteModel(self.db)
-                    exito = modelo.crear_paciente(
-                        u["nombre_usuario"], u["clave"], u["nombre"], u["apellido"], 
-                        u["fecha_nacimiento"], u.get("comuna", "Sin Comuna"), "2024-01-01"
-                    )
-                elif tipo == "medico":
-                    modelo = MedicoModel(self.db)
-                    exito = modelo.crear_medico(
-                        u["nombre_usuario"], u["clave"], u["nombre"], u["apellido"], 
-                        u["fecha_nacimiento"], u.get("especialidad", "General"), 
-                        "09:00-18:00", "2024-01-01"
-                    )
-                elif tipo == "administrador":
-                    exito = self.modelo.crear_usuario(u["nombre_usuario"], u["clave"], u["nombre"], u["apellido"], u["fecha_nacimiento"], tipo)
-                else:
-                    exito = False
-                
-                if exito:
-                    contador += 1
+            punto = PuntoControl(self.db, "usuarios", ruta)
+            punto.iniciar(repetir_completada=True)
+            usuarios = iterar_json(ruta)
+            registros = (
+                dict(u, comuna=u.get("comuna", "Sin Comuna"), fecha_primera_visita="2024-01-01",
+                     especialidad=u.get("especialidad", "General"), horario_atencion="09:00-18:00",
+                     fecha_ingreso="2024-01-01") if isinstance(u, dict) else u
+                for u in usuarios
+            )
+            with ArchivoRechazos.para(ruta, anexar=punto.registros > 0) as rechazos:
+                resultado = ImportadorUsuarios(self.db).importar(registros, detalle=False, punto_control=punto,
+                                                                 rechazos=rechazos)
+            punto.completar()
+            for nombre_usuario, error in resultado.errores:
+                print(f"  ✗ Error con {nombre_usuario}: {error}")
+            if rechazos.total:
+                print(f"[WARN]: {rechazos.total} registros rechazados guardados en {rechazos.ruta}")
             
-            print(f"[INFO]: Se cargaron {contador} usuarios desde JSON correctamente.")
+            print(f"[INFO]: Se cargaron {resultado.total_creados} usuarios desde JSON correctamente.")
             
         except Exception as e:
             print(f"[ERROR]: Fallo al leer JSON: {e}")
@@ -124,60 +145,44 @@ class UsuarioController:
             return
 
         try:
-            with open(ruta, "r", encoding="utf-8") as archivo:
-                usuarios = json.load(archivo)
+            punto = PuntoControl(self.db, "users_json", ruta)
+            punto.iniciar(repetir_completada=True)
+            usuarios = iterar_json(ruta)
             
-            contador = 0
-            existentes = 0
             print("\n[INFO]: Cargando usuarios de prueba desde users.json...")
             
-            for u in usuarios:
+            tipos = ["paciente", "medico", "administrador"]
+            registros = []
+            for indice, u in enumerate(usuarios):
                 name_parts = u.get("name", "").split(" ", 1)
-                nombre = name_parts[0] if len(name_parts) > 0 else "Usuario"
-                apellido = name_parts[1] if len(name_parts) > 1 else "Test"
-                nombre_usuario = u.get("username", f"user{u.get('id', contador)}")
-                email = u.get("email", "")
-                telefono = u.get("phone", "")
-                ciudad = u.get("address", {}).get("city", "Sin Ciudad")
-                
-                if self.modelo.ver_usuario(nombre_usuario):
-                    print(f"  ⚠ {nombre_usuario} ya existe en la base de datos")
-                    existentes += 1
-                    continue
-                
-                clave = "password123"
-                fecha_nac = "1990-01-01"
-                
-                tipos = ["paciente", "medico", "administrador"]
-                tipo = tipos[(contador + existentes) % 3]
-                
-                try:
-                    if tipo == "paciente":
-                        modelo = PacienteModel(self.db)
-                        exito = modelo.crear_paciente(
-                            nombre_usuario, clave, nombre, apellido, 
-                            fecha_nac, ciudad, "2024-01-01"
-                        )
-                        if exito and (email or telefono):
-                            self.modelo.actualizar_usuario(nombre_usuario, nombre, apellido, fecha_nac, telefono, email)
-                    elif tipo == "medico":
-                        modelo = MedicoModel(self.db)
-                        exito = modelo.crear_medico(
-                            nombre_usuario, clave, nombre, apellido, 
-                            fecha_nac, "Medicina General", "09:00-18:00", "2024-01-01"
-                        )
-                        if exito and (email or telefono):
-                            self.modelo.actualizar_usuario(nombre_usuario, nombre, apellido, fecha_nac, telefono, email)
-                    else: 
-                        exito = self.modelo.crear_usuario(nombre_usuario, clave, nombre, apellido, fecha_nac, tipo)
-                        if exito and (email or telefono):
-                            self.modelo.actualizar_usuario(nombre_usuario, nombre, apellido, fecha_nac, telefono, email)
-                    
-                    if exito:
-                        contador += 1
-                        print(f"  ✓ {nombre_usuario} ({tipo}) - {nombre} {apellido} - {ciudad}")
-                except Exception as e:
-                    print(f"  ✗ Error con {nombre_usuario}: {e}")
+                registros.append({
+                    'nombre_usuario': u.get("username", f"user{u.get('id', indice)}"),
+                    'clave': "password123",
+                    'nombre': name_parts[0] if name_parts[0] else "Usuario",
+                    'apellido': name_parts[1] if len(name_parts) > 1 else "Test",
+                    'fecha_nacimiento': "1990-01-01",
+                    'tipo': tipos[indice % 3],
+                    'telefono': u.get("phone", ""),
+                    'email': u.get("email", ""),
+                    'comuna': u.get("address", {}).get("city", "Sin Ciudad"),
+                    'fecha_primera_visita': "2024-01-01",
+                    'especialidad': "Medicina General",
+                    'horario_atencion': "09:00-18:00",
+                    'fecha_ingreso': "2024-01-01"
+                })
+            
+            resultado = ImportadorUsuarios(self.db).importar(registros, punto_control=punto)
+            punto.completar()
+            for nombre_usuario in resultado.existentes:
+                print(f"  ⚠ {nombre_usuario} ya existe en la base de datos")
+            por_usuario = {r['nombre_usuario']: r for r in registros}
+            for nombre_usuario, tipo in resultado.creados:
+                r = por_usuario[nombre_usuario]
+                print(f"  ✓ {nombre_usuario} ({tipo}) - {r['nombre']} {r['apellido']} - {r['comuna']}")
+            for nombre_usuario, error in resultado.errores:
+                print(f"  ✗ Error con {nombre_usuario}: {error}")
+            contador = len(resultado.creados)
+            existentes = len(resultado.existentes)
             
             if contador > 0:
                 print(f"\n[INFO]: Se cargaron {contador} usuarios nuevos correctamente.")
@@ -189,11 +194,20 @@ class UsuarioController:
         except Exception as e:
             print(f"[ERROR]: Fallo al leer JSON: {e}")
 
-    def editar_usuario(self, nombre_usuario=None):
-        if not nombre_usuario:
-            nombre_usuario = input("Nombre de usuario a editar: ").strip()
-        
-        datos = self.modelo.ver_usuario(nombre_usuario)
+    def editar_usuario(self, nombre_usuario=None, perfil=None):
+        """Edita los datos básicos de un usuario.
+
+        Con el perfil de la sesión se parte de sus datos sin consultar la BD y, si la
+        edición se guarda, el perfil queda actualizado.
+        """
+        if perfil is not None:
+            nombre_usuario = perfil.nombre_usuario
+            datos = (perfil.id, perfil.nombre_usuario, perfil.nombre, perfil.apellido, perfil.fecha_nacimiento,
+                     perfil.tipo, perfil.telefono, perfil.email)
+        else:
+            if not nombre_usuario:
+                nombre_usuario = input("Nombre de usuario a editar: ").strip()
+            datos = self.modelo.ver_usuario(nombre_usuario)
         if not datos:
             print("[ERROR]: Usuario no encontrado.")
             return
@@ -234,6 +248,14 @@ class UsuarioController:
         
         exito = self.modelo.actualizar_usuario(nombre_usuario, nombre, apellido, fecha_nac, telefono, email)
         if exito:
+            if perfil is not None:
+                perfil.nombre, perfil.apellido = nombre, apellido
+                perfil.telefono, perfil.email = telefono, email
+                if fecha_nac != fecha_actual:
+                    try:
+                        perfil.fecha_nacimiento = datetime.strptime(fecha_nac, "%Y-%m-%d")
+                    except ValueError:
+                        perfil.fecha_nacimiento = fecha_nac
             print("[EXITO]: Usuario actualizado.")
         else:
             print("[ERROR]: No se pudo actualizar.")
@@ -244,14 +266,16 @@ class UsuarioController:
         admin_model = AdministradorModel(self.db)
         usuario_view = UsuarioView()
         
-        usuarios = admin_model.listar_usuarios()
-        usuarios_objs = []
-        for u in usuarios:
-            usuario = UsuarioModel(self.db, id=u[0], nombre_usuario=u[1], nombre=u[2], apellido=u[3], 
-                                 fecha_nacimiento=u[4], tipo=u[5], telefono=u[6] if len(u) > 6 else None, 
-                                 email=u[7] if len(u) > 7 else None)
-            usuarios_objs.append(usuario)
-        usuario_view.mostrar_usuarios(usuarios_objs)
+        def pagina_usuarios(tamano, despues_de):
+            filas, siguiente = admin_model.pagina_usuarios(tamano, despues_de)
+            usuarios_objs = [
+                UsuarioModel(self.db, id=u[0], nombre_usuario=u[1], nombre=u[2], apellido=u[3], 
+                             fecha_nacimiento=u[4], tipo=u[5], telefono=u[6], email=u[7])
+                for u in filas
+            ]
+            return usuarios_objs, siguiente
+
+        navegar_paginas(pagina_usuarios, usuario_view.mostrar_usuarios)
 
     def listar_pacientes_admin(self):
         """Método para que el admin liste todos los pacientes."""
@@ -259,17 +283,18 @@ class UsuarioController:
         admin_model = AdministradorModel(self.db)
         paciente_view = PacienteView()
         
-        pacientes = admin_model.listar_pacientes()
-        if not pacientes:
-            print("[INFO]: No hay pacientes registrados.")
-            return
-            
-        print(f"\n[INFO]: Total de pacientes: {len(pacientes)}")
-        for p in pacientes:
+        total = 0
+        for p in admin_model.iterar_pacientes():
             paciente = PacienteModel(self.db, id=p[0], nombre_usuario=p[1], nombre=p[2], apellido=p[3], 
                                    fecha_nacimiento=p[4], comuna=p[8] if len(p) > 8 else None, 
                                    fecha_primera_visita=p[9] if len(p) > 9 else None)
             paciente_view.mostrar_paciente(paciente)
+            total += 1
+        if not total:
+            print("[INFO]: No hay pacientes registrados.")
+            return
+            
+        print(f"\n[INFO]: Total de pacientes: {total}")
 
     def listar_medicos_admin(self):
         """Método para que el admin liste todos los médicos."""
@@ -277,18 +302,19 @@ class UsuarioController:
         admin_model = AdministradorModel(self.db)
         medico_view = MedicoView()
         
-        medicos = admin_model.listar_medicos()
-        if not medicos:
-            print("[INFO]: No hay médicos registrados.")
-            return
-            
-        print(f"\n[INFO]: Total de médicos: {len(medicos)}")
-        for m in medicos:
+        total = 0
+        for m in admin_model.iterar_medicos():
             medico = MedicoModel(self.db, id=m[0], nombre_usuario=m[1], nombre=m[2], apellido=m[3], 
                                fecha_nacimiento=m[4], especialidad=m[8] if len(m) > 8 else None, 
                                horario_atencion=m[9] if len(m) > 9 else None, 
                                fecha_ingreso=m[10] if len(m) > 10 else None)
             medico_view.mostrar_medico(medico)
+            total += 1
+        if not total:
+            print("[INFO]: No hay médicos registrados.")
+            return
+            
+        print(f"\n[INFO]: Total de médicos: {total}")
 
     def ver_usuario_admin(self, nombre_usuario):
         """Método para que el admin vea detalles de un usuario."""
@@ -346,14 +372,13 @@ class UsuarioController:
             else:
                 print("[ERROR]: Opción inválida.")
 
-    def menu_paciente(self, usuario):
-        """Menú del paciente con todas sus opciones."""
+    def menu_paciente(self, sesion: Sesion):
+        """Menú del paciente con todas sus opciones; sus datos vienen del perfil de la sesión."""
         from view.personas_v import PacienteView
-        from model.objetos_m import RecetasModel, ConsultasModel
+        from model.objetos_m import RecetasModel, ConsultasModel, ResumenPacienteModel
         from view.objetos_v import RecetasView, ConsultasView
         
         paciente_view = PacienteView()
-        paciente_model = PacienteModel(self.db)
         
         while True:
             print("\n---- Menú Paciente ----")
@@ -361,44 +386,42 @@ class UsuarioController:
             print("2) Editar mis datos")
             print("3) Ver mis recetas")
             print("4) Ver mis consultas")
+            print("5) Ver mi resumen")
             print("0) Cerrar sesión")
             opcion = input("Seleccione una opción: ").strip()
 
             if opcion == "1":
-                datos = paciente_model.obtener_paciente(usuario['nombre_usuario'])
-                if datos:
-                    paciente = PacienteModel(self.db, id=datos[0], nombre_usuario=datos[1], nombre=datos[2], 
-                                           apellido=datos[3], fecha_nacimiento=datos[4], comuna=datos[5], 
-                                           fecha_primera_visita=datos[6])
-                    paciente_view.mostrar_paciente(paciente)
-                else:
-                    print("Datos no encontrados.")
+                paciente_view.mostrar_paciente(sesion.perfil)
             elif opcion == "2":
-                self.editar_usuario(usuario['nombre_usuario'])
+                self.editar_usuario(perfil=sesion.perfil)
             elif opcion == "3":
                 recetas_model = RecetasModel(self.db)
                 recetas_view = RecetasView()
-                recetas = recetas_model.listar_recetas_paciente(usuario['nombre_usuario'])
+                recetas = recetas_model.iterar_recetas_paciente(sesion.nombre_usuario)
                 recetas_view.mostrar_recetas(recetas)
             elif opcion == "4":
                 consultas_model = ConsultasModel(self.db)
                 consultas_view = ConsultasView()
-                consultas = consultas_model.listar_consultas_paciente(usuario['nombre_usuario'])
+                consultas = consultas_model.iterar_consultas_paciente(sesion.nombre_usuario)
                 consultas_view.mostrar_consultas(consultas)
+            elif opcion == "5":
+                resumen = ResumenPacienteModel(self.db).obtener_resumen(sesion.perfil)
+                if resumen:
+                    paciente_view.mostrar_resumen(resumen)
             elif opcion == "0":
                 print("Cerrando sesión.")
                 break
             else:
                 print("[ERROR]: Opción inválida.")
 
-    def menu_medico(self, usuario):
-        """Menú del médico con todas sus opciones."""
+    def menu_medico(self, sesion: Sesion):
+        """Menú del médico con todas sus opciones; sus datos vienen del perfil de la sesión."""
         from view.personas_v import MedicoView
         from model.objetos_m import RecetasModel, ConsultasModel, AgendaModel
         from view.objetos_v import RecetasView, ConsultasView, AgendaView
         
         medico_view = MedicoView()
-        medico_model = MedicoModel(self.db)
+        medico = sesion.perfil
         
         while True:
             print("\n---- Menú Médico ----")
@@ -413,47 +436,19 @@ class UsuarioController:
             opcion = input("Seleccione una opción: ").strip()
 
             if opcion == "1":
-                datos = medico_model.obtener_medico(usuario['nombre_usuario'])
-                if datos:
-                    medico = MedicoModel(self.db, id=datos[0], nombre_usuario=datos[1], nombre=datos[2], 
-                                        apellido=datos[3], fecha_nacimiento=datos[4], 
-                                        especialidad=datos[5], horario_atencion=datos[6], fecha_ingreso=datos[7])
-                    medico_view.mostrar_medico(medico)
-                else:
-                    print("Datos no encontrados.")
+                medico_view.mostrar_medico(medico)
             elif opcion == "2":
-                self.editar_usuario(usuario['nombre_usuario'])
+                self.editar_usuario(perfil=medico)
             elif opcion == "3":
                 self.menu_gestion_pacientes()
             elif opcion == "4":
                 self._menu_gestion_insumos()
             elif opcion == "5":
-                datos = medico_model.obtener_medico(usuario['nombre_usuario'])
-                if datos:
-                    medico = MedicoModel(self.db, id=datos[0], nombre_usuario=datos[1], nombre=datos[2], 
-                                        apellido=datos[3], fecha_nacimiento=datos[4], 
-                                        especialidad=datos[5], horario_atencion=datos[6], fecha_ingreso=datos[7])
-                    self._menu_gestion_recetas(medico)
-                else:
-                    print("Error al obtener datos del médico.")
+                self._menu_gestion_recetas(medico)
             elif opcion == "6":
-                datos = medico_model.obtener_medico(usuario['nombre_usuario'])
-                if datos:
-                    medico = MedicoModel(self.db, id=datos[0], nombre_usuario=datos[1], nombre=datos[2], 
-                                        apellido=datos[3], fecha_nacimiento=datos[4], 
-                                        especialidad=datos[5], horario_atencion=datos[6], fecha_ingreso=datos[7])
-                    self._menu_gestion_consultas(medico)
-                else:
-                    print("Error al obtener datos del médico.")
+                self._menu_gestion_consultas(medico)
             elif opcion == "7":
-                datos = medico_model.obtener_medico(usuario['nombre_usuario'])
-                if datos:
-                    medico = MedicoModel(self.db, id=datos[0], nombre_usuario=datos[1], nombre=datos[2], 
-                                        apellido=datos[3], fecha_nacimiento=datos[4], 
-                                        especialidad=datos[5], horario_atencion=datos[6], fecha_ingreso=datos[7])
-                    self._menu_gestion_agenda(medico)
-                else:
-                    print("Error al obtener datos del médico.")
+                self._menu_gestion_agenda(medico)
             elif opcion == "0":
                 print("Cerrando sesión.")
                 break
@@ -499,8 +494,7 @@ class UsuarioController:
             opcion = input("Seleccione una opción: ").strip()
 
             if opcion == "1":
-                pacientes = paciente_model.listar_pacientes()
-                for pac in pacientes:
+                for pac in paciente_model.iterar_pacientes():
                     paciente = PacienteModel(self.db, id=pac[0], nombre_usuario=pac[1], nombre=pac[2], 
                                            apellido=pac[3], fecha_nacimiento=pac[4], comuna=pac[5])
                     paciente_view.mostrar_paciente(paciente)
@@ -518,8 +512,8 @@ class UsuarioController:
             else:
                 print("[ERROR]: Opción inválida.")
 
-    def menu_administrador(self, usuario):
-        """Menú del administrador con todas sus opciones."""
+    def menu_administrador(self, sesion: Sesion):
+        """Menú del administrador con todas sus opciones; sus datos vienen del perfil de la sesión."""
         from view.personas_v import UsuarioView
         
         usuario_view = UsuarioView()
@@ -534,17 +528,9 @@ class UsuarioController:
             opcion = input("Seleccione una opción: ").strip()
 
             if opcion == "1":
-                datos = self.modelo.ver_usuario(usuario['nombre_usuario'])
-                if datos:
-                    usuario_obj = UsuarioModel(self.db, id=datos[0], nombre_usuario=datos[1], nombre=datos[2], 
-                                             apellido=datos[3], fecha_nacimiento=datos[4], tipo=datos[5], 
-                                             telefono=datos[6] if len(datos) > 6 else None, 
-                                             email=datos[7] if len(datos) > 7 else None)
-                    usuario_view.mostrar_usuario(usuario_obj)
-                else:
-                    print("Datos no encontrados.")
+                usuario_view.mostrar_usuario(sesion.perfil)
             elif opcion == "2":
-                self.editar_usuario(usuario['nombre_usuario'])
+                self.editar_usuario(perfil=sesion.perfil)
             elif opcion == "3":
                 self.menu_gestion_usuarios()
             elif opcion == "4":
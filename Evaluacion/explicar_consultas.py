@@ -0,0 +1,138 @@
+"""Imprime el plan de ejecución de cada consulta de los modelos.
+
+Ejecuta los métodos de lectura de model/* sobre la BD configurada en main.py
+(o la de MEDIPLUS_SQLITE), registra las sentencias SELECT que emiten y muestra
+el plan que el motor elige para cada una, de modo que un índice perdido o un
+recorrido completo de tabla queden a la vista.
+
+Uso: python explicar_consultas.py
+"""
+from datetime import datetime
+
+from main import conectarBD
+from model.personas_m import UsuarioModel, PacienteModel, MedicoModel, AdministradorModel
+from model.objetos_m import InsumosModel, RecetasModel, ConsultasModel, AgendaModel, ResumenPacienteModel
+
+USUARIO_EJEMPLO = "usuario_plan"
+ID_EJEMPLO = 1
+FECHA_EJEMPLO = datetime(2025, 1, 1)
+
+METODOS = [
+    ("UsuarioModel.obtener_datos_login", lambda db: UsuarioModel(db).obtener_datos_login(USUARIO_EJEMPLO)),
+    ("UsuarioModel.obtener_sesion", lambda db: UsuarioModel(db).obtener_sesion(USUARIO_EJEMPLO)),
+    ("UsuarioModel.ver_usuario", lambda db: UsuarioModel(db).ver_usuario(USUARIO_EJEMPLO)),
+    ("PacienteModel.obtener_paciente", lambda db: PacienteModel(db).obtener_paciente(USUARIO_EJEMPLO)),
+    ("PacienteModel.obtener_paciente_por_id", lambda db: PacienteModel(db).obtener_paciente_por_id(ID_EJEMPLO)),
+    ("MedicoModel.obtener_medico", lambda db: MedicoModel(db).obtener_medico(USUARIO_EJEMPLO)),
+    ("MedicoModel.listar_pacientes", lambda db: MedicoModel(db).listar_pacientes()),
+    ("AdministradorModel.listar_usuarios", lambda db: AdministradorModel(db).listar_usuarios()),
+    ("AdministradorModel.listar_pacientes", lambda db: AdministradorModel(db).listar_pacientes()),
+    ("AdministradorModel.listar_medicos", lambda db: AdministradorModel(db).listar_medicos()),
+    ("InsumosModel.listar_insumos", lambda db: InsumosModel(db).listar_insumos()),
+    ("RecetasModel.obtener_receta", lambda db: RecetasModel(db).obtener_receta(ID_EJEMPLO)),
+    ("RecetasModel.obtener_insumos", lambda db: RecetasModel(db, id=ID_EJEMPLO).obtener_insumos()),
+    ("RecetasModel.listar_recetas_paciente", lambda db: RecetasModel(db).listar_recetas_paciente(USUARIO_EJEMPLO)),
+    ("RecetasModel.listar_recetas", lambda db: RecetasModel(db).listar_recetas()),
+    ("ConsultasModel.listar_consultas", lambda db: ConsultasModel(db).listar_consultas()),
+    ("ConsultasModel.listar_consultas_paciente", lambda db: ConsultasModel(db).listar_consultas_paciente(USUARIO_EJEMPLO)),
+    ("AgendaModel.listar_agenda", lambda db: AgendaModel(db).listar_agenda()),
+    ("ResumenPacienteModel.obtener_resumen",
+     lambda db: ResumenPacienteModel(db).obtener_resumen(PacienteModel(db, id=ID_EJEMPLO))),
+    ("AdministradorModel.pagina_usuarios", lambda db: AdministradorModel(db).pagina_usuarios(10, ("", ID_EJEMPLO))),
+    ("InsumosModel.pagina_insumos", lambda db: InsumosModel(db).pagina_insumos(10, (ID_EJEMPLO,))),
+    ("RecetasModel.pagina_recetas", lambda db: RecetasModel(db).pagina_recetas(10, (ID_EJEMPLO,))),
+    ("ConsultasModel.pagina_consultas", lambda db: ConsultasModel(db).pagina_consultas(10, (FECHA_EJEMPLO, ID_EJEMPLO))),
+    ("AgendaModel.pagina_agenda", lambda db: AgendaModel(db).pagina_agenda(10, (FECHA_EJEMPLO, ID_EJEMPLO))),
+    ("AdministradorModel.pagina_usuarios (sin nombre)",
+     lambda db: AdministradorModel(db).pagina_usuarios(10, (None, ID_EJEMPLO))),
+    ("ConsultasModel.pagina_consultas (sin fecha)",
+     lambda db: ConsultasModel(db).pagina_consultas(10, (None, ID_EJEMPLO))),
+    ("AgendaModel.pagina_agenda (sin fecha)", lambda db: AgendaModel(db).pagina_agenda(10, (None, ID_EJEMPLO))),
+]
+
+
+class _CursorRegistrado:
+    """Cursor que anota cada SELECT ejecutado antes de delegar en el cursor real."""
+
+    def __init__(self, cursor, sentencias):
+        self._cursor = cursor
+        self._sentencias = sentencias
+
+    def execute(self, sql, parametros=None, **kwargs):
+        if sql and sql.lstrip().upper().startswith("SELECT"):
+            self._sentencias.setdefault(sql, parametros)
+        if parametros is None:
+            return self._cursor.execute(sql, **kwargs)
+        return self._cursor.execute(sql, parametros, **kwargs)
+
+    def __getattr__(self, nombre):
+        return getattr(self._cursor, nombre)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self._cursor.close()
+        return False
+
+
+class _ConexionRegistrada:
+    """Conexión cuyos cursores registran las sentencias ejecutadas."""
+
+    def __init__(self, conn, sentencias):
+        self.conn = conn
+        self._sentencias = sentencias
+
+    def cursor(self, *args, **kwargs):
+        return _CursorRegistrado(self.conn.cursor(*args, **kwargs), self._sentencias)
+
+    def __getattr__(self, nombre):
+        return getattr(self.conn, nombre)
+
+
+def registrar_consultas(db) -> dict:
+    """Ejecuta los métodos de lectura y devuelve {metodo: {sql: parametros}}."""
+    adquirir, liberar = db._adquirir_conexion, db._liberar_conexion
+    registro = {}
+    actual = {}
+    db._adquirir_conexion = lambda: _ConexionRegistrada(adquirir(), actual)
+    db._liberar_conexion = lambda conn: liberar(conn.conn)
+    try:
+        for nombre, metodo in METODOS:
+            actual.clear()
+            metodo(db)
+            registro[nombre] = dict(actual)
+    finally:
+        db._adquirir_conexion, db._liberar_conexion = adquirir, liberar
+        db._cerrar_cursores()
+    return registro
+
+
+def main():
+    db = conectarBD()
+    try:
+        registro = registrar_consultas(db)
+        with db.conexion() as conn, conn.cursor() as cursor:
+            for nombre, sentencias in registro.items():
+                print("\n" + "=" * 80)
+                print(nombre)
+                print("=" * 80)
+                if not sentencias:
+                    print("[WARN]: El método no ejecutó ninguna consulta.")
+                for sql, parametros in sentencias.items():
+                    print(" ".join(sql.split()))
+                    print("-" * 80)
+                    try:
+                        for linea in db.plan_ejecucion(cursor, sql, parametros):
+                            print(f"  {linea}")
+                    except Exception as e:
+                        print(f"[ERROR]: No se pudo obtener el plan → {e}")
+    finally:
+        db.desconectar()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,28 +1,41 @@
+import os
 import sys
 from controller.personas_c import UsuarioController
 from controller.objetos_c import ObjetosController
 from config.db_config import ConexionOracle, validar_tablas
+from config.db_sqlite import ConexionSQLite
+from model.sesion_m import AlmacenSesiones
 
 def conectarBD():
-    db = ConexionOracle("SYSTEM", "Jeloum3n12", "localhost:1521/XEPDB1")
+    # MEDIPLUS_SQLITE=<archivo o :memory:> ejecuta la aplicación sin Oracle.
+    ruta_sqlite = os.environ.get("MEDIPLUS_SQLITE")
+    if ruta_sqlite:
+        db = ConexionSQLite(ruta_sqlite)
+    else:
+        db = ConexionOracle("SYSTEM", "Jeloum3n12", "localhost:1521/XEPDB1")
     db.conectar()
     validar_tablas(db)
     return db
 
 def menu_principal():
     db = conectarBD()
-    usuario_controller = UsuarioController(db)
+    # MEDIPLUS_SESIONES=<archivo> comparte las sesiones abiertas entre terminales.
+    sesiones = AlmacenSesiones(ttl=int(os.environ.get("MEDIPLUS_SESION_TTL", 1800)),
+                               ruta=os.environ.get("MEDIPLUS_SESIONES"))
+    usuario_controller = UsuarioController(db, sesiones)
+    sesiones.cargar_perfil = usuario_controller.cargar_perfil
     objetos_controller = ObjetosController(db)
     usuario_logueado = None
 
     while True:
         if usuario_logueado:
-            if usuario_logueado['tipo'] == 'paciente':
+            if usuario_logueado.tipo == 'paciente':
                 usuario_controller.menu_paciente(usuario_logueado)
-            elif usuario_logueado['tipo'] == 'medico':
+            elif usuario_logueado.tipo == 'medico':
                 usuario_controller.menu_medico(usuario_logueado)
-            elif usuario_logueado['tipo'] == 'administrador':
+            elif usuario_logueado.tipo == 'administrador':
                 usuario_controller.menu_administrador(usuario_logueado)
+            usuario_controller.cerrar_sesion(usuario_logueado)
             usuario_logueado = None
         else:
             print("\n---- MediPlus - Menú Principal ----")
@@ -31,6 +44,7 @@ def menu_principal():
             print("3) Cargar Usuarios de Prueba (Contiene al Administrador)")
             print("4) Cargar Usuarios desde users.json (datos solicitados)")
             print("5) Cargar Insumos desde JSON (datos/insumos.json)")
+            print("6) Importar/Exportar CSV (insumos, consultas, agenda)")
             print("0) Salir")
             opcion = input("Seleccione una opción: ").strip()
 
@@ -46,6 +60,8 @@ def menu_principal():
                 usuario_controller.cargar_usuarios_desde_users_json()
             elif opcion == "5":
                 objetos_controller.cargar_insumos_json()
+            elif opcion == "6":
+                objetos_controller.gestionar_csv()
             elif opcion == "0":
                 print("Saliendo de la aplicación. ¡Hasta luego!")
                 db.desconectar()
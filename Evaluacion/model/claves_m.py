@@ -0,0 +1,134 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import bcrypt
+
+COSTO_POR_DEFECTO = 12
+COSTO_MINIMO, COSTO_MAXIMO = 4, 31
+
+
+def _leer_costo() -> int:
+    """Lee MEDIPLUS_BCRYPT_COSTO; un valor fuera de rango deja el costo por defecto."""
+    valor = os.environ.get("MEDIPLUS_BCRYPT_COSTO")
+    if not valor:
+        return COSTO_POR_DEFECTO
+    try:
+        costo = int(valor)
+    except ValueError:
+        costo = 0
+    if not COSTO_MINIMO <= costo <= COSTO_MAXIMO:
+        print(f"[WARN]: MEDIPLUS_BCRYPT_COSTO='{valor}' no es válido ({COSTO_MINIMO}-{COSTO_MAXIMO}), "
+              f"se usará {COSTO_POR_DEFECTO}.")
+        return COSTO_POR_DEFECTO
+    return costo
+
+
+# Factor de costo de bcrypt (2^costo rondas). MEDIPLUS_BCRYPT_COSTO permite ajustarlo por instalación;
+# los hashes con otro costo se recalculan en el siguiente inicio de sesión correcto.
+COSTO_BCRYPT = _leer_costo()
+
+
+def encriptar_clave(clave: str, costo: int = None) -> str:
+    """Devuelve el hash bcrypt de la clave con una sal propia."""
+    return bcrypt.hashpw(clave.encode('utf-8'), bcrypt.gensalt(costo or COSTO_BCRYPT)).decode('utf-8')
+
+
+def verificar_clave(clave: str, hash_guardado: str) -> bool:
+    """Compara la clave con el hash guardado; un hash mal formado cuenta como clave incorrecta."""
+    try:
+        return bcrypt.checkpw(clave.encode('utf-8'), hash_guardado.encode('utf-8'))
+    except (TypeError, ValueError):
+        return False
+
+
+def costo_de_hash(hash_guardado: str):
+    """Devuelve el costo con que se generó un hash bcrypt ($2b$<costo>$...) o None si no se reconoce."""
+    partes = hash_guardado.split("$")
+    if len(partes) < 4 or not partes[2].isdigit():
+        return None
+    return int(partes[2])
+
+
+def requiere_rehash(hash_guardado: str, costo: int = None) -> bool:
+    """Indica si el hash se generó con un costo distinto del vigente."""
+    return costo_de_hash(hash_guardado) != (costo or COSTO_BCRYPT)
+
+
+def _encriptar_bloque(claves: list, costo: int) -> list:
+    """Encripta un bloque de claves dentro de un proceso del pool."""
+    return [encriptar_clave(clave, costo) for clave in claves]
+
+
+class LoteHash:
+    """Hashes de un lote en cálculo; resultado() espera y los devuelve en el orden enviado."""
+
+    def __init__(self, futuros):
+        self._futuros = futuros
+
+    def resultado(self) -> list:
+        hashes = []
+        for futuro in self._futuros:
+            hashes.extend(futuro.result())
+        return hashes
+
+
+class ServicioHash:
+    """Calcula hashes bcrypt en un pool de procesos para las cargas masivas.
+
+    enviar() reparte las claves en bloques y vuelve de inmediato, así el llamador puede
+    insertar el lote anterior en la BD mientras se calculan los hashes del siguiente.
+    Cada clave recibe su propia sal aunque se repita (p. ej. "password123").
+    """
+
+    def __init__(self, procesos: int = None, costo: int = None, tamano_bloque: int = 16):
+        self.procesos = procesos or os.cpu_count() or 1
+        self.costo = costo or COSTO_BCRYPT
+        self.tamano_bloque = tamano_bloque
+        self._pool = None
+
+    def _obtener_pool(self):
+        if self._pool is None and self.procesos > 1:
+            try:
+                # spawn evita heredar hilos y conexiones de la BD en los procesos hijos.
+                self._pool = ProcessPoolExecutor(self.procesos, mp_context=multiprocessing.get_context("spawn"))
+            except (OSError, ValueError) as e:
+                print(f"[WARN]: No se pudo crear el pool de hashing, se usará un solo proceso → {e}")
+                self.procesos = 1
+        return self._pool
+
+    def encriptar(self, clave: str) -> str:
+        """Encripta una sola clave en el proceso actual."""
+        return encriptar_clave(clave, self.costo)
+
+    def enviar(self, claves: list) -> LoteHash:
+        """Inicia el cálculo de los hashes de claves y devuelve el lote pendiente."""
+        pool = self._obtener_pool()
+        if pool is None:
+            return _LoteCalculado(_encriptar_bloque(claves, self.costo))
+        bloques = [claves[i:i + self.tamano_bloque] for i in range(0, len(claves), self.tamano_bloque)]
+        return LoteHash([pool.submit(_encriptar_bloque, bloque, self.costo) for bloque in bloques])
+
+    def cerrar(self):
+        """Detiene los procesos del pool."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+        return False
+
+
+class _LoteCalculado(LoteHash):
+    """Lote ya calculado en el proceso actual (sin pool)."""
+
+    def __init__(self, hashes):
+        super().__init__([])
+        self._hashes = hashes
+
+    def resultado(self) -> list:
+        return self._hashes
@@ -0,0 +1,52 @@
+# Filas de los listados. A diferencia de los modelos, no guardan la conexión ni tienen
+# __dict__: cada clase declara __slots__ y se construye directamente desde las columnas
+# del cursor (rowfactory), así un listado grande ocupa menos memoria y se arma más rápido.
+# Las vistas las leen igual que a los modelos. Sus atributos se pueden modificar: el mapa
+# de identidad completa los que faltan, el catálogo actualiza el stock y cargar_insumos
+# asigna los insumos de las recetas.
+
+
+class Fila:
+    """Base de las filas: asigna los argumentos en el orden de __slots__; los que faltan quedan en None."""
+
+    __slots__ = ()
+
+    def __init__(self, *valores, **campos):
+        for nombre, valor in zip(self.__slots__, valores):
+            setattr(self, nombre, valor)
+        for nombre in self.__slots__[len(valores):]:
+            setattr(self, nombre, campos.get(nombre))
+
+    def __repr__(self):
+        campos = ", ".join(f"{nombre}={getattr(self, nombre)!r}" for nombre in self.__slots__[:3])
+        return f"{type(self).__name__}({campos})"
+
+
+class Persona(Fila):
+    """Paciente o médico tal como aparece en un listado."""
+
+    __slots__ = ("id", "nombre_usuario", "nombre", "apellido")
+
+
+class FilaInsumo(Fila):
+    __slots__ = ("id", "nombre", "tipo", "stock", "costo_usd")
+
+
+class FilaReceta(Fila):
+    """Receta de un listado; insumos es una lista de (FilaInsumo, cantidad), o None si no se cargaron."""
+
+    __slots__ = ("id", "paciente", "medico", "descripcion", "medicamentos_recetados", "costo_clp", "insumos")
+
+
+class FilaConsulta(Fila):
+    __slots__ = ("id", "paciente", "medico", "receta", "fecha", "comentarios", "valor")
+
+
+class FilaAgenda(Fila):
+    __slots__ = ("id", "paciente", "medico", "fecha_consulta", "estado")
+
+
+class ResumenPaciente(Fila):
+    """Panel del paciente: su perfil y las últimas recetas (con insumos), consultas y citas pendientes."""
+
+    __slots__ = ("paciente", "recetas", "consultas", "agenda")
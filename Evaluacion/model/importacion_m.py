@@ -0,0 +1,586 @@
+import hashlib
+import os
+from itertools import islice
+
+from model.claves_m import ServicioHash
+from model.objetos_m import InsumosModel
+from model.validacion_m import ArchivoRechazos, Columna, ValidadorLote
+
+TIPOS_USUARIO = ("paciente", "medico", "administrador")
+
+COLUMNAS_USUARIO = [
+    Columna("nombre_usuario", obligatoria=True),
+    Columna("clave", obligatoria=True, recortar=False),
+    Columna("nombre", obligatoria=True),
+    Columna("apellido", obligatoria=True),
+    Columna("fecha_nacimiento", "fecha", obligatoria=True),
+    Columna("tipo", obligatoria=True, valores=TIPOS_USUARIO),
+    Columna("telefono"),
+    Columna("email"),
+    Columna("comuna"),
+    Columna("fecha_primera_visita", "fecha"),
+    Columna("especialidad"),
+    Columna("horario_atencion"),
+    Columna("fecha_ingreso", "fecha"),
+]
+COLUMNAS_INSUMO = [
+    Columna("nombre", obligatoria=True),
+    Columna("tipo", obligatoria=True),
+    Columna("stock", "entero", por_defecto=0),
+    Columna("costo_usd", "decimal", por_defecto=0.0),
+]
+
+# Tamaño de los bloques en que se lee el archivo para calcular su huella.
+BLOQUE_HUELLA = 1024 * 1024
+
+
+def huella_archivo(ruta: str) -> str:
+    """Identifica el contenido de un archivo por el SHA-256 del archivo completo, leído por bloques.
+
+    Cualquier cambio, aunque no altere el tamaño, produce otra huella y por tanto una
+    importación nueva.
+    """
+    sha = hashlib.sha256()
+    with open(ruta, "rb") as archivo:
+        for bloque in iter(lambda: archivo.read(BLOQUE_HUELLA), b""):
+            sha.update(bloque)
+    return sha.hexdigest()
+
+
+class PuntoControl:
+    """Avance de una importación guardado en rr_importacion para poder reanudarla.
+
+    La fila se identifica por el proceso (p. ej. "insumos") y la huella del archivo.
+    avanzar() se ejecuta con el cursor del lote, así el avance se confirma en la misma
+    transacción que sus filas. Si un lote falla, el avance se congela en el último
+    lote confirmado sin huecos para que la reanudación no salte registros perdidos.
+    """
+
+    _SQL_OBTENER = "SELECT registros, estado FROM rr_importacion WHERE proceso = :1 AND huella = :2"
+    _SQL_CREAR = """
+        INSERT INTO rr_importacion (proceso, huella, origen, registros, lotes, estado, actualizada)
+        VALUES (:1, :2, :3, 0, 0, 'en_curso', SYSDATE)
+    """
+    _SQL_AVANZAR = """
+        UPDATE rr_importacion SET registros = :1, lotes = lotes + 1, actualizada = SYSDATE
+        WHERE proceso = :2 AND huella = :3
+    """
+    _SQL_ESTADO = "UPDATE rr_importacion SET estado = :1, actualizada = SYSDATE WHERE proceso = :2 AND huella = :3"
+    _SQL_REINICIAR = """
+        UPDATE rr_importacion SET registros = 0, lotes = 0, estado = 'en_curso', actualizada = SYSDATE
+        WHERE proceso = :1 AND huella = :2
+    """
+
+    def __init__(self, db, proceso: str, ruta: str):
+        self.db = db
+        self.proceso = proceso
+        self.ruta = ruta
+        self.huella = huella_archivo(ruta)
+        self.registros = 0
+        self.completada = False
+        self.congelado = False
+
+    def iniciar(self, repetir_completada: bool = False) -> int:
+        """Lee (o crea) el punto de control y devuelve cuántos registros ya están confirmados.
+
+        Solo se reanuda una importación en curso. Si el mismo archivo ya se importó por
+        completo, completada queda en True; con repetir_completada se reinicia en su
+        lugar como una sincronización nueva (seguro para las cargas idempotentes).
+        """
+        with self.db.transaccion() as conn, conn.cursor() as cursor:
+            cursor.execute(self._SQL_OBTENER, (self.proceso, self.huella))
+            fila = cursor.fetchone()
+            if fila is None:
+                cursor.execute(self._SQL_CREAR, (self.proceso, self.huella, self.ruta[-300:]))
+            else:
+                self.registros = int(fila[0] or 0)
+                self.completada = fila[1] == "completada"
+        if self.completada and repetir_completada:
+            print(f"[INFO]: {self.ruta} ya fue importado; se vuelve a sincronizar completo.")
+            self.reiniciar()
+        elif self.completada:
+            print(f"[INFO]: {self.ruta} ya fue importado por completo.")
+        elif self.registros:
+            print(f"[INFO]: Reanudando la importación de {self.ruta} desde el registro {self.registros + 1}.")
+        return self.registros
+
+    def reiniciar(self):
+        """Vuelve a importar desde el primer registro un archivo ya completado."""
+        with self.db.transaccion() as conn, conn.cursor() as cursor:
+            cursor.execute(self._SQL_REINICIAR, (self.proceso, self.huella))
+        self.registros = 0
+        self.completada = False
+        self.congelado = False
+
+    def pendientes(self, registros):
+        """Descarta del iterable los registros ya confirmados en una ejecución anterior."""
+        return islice(registros, self.registros, None)
+
+    def avanzar(self, cursor, registros: int):
+        """Registra, dentro de la transacción del lote, que los primeros registros ya se procesaron."""
+        if not self.congelado:
+            cursor.execute(self._SQL_AVANZAR, (registros, self.proceso, self.huella))
+            self.registros = registros
+
+    def congelar(self):
+        """Detiene el avance tras un lote fallido; los cargadores dejan de procesar lotes.
+
+        Confirmar lotes posteriores dejaría filas más allá del avance registrado, y la
+        reanudación las volvería a insertar.
+        """
+        self.congelado = True
+
+    def completar(self):
+        """Marca la importación como terminada si ningún lote quedó pendiente."""
+        if self.congelado:
+            print(f"[WARN]: La importación de {self.ruta} se detuvo tras el registro {self.registros}; "
+                  "vuelva a ejecutarla para reanudarla.")
+            return
+        with self.db.transaccion() as conn, conn.cursor() as cursor:
+            cursor.execute(self._SQL_ESTADO, ("completada", self.proceso, self.huella))
+        self.completada = True
+
+
+def lotes_validados(registros, validador: ValidadorLote, tamano_lote: int, rechazar, punto_control=None):
+    """Agrupa los registros en bloques, los valida en memoria y genera (limpios, consumidos).
+
+    consumidos es la cantidad de registros leídos hasta el final del bloque (incluidos
+    los ya confirmados según punto_control). rechazar(registro, motivo) recibe cada
+    registro descartado, de modo que solo los lotes limpios llegan al DML.
+    """
+    consumidos = 0
+    if punto_control:
+        registros = punto_control.pendientes(registros)
+        consumidos = punto_control.registros
+    bloque = []
+    for registro in registros:
+        consumidos += 1
+        bloque.append(registro)
+        if len(bloque) >= tamano_lote:
+            yield _validar_bloque(bloque, validador, rechazar), consumidos
+            bloque = []
+    if bloque:
+        yield _validar_bloque(bloque, validador, rechazar), consumidos
+
+
+def _validar_bloque(bloque, validador, rechazar):
+    limpios, rechazados = validador.validar(bloque)
+    for registro, motivo in rechazados:
+        rechazar(registro, motivo)
+    return limpios
+
+
+class ResultadoImportacion:
+    """Resumen de una importación masiva: creados, existentes y errores por fila.
+
+    Con detalle=False solo se cuentan creados y existentes, para que importar archivos
+    de millones de registros no acumule sus nombres en memoria.
+    """
+
+    def __init__(self, detalle: bool = True):
+        self.detalle = detalle
+        self.creados = []
+        self.existentes = []
+        self.errores = []
+        self.total_creados = 0
+        self.total_existentes = 0
+        self.lotes = 0
+
+    def registrar_creado(self, nombre_usuario, tipo):
+        self.total_creados += 1
+        if self.detalle:
+            self.creados.append((nombre_usuario, tipo))
+
+    def registrar_existente(self, nombre_usuario):
+        self.total_existentes += 1
+        if self.detalle:
+            self.existentes.append(nombre_usuario)
+
+    def registrar_error(self, nombre_usuario, mensaje):
+        self.errores.append((nombre_usuario, mensaje))
+
+
+class ImportadorUsuarios:
+    """Importa usuarios por lotes usando DML por arreglos (executemany).
+
+    Cada lote cuesta un número fijo de viajes a la BD sin importar su tamaño: una
+    consulta de existencia, un executemany sobre rr_usuario, uno por tabla de rol y
+    un único commit. Con batcherrors las filas que fallan se informan sin detener el lote.
+    Las claves se encriptan en el ServicioHash mientras se inserta el lote anterior.
+    """
+
+    MAX_LOTE = 1000  # Límite de elementos de una lista IN en Oracle.
+
+    _SQL_EXISTENTES = "SELECT nombre_usuario FROM rr_usuario WHERE nombre_usuario IN ({binds})"
+    _SQL_USUARIO = """
+        INSERT INTO rr_usuario (nombre_usuario, clave, nombre, apellido, fecha_nacimiento, tipo, telefono, email)
+        VALUES (:usuario, :clave, :nombre, :apellido, TO_DATE(:fecha_nacimiento, 'YYYY-MM-DD'), :tipo, :telefono, :email)
+    """
+    _SQL_PACIENTE = """
+        INSERT INTO rr_paciente (id_paciente, comuna, fecha_primera_visita)
+        SELECT id, :comuna, COALESCE(TO_DATE(:fecha_primera_visita, 'YYYY-MM-DD'), SYSDATE)
+        FROM rr_usuario WHERE nombre_usuario = :usuario
+    """
+    _SQL_MEDICO = """
+        INSERT INTO rr_medico (id_medico, especialidad, horario_atencion, fecha_ingreso)
+        SELECT id, :especialidad, :horario_atencion, COALESCE(TO_DATE(:fecha_ingreso, 'YYYY-MM-DD'), SYSDATE)
+        FROM rr_usuario WHERE nombre_usuario = :usuario
+    """
+    _SQL_DESHACER_USUARIO = "DELETE FROM rr_usuario WHERE nombre_usuario = :usuario"
+
+    # Los repetidos se detectan dentro del lote; entre lotes los descarta la consulta de
+    # existencia junto con los nombres del lote que aún se está insertando.
+    VALIDADOR = ValidadorLote(COLUMNAS_USUARIO, ("nombre_usuario",), "nombre de usuario repetido en el archivo")
+
+    def __init__(self, db, tamano_lote: int = 500, servicio_hash: ServicioHash = None):
+        """servicio_hash permite compartir un pool de hashing; si no se entrega se crea uno por importación."""
+        self.db = db
+        self.tamano_lote = max(1, min(tamano_lote, self.MAX_LOTE))
+        self.servicio_hash = servicio_hash
+
+    def importar(self, registros, detalle: bool = True, punto_control: PuntoControl = None,
+                 rechazos: ArchivoRechazos = None) -> ResultadoImportacion:
+        """Importa un iterable de diccionarios de usuario y devuelve el resumen.
+
+        Claves: nombre_usuario, clave, nombre, apellido, fecha_nacimiento (YYYY-MM-DD), tipo
+        y opcionalmente telefono, email, comuna, fecha_primera_visita, especialidad,
+        horario_atencion y fecha_ingreso. registros puede ser un generador: se consume de
+        a un lote, así la memoria usada no depende del tamaño del archivo. Con un
+        punto_control iniciado se omiten los registros ya confirmados, cada lote
+        registra su avance y la importación se detiene en el primer lote fallido. Los
+        registros que no pasan la validación se informan en el resultado y, si se
+        entrega, en el archivo de rechazos.
+        """
+        resultado = ResultadoImportacion(detalle)
+
+        def rechazar(registro, motivo):
+            resultado.registrar_error(registro.get("nombre_usuario") if isinstance(registro, dict) else None, motivo)
+            if rechazos:
+                rechazos.escribir(registro, motivo)
+
+        servicio = self.servicio_hash or ServicioHash()
+        try:
+            pendiente = None
+            sin_verificar = False
+            lotes = lotes_validados(registros, self.VALIDADOR, self.tamano_lote, rechazar, punto_control)
+            for lote, consumidos in lotes:
+                if not lote:
+                    continue
+                # El lote pendiente aún no se confirma: sus nombres no los ve la consulta.
+                en_curso = {r["nombre_usuario"] for r in pendiente[0]} if pendiente else ()
+                nuevos = self._filtrar_existentes(lote, resultado, en_curso)
+                if nuevos is None:
+                    sin_verificar = True
+                    if punto_control:
+                        break
+                    continue
+                if not nuevos:
+                    continue
+                hashes = servicio.enviar([r["clave"] for r in nuevos])
+                # Mientras el pool calcula los hashes de este lote se inserta el anterior.
+                if pendiente and not self._importar_lote(*pendiente, resultado, punto_control) and punto_control:
+                    pendiente = None
+                    break
+                pendiente = (nuevos, hashes, consumidos)
+            if pendiente:
+                self._importar_lote(*pendiente, resultado, punto_control)
+            if sin_verificar and punto_control:
+                punto_control.congelar()
+        finally:
+            if self.servicio_hash is None:
+                servicio.cerrar()
+        return resultado
+
+    def _filtrar_existentes(self, lote, resultado, en_curso=()):
+        """Descarta, con una sola consulta, los usuarios del lote que ya existen en la BD.
+
+        en_curso son los nombres del lote anterior, que se inserta en paralelo y todavía
+        no se confirma; también se informan como existentes. Devuelve None si la consulta falla.
+        """
+        binds = ", ".join(f":{i + 1}" for i in range(len(lote)))
+        try:
+            with self.db.conexion() as conn, conn.cursor() as cursor:
+                cursor.execute(self._SQL_EXISTENTES.format(binds=binds), [r["nombre_usuario"] for r in lote])
+                existentes = {fila[0] for fila in cursor.fetchall()}
+        except Exception as e:
+            for registro in lote:
+                resultado.registrar_error(registro["nombre_usuario"], f"no se pudo verificar su existencia: {e}")
+            return None
+        nuevos = []
+        for registro in lote:
+            if registro["nombre_usuario"] in existentes or registro["nombre_usuario"] in en_curso:
+                resultado.registrar_existente(registro["nombre_usuario"])
+            else:
+                nuevos.append(registro)
+        return nuevos
+
+    def _importar_lote(self, nuevos, hashes, consumidos, resultado, punto_control=None) -> bool:
+        """Inserta un lote en una transacción; un fallo general marca todo el lote con error y devuelve False."""
+        resultado.lotes += 1
+        try:
+            claves = hashes.resultado()
+            with self.db.transaccion() as conn, conn.cursor() as cursor:
+                fallidos = self._insertar_lote(cursor, nuevos, claves)
+                if punto_control:
+                    punto_control.avanzar(cursor, consumidos)
+        except Exception as e:
+            for registro in nuevos:
+                resultado.registrar_error(registro["nombre_usuario"], f"lote revertido: {e}")
+            if punto_control:
+                punto_control.congelar()
+            return False
+        for posicion, registro in enumerate(nuevos):
+            if posicion in fallidos:
+                resultado.registrar_error(registro["nombre_usuario"], fallidos[posicion])
+            else:
+                resultado.registrar_creado(registro["nombre_usuario"], registro["tipo"])
+        return True
+
+    def _insertar_lote(self, cursor, nuevos, claves):
+        """Inserta los usuarios del lote y sus filas de rol.
+
+        Devuelve un diccionario que asocia la posición en nuevos con el error de esa fila.
+        """
+        filas = [self._valores_usuario(r, clave) for r, clave in zip(nuevos, claves)]
+        fallidos = self._ejecutar_lote(cursor, self._SQL_USUARIO, filas, range(len(nuevos)))
+
+        roles = (("paciente", self._SQL_PACIENTE, self._valores_paciente),
+                 ("medico", self._SQL_MEDICO, self._valores_medico))
+        for tipo, sql, valores in roles:
+            posiciones = [i for i, r in enumerate(nuevos) if r["tipo"] == tipo and i not in fallidos]
+            if posiciones:
+                errores_rol = self._ejecutar_lote(cursor, sql, [valores(nuevos[i]) for i in posiciones], posiciones)
+                if errores_rol:
+                    # El usuario quedó sin fila de rol: se retira para no dejarlo a medias.
+                    cursor.executemany(self._SQL_DESHACER_USUARIO,
+                                       [{'usuario': nuevos[i]["nombre_usuario"]} for i in errores_rol])
+                    fallidos.update(errores_rol)
+        return fallidos
+
+    @staticmethod
+    def _ejecutar_lote(cursor, sql, filas, posiciones):
+        """executemany con batcherrors; devuelve {posición original: mensaje} de las filas fallidas."""
+        cursor.executemany(sql, filas, batcherrors=True)
+        return {posiciones[error.offset]: error.message for error in cursor.getbatcherrors()}
+
+    @staticmethod
+    def _valores_usuario(registro, clave_encriptada):
+        return {
+            'usuario': registro["nombre_usuario"],
+            'clave': clave_encriptada,
+            'nombre': registro["nombre"],
+            'apellido': registro["apellido"],
+            'fecha_nacimiento': registro["fecha_nacimiento"],
+            'tipo': registro["tipo"],
+            'telefono': registro.get("telefono") or None,
+            'email': registro.get("email") or None
+        }
+
+    @staticmethod
+    def _valores_paciente(registro):
+        return {
+            'usuario': registro["nombre_usuario"],
+            'comuna': registro.get("comuna"),
+            'fecha_primera_visita': registro.get("fecha_primera_visita")
+        }
+
+    @staticmethod
+    def _valores_medico(registro):
+        return {
+            'usuario': registro["nombre_usuario"],
+            'especialidad': registro.get("especialidad"),
+            'horario_atencion': registro.get("horario_atencion"),
+            'fecha_ingreso': registro.get("fecha_ingreso")
+        }
+
+
+class ResultadoCarga:
+    """Resumen de una carga de filas: insertadas y errores por fila."""
+
+    def __init__(self):
+        self.insertados = 0
+        self.errores = []
+        self.lotes = 0
+
+    def registrar_error(self, fila, mensaje):
+        self.errores.append((fila, mensaje))
+
+    def resumen(self) -> str:
+        return f"insertados: {self.insertados}, con error: {len(self.errores)}"
+
+
+class ResultadoCargaInsumos(ResultadoCarga):
+    """Resumen de una carga de insumos: insertados, actualizados, sin cambios y errores por fila."""
+
+    def __init__(self):
+        super().__init__()
+        self.actualizados = 0
+        self.sin_cambios = 0
+
+    def resumen(self) -> str:
+        return (f"insertados: {self.insertados}, actualizados: {self.actualizados}, "
+                f"sin cambios: {self.sin_cambios}, con error: {len(self.errores)}")
+
+
+class CargadorInsumos:
+    """Sincroniza el catálogo de insumos por (nombre, tipo) con un MERGE por arreglos.
+
+    Por lote se consulta una vez el estado actual de sus insumos para clasificarlos, se
+    ejecuta un único executemany del MERGE solo con los nuevos o modificados y se
+    confirma una vez. Volver a cargar el mismo archivo no duplica ni modifica nada.
+    """
+
+    MAX_LOTE = 1000  # Límite de elementos de una lista IN en Oracle.
+
+    _SQL_ACTUALES = "SELECT nombre, tipo, stock, costo_usd FROM rr_insumos WHERE (nombre, tipo) IN ({binds})"
+    # SQLite no tiene MERGE; su equivalente es INSERT ... ON CONFLICT sobre el índice único.
+    _SQL_UPSERT = {
+        "oracle": """
+            MERGE INTO rr_insumos i
+            USING (SELECT :nombre AS nombre, :tipo AS tipo, :stock AS stock, :costo_usd AS costo_usd FROM dual) s
+            ON (i.nombre = s.nombre AND i.tipo = s.tipo)
+            WHEN MATCHED THEN UPDATE SET i.stock = s.stock, i.costo_usd = s.costo_usd
+            WHEN NOT MATCHED THEN INSERT (nombre, tipo, stock, costo_usd)
+                VALUES (s.nombre, s.tipo, s.stock, s.costo_usd)
+        """,
+        "sqlite": """
+            INSERT INTO rr_insumos (nombre, tipo, stock, costo_usd) VALUES (:nombre, :tipo, :stock, :costo_usd)
+            ON CONFLICT (nombre, tipo) DO UPDATE SET stock = excluded.stock, costo_usd = excluded.costo_usd
+        """,
+    }
+
+    # Los repetidos se detectan dentro del lote; entre lotes el último valor leído prevalece.
+    VALIDADOR = ValidadorLote(COLUMNAS_INSUMO, ("nombre", "tipo"), "insumo repetido en el archivo")
+
+    def __init__(self, db, tamano_lote: int = 500):
+        self.db = db
+        self.tamano_lote = max(1, min(tamano_lote, self.MAX_LOTE))
+
+    def cargar(self, registros, punto_control: PuntoControl = None, rechazos: ArchivoRechazos = None,
+               progreso=None) -> ResultadoCargaInsumos:
+        """Carga un iterable de diccionarios con nombre, tipo, stock y costo_usd y devuelve el resumen.
+
+        Con un punto_control iniciado se omiten los registros ya confirmados y la carga se
+        detiene en el primer lote fallido. Los registros que no pasan la validación se
+        informan en el resultado y en el archivo de rechazos. progreso(registros leídos)
+        se llama tras cada lote.
+        """
+        resultado = ResultadoCargaInsumos()
+
+        def rechazar(registro, motivo):
+            resultado.registrar_error(registro.get("nombre") if isinstance(registro, dict) else None, motivo)
+            if rechazos:
+                rechazos.escribir(registro, motivo)
+
+        try:
+            for lote, consumidos in lotes_validados(registros, self.VALIDADOR, self.tamano_lote, rechazar,
+                                                    punto_control):
+                if lote:
+                    self._cargar_lote(lote, consumidos, resultado, punto_control)
+                    if punto_control and punto_control.congelado:
+                        break
+                if progreso:
+                    progreso(consumidos)
+        finally:
+            if resultado.lotes:
+                InsumosModel.catalogo.invalidar()
+        return resultado
+
+    def _cargar_lote(self, lote, consumidos, resultado, punto_control=None):
+        """Aplica un lote en una transacción; un fallo general marca todo el lote con error."""
+        resultado.lotes += 1
+        try:
+            with self.db.transaccion() as conn, conn.cursor() as cursor:
+                insertados, actualizados, sin_cambios, fallidos = self._aplicar_lote(cursor, lote)
+                if punto_control:
+                    punto_control.avanzar(cursor, consumidos)
+        except Exception as e:
+            for fila in lote:
+                resultado.registrar_error(fila["nombre"], f"lote revertido: {e}")
+            if punto_control:
+                punto_control.congelar()
+            return
+        resultado.insertados += insertados
+        resultado.actualizados += actualizados
+        resultado.sin_cambios += sin_cambios
+        for fila, mensaje in fallidos:
+            resultado.registrar_error(fila["nombre"], mensaje)
+
+    def _aplicar_lote(self, cursor, lote):
+        """Clasifica el lote contra la BD y ejecuta el MERGE de los insumos nuevos o modificados."""
+        binds = ", ".join(f"(:{2 * i + 1}, :{2 * i + 2})" for i in range(len(lote)))
+        cursor.execute(self._SQL_ACTUALES.format(binds=binds), [v for f in lote for v in (f["nombre"], f["tipo"])])
+        actuales = {(fila[0], fila[1]): (fila[2], fila[3]) for fila in cursor.fetchall()}
+
+        cambios, nuevos = [], set()
+        for posicion, fila in enumerate(lote):
+            actual = actuales.get((fila["nombre"], fila["tipo"]))
+            if actual is None:
+                nuevos.add(posicion)
+            elif actual[0] == fila["stock"] and float(actual[1] or 0.0) == fila["costo_usd"]:
+                continue
+            cambios.append(posicion)
+        if not cambios:
+            return 0, 0, len(lote), []
+
+        filas = [{c: lote[i][c] for c in ("nombre", "tipo", "stock", "costo_usd")} for i in cambios]
+        cursor.executemany(self._SQL_UPSERT[self.db.dialecto], filas, batcherrors=True)
+        errores = {cambios[error.offset]: error.message for error in cursor.getbatcherrors()}
+        fallidos = [(lote[i], mensaje) for i, mensaje in errores.items()]
+        insertados = len(nuevos - errores.keys())
+        actualizados = len(cambios) - len(errores) - insertados
+        return insertados, actualizados, len(lote) - len(cambios), fallidos
+
+
+class CargadorFilas:
+    """Inserta filas validadas en una tabla con un executemany por lote y un commit por lote.
+
+    Sirve para tablas sin clave natural (consultas, agenda): cada fila es un INSERT nuevo,
+    así que la reanudación segura depende del punto de control.
+    """
+
+    def __init__(self, db, sql: str, columnas: list, tamano_lote: int = 500):
+        self.db = db
+        self.sql = sql
+        self.columnas = [columna.nombre for columna in columnas]
+        self.validador = ValidadorLote(columnas)
+        self.tamano_lote = max(1, tamano_lote)
+
+    def cargar(self, registros, punto_control: PuntoControl = None, rechazos: ArchivoRechazos = None,
+               progreso=None) -> ResultadoCarga:
+        """Carga un iterable de diccionarios y devuelve el resumen; ver CargadorInsumos.cargar."""
+        resultado = ResultadoCarga()
+
+        def rechazar(registro, motivo):
+            resultado.registrar_error(registro, motivo)
+            if rechazos:
+                rechazos.escribir(registro, motivo)
+
+        for lote, consumidos in lotes_validados(registros, self.validador, self.tamano_lote, rechazar, punto_control):
+            if lote:
+                self._cargar_lote(lote, consumidos, resultado, punto_control)
+                if punto_control and punto_control.congelado:
+                    break
+            if progreso:
+                progreso(consumidos)
+        return resultado
+
+    def _cargar_lote(self, lote, consumidos, resultado, punto_control=None):
+        """Inserta un lote en una transacción; un fallo general marca todo el lote con error."""
+        resultado.lotes += 1
+        filas = [{c: fila[c] for c in self.columnas} for fila in lote]
+        try:
+            with self.db.transaccion() as conn, conn.cursor() as cursor:
+                cursor.executemany(self.sql, filas, batcherrors=True)
+                errores = {error.offset: error.message for error in cursor.getbatcherrors()}
+                if punto_control:
+                    punto_control.avanzar(cursor, consumidos)
+        except Exception as e:
+            for fila in filas:
+                resultado.registrar_error(fila, f"lote revertido: {e}")
+            if punto_control:
+                punto_control.congelar()
+            return
+        resultado.insertados += len(filas) - len(errores)
+        for posicion, mensaje in errores.items():
+            resultado.registrar_error(filas[posicion], mensaje)
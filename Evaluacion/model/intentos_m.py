@@ -0,0 +1,157 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+
+def _leer_entero(variable: str, por_defecto: int) -> int:
+    """Lee un entero positivo de la variable de entorno; un valor inválido deja el por defecto."""
+    valor = os.environ.get(variable)
+    if not valor:
+        return por_defecto
+    try:
+        numero = int(valor)
+    except ValueError:
+        numero = 0
+    if numero < 1:
+        print(f"[WARN]: {variable}='{valor}' no es un entero positivo, se usará {por_defecto}.")
+        return por_defecto
+    return numero
+
+
+# Límite de inicios de sesión fallidos. Se rechazan los intentos en exceso antes de
+# consultar la BD y de correr bcrypt, así una ráfaga de claves malas no consume la CPU.
+
+MAX_FALLOS_USUARIO = _leer_entero("MEDIPLUS_LOGIN_MAX_USUARIO", 5)
+MAX_FALLOS_ORIGEN = _leer_entero("MEDIPLUS_LOGIN_MAX_ORIGEN", 20)
+VENTANA_SEGUNDOS = _leer_entero("MEDIPLUS_LOGIN_VENTANA", 300)
+
+
+class VentanaDeslizante:
+    """Contador de eventos por clave en una ventana deslizante aproximada.
+
+    Cada clave guarda solo el conteo de la ventana fija actual y el de la anterior; el
+    total se estima ponderando la anterior por la parte que aún cae dentro de la ventana.
+    Se conservan a lo sumo max_claves claves (se descarta la menos reciente), por lo que
+    la memoria no crece con la cantidad de usuarios u orígenes distintos.
+    """
+
+    def __init__(self, limite: int, ventana: float, max_claves: int = 10000):
+        self.limite = limite
+        self.ventana = ventana
+        self.max_claves = max_claves
+        self._claves = OrderedDict()
+
+    def _estado(self, clave, ahora: float):
+        inicio_actual = ahora - ahora % self.ventana
+        estado = self._claves.get(clave)
+        if estado is None or estado[0] < inicio_actual - self.ventana:
+            return None, inicio_actual
+        if estado[0] < inicio_actual:
+            estado = [inicio_actual, 0, estado[1]]
+            self._claves[clave] = estado
+        return estado, inicio_actual
+
+    def cuenta(self, clave, ahora: float = None) -> float:
+        ahora = time.time() if ahora is None else ahora
+        estado, inicio_actual = self._estado(clave, ahora)
+        if estado is None:
+            return 0.0
+        peso_anterior = 1 - (ahora - inicio_actual) / self.ventana
+        return estado[1] + estado[2] * peso_anterior
+
+    def excedido(self, clave, ahora: float = None) -> bool:
+        return self.cuenta(clave, ahora) >= self.limite
+
+    def registrar(self, clave, ahora: float = None):
+        ahora = time.time() if ahora is None else ahora
+        estado, inicio_actual = self._estado(clave, ahora)
+        if estado is None:
+            estado = [inicio_actual, 0, 0]
+            self._claves[clave] = estado
+        estado[1] += 1
+        self._claves.move_to_end(clave)
+        while len(self._claves) > self.max_claves:
+            self._claves.popitem(last=False)
+
+    def olvidar(self, clave):
+        self._claves.pop(clave, None)
+
+    def __len__(self):
+        return len(self._claves)
+
+
+class LimitadorIntentos:
+    """Limita los inicios de sesión fallidos por nombre de usuario y por origen.
+
+    permitido() se consulta antes de autenticar; registrar_fallo() y registrar_exito()
+    después. Un inicio correcto reinicia el contador del usuario, no el del origen. El
+    origen (p. ej. la IP del cliente) es opcional: con origen None solo se cuenta por
+    usuario, porque una clave fija compartida bloquearía a todos a la vez.
+
+    Los contadores viven en memoria: un operador desbloquea un usuario u origen con
+    desbloquear() o reiniciando el proceso; si no, el bloqueo cae solo al pasar la
+    ventana. metricas() entrega los contadores acumulados y exportar_metricas() los
+    mismos en el formato de texto de Prometheus.
+    """
+
+    def __init__(self, max_usuario: int = None, max_origen: int = None, ventana: float = None,
+                 max_claves: int = 10000):
+        ventana = ventana or VENTANA_SEGUNDOS
+        self.por_usuario = VentanaDeslizante(max_usuario or MAX_FALLOS_USUARIO, ventana, max_claves)
+        self.por_origen = VentanaDeslizante(max_origen or MAX_FALLOS_ORIGEN, ventana, max_claves)
+        self._lock = threading.Lock()
+        self._contadores = {"intentos": 0, "exitosos": 0, "fallidos": 0, "bloqueados_usuario": 0,
+                            "bloqueados_origen": 0}
+
+    @staticmethod
+    def _clave_usuario(nombre_usuario: str) -> str:
+        return nombre_usuario.strip().lower()
+
+    def permitido(self, nombre_usuario: str, origen: str = None) -> bool:
+        """Indica si el intento puede continuar; si no, ya quedó contado como bloqueado."""
+        ahora = time.time()
+        with self._lock:
+            self._contadores["intentos"] += 1
+            if origen is not None and self.por_origen.excedido(origen, ahora):
+                self._contadores["bloqueados_origen"] += 1
+                return False
+            if self.por_usuario.excedido(self._clave_usuario(nombre_usuario), ahora):
+                self._contadores["bloqueados_usuario"] += 1
+                return False
+            return True
+
+    def registrar_fallo(self, nombre_usuario: str, origen: str = None):
+        ahora = time.time()
+        with self._lock:
+            self._contadores["fallidos"] += 1
+            self.por_usuario.registrar(self._clave_usuario(nombre_usuario), ahora)
+            if origen is not None:
+                self.por_origen.registrar(origen, ahora)
+
+    def registrar_exito(self, nombre_usuario: str):
+        with self._lock:
+            self._contadores["exitosos"] += 1
+            self.por_usuario.olvidar(self._clave_usuario(nombre_usuario))
+
+    def desbloquear(self, nombre_usuario: str = None, origen: str = None):
+        """Borra los fallos acumulados del usuario y/o del origen indicados."""
+        with self._lock:
+            if nombre_usuario is not None:
+                self.por_usuario.olvidar(self._clave_usuario(nombre_usuario))
+            if origen is not None:
+                self.por_origen.olvidar(origen)
+
+    def metricas(self) -> dict:
+        with self._lock:
+            return dict(self._contadores, usuarios_rastreados=len(self.por_usuario),
+                        origenes_rastreados=len(self.por_origen))
+
+    def exportar_metricas(self, prefijo: str = "mediplus_login") -> str:
+        lineas = []
+        for nombre, valor in self.metricas().items():
+            tipo = "gauge" if nombre.endswith("rastreados") else "counter"
+            metrica = f"{prefijo}_{nombre}" + ("_total" if tipo == "counter" else "")
+            lineas.append(f"# TYPE {metrica} {tipo}")
+            lineas.append(f"{metrica} {valor}")
+        return "\n".join(lineas) + "\n"
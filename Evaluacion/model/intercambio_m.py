@@ -0,0 +1,83 @@
+import csv
+from datetime import datetime
+
+from model.importacion_m import CargadorFilas, CargadorInsumos
+from model.objetos_m import ConsultasModel, AgendaModel
+from model.validacion_m import Columna
+
+# Intercambio masivo en CSV con los sistemas de farmacia y agenda. La importación usa
+# los mismos cargadores por lotes que los JSON; la exportación recorre la tabla con
+# iterar_filas y escribe fila a fila, sin cargar la tabla en memoria.
+
+COLUMNAS_CONSULTA = [
+    Columna("id_paciente", "entero", obligatoria=True),
+    Columna("id_medico", "entero", obligatoria=True),
+    Columna("id_receta", "entero"),
+    Columna("fecha", "fecha", obligatoria=True),
+    Columna("comentarios"),
+    Columna("valor", "decimal", por_defecto=0.0),
+]
+COLUMNAS_AGENDA = [
+    Columna("id_paciente", "entero", obligatoria=True),
+    Columna("id_medico", "entero", obligatoria=True),
+    Columna("fecha_consulta", "fecha", obligatoria=True),
+    Columna("estado", por_defecto="pendiente", valores=("pendiente", "realizada", "cancelada")),
+]
+
+
+class TablaCSV:
+    """Describe una tabla intercambiable en CSV: encabezados, consulta de exportación y cargador."""
+
+    def __init__(self, encabezados: tuple, sql_exportar: str, crear_cargador):
+        self.encabezados = encabezados
+        self.sql_exportar = sql_exportar
+        self.crear_cargador = crear_cargador
+
+
+TABLAS_CSV = {
+    "insumos": TablaCSV(
+        ("id", "nombre", "tipo", "stock", "costo_usd"),
+        "SELECT id, nombre, tipo, stock, costo_usd FROM rr_insumos ORDER BY id",
+        lambda db, tamano_lote: CargadorInsumos(db, tamano_lote)
+    ),
+    "consultas": TablaCSV(
+        ("id", "id_paciente", "id_medico", "id_receta", "fecha", "comentarios", "valor"),
+        "SELECT id, id_paciente, id_medico, id_receta, fecha, comentarios, valor FROM rr_consultas ORDER BY id",
+        lambda db, tamano_lote: CargadorFilas(db, ConsultasModel._SQL_CREAR, COLUMNAS_CONSULTA, tamano_lote)
+    ),
+    "agenda": TablaCSV(
+        ("id", "id_paciente", "id_medico", "fecha_consulta", "estado"),
+        "SELECT id, id_paciente, id_medico, fecha_consulta, estado FROM rr_agenda ORDER BY id",
+        lambda db, tamano_lote: CargadorFilas(db, AgendaModel._SQL_AGENDAR, COLUMNAS_AGENDA, tamano_lote)
+    ),
+}
+
+
+def _valor_csv(valor):
+    """Formatea un valor para CSV; las fechas quedan en YYYY-MM-DD, el formato que se importa."""
+    if valor is None:
+        return ""
+    if isinstance(valor, datetime):
+        return valor.strftime("%Y-%m-%d")
+    return valor
+
+
+def exportar_csv(db, tabla: str, ruta: str, tamano_lote: int = 500, progreso=None) -> int:
+    """Exporta la tabla a un CSV con encabezados y devuelve la cantidad de filas escritas.
+
+    Las filas se traen de a tamano_lote (arraysize) y progreso(filas escritas) se llama
+    tras cada lote.
+    """
+    definicion = TABLAS_CSV[tabla]
+    escritas = 0
+    with open(ruta, "w", newline="", encoding="utf-8") as archivo:
+        escritor = csv.writer(archivo)
+        escritor.writerow(definicion.encabezados)
+        for fila in db.iterar_filas(definicion.sql_exportar, arraysize=tamano_lote):
+            escritor.writerow([_valor_csv(valor) for valor in fila])
+            escritas += 1
+            if progreso and escritas % tamano_lote == 0:
+                progreso(escritas)
+    if progreso:
+        progreso(escritas)
+    return escritas
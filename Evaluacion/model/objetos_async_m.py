@@ -0,0 +1,331 @@
+from model.objetos_m import InsumosModel, RecetasModel, ConsultasModel, AgendaModel, ResumenPacienteModel, MapaIdentidad
+from model.filas_m import FilaInsumo
+
+# Variantes asyncio de los modelos de objetos. Usan las mismas sentencias SQL que
+# model/objetos_m.py y se instancian con una ConexionOracleAsync.
+
+
+class InsumosModelAsync(InsumosModel):
+    """Modelo asyncio de los Insumos Médicos."""
+
+    async def crear_insumo(self) -> bool:
+        """Crea un nuevo insumo médico en la base de datos."""
+        try:
+            await self.db.ejecutar(self._SQL_CREAR, (self.nombre, self.tipo, self.stock, self.costo_usd))
+            self.catalogo.invalidar()
+            print(f"[INFO]: Insumo '{self.nombre}' creado correctamente.")
+            return True
+        except Exception as e:
+            print(f"[ERROR]: No se pudo crear el insumo. {e}")
+            return False
+
+    async def iterar_insumos(self):
+        """Genera (async for) los insumos registrados a medida que llegan desde la BD."""
+        try:
+            async for insumo in self.db.iterar_filas(self._SQL_LISTADO.format(filtro=""), fabrica=FilaInsumo):
+                yield insumo
+        except Exception as e:
+            print(f"[ERROR]: No se pudo listar los insumos. {e}")
+
+    async def listar_insumos(self):
+        """Obtiene y devuelve todos los insumos médicos registrados."""
+        return [insumo async for insumo in self.iterar_insumos()]
+
+    async def pagina_insumos(self, tamano: int = 10, despues_de: tuple = None):
+        """Devuelve una página de insumos y la clave de la siguiente; ver InsumosModel.pagina_insumos."""
+        consulta, parametros = self._sql_pagina(despues_de)
+        try:
+            insumos, hay_mas = await self.db.pagina_filas(consulta, parametros, tamano, FilaInsumo)
+        except Exception as e:
+            print(f"[ERROR]: No se pudo listar los insumos. {e}")
+            return [], None
+        return insumos, ((insumos[-1].id,) if hay_mas else None)
+
+    async def eliminar_insumo(self) -> bool:
+        """Elimina un insumo médico por su ID."""
+        try:
+            await self.db.ejecutar(self._SQL_ELIMINAR, (self.id,))
+            self.catalogo.quitar(self.id)
+            print(f"[INFO]: Insumo con ID '{self.id}' eliminado correctamente.")
+            return True
+        except Exception as e:
+            print(f"[ERROR]: No se pudo eliminar el insumo. {e}")
+            return False
+
+    async def actualizar_stock(self, nuevo_stock: int) -> bool:
+        """Actualiza el stock de un insumo."""
+        try:
+            await self.db.ejecutar(self._SQL_ACTUALIZAR_STOCK, (nuevo_stock, self.id))
+            self.catalogo.actualizar_stock(self.id, nuevo_stock)
+            print(f"[INFO]: Stock del insumo ID '{self.id}' actualizado a {nuevo_stock}.")
+            return True
+        except Exception as e:
+            print(f"[ERROR]: No se pudo actualizar el stock. {e}")
+            return False
+
+
+class RecetasModelAsync(RecetasModel):
+    """Modelo asyncio de las Recetas Médicas."""
+
+    async def crear_receta(self) -> bool:
+        try:
+            async with self.db.transaccion() as conn:
+                with conn.cursor() as cursor:
+                    id_var = cursor.var(int)
+                    await cursor.execute(self._SQL_CREAR, (self.paciente.id, self.medico.id, self.descripcion,
+                                                           self.medicamentos_recetados, self.costo_clp, id_var))
+                    self.id = id_var.getvalue()[0]
+            print(f"[INFO]: Receta creada correctamente con ID {self.id}.")
+            return True
+        except Exception as e:
+            print(f"[ERROR]: No se pudo crear la receta -> {e}.")
+            return False
+
+    async def obtener_insumos(self, id_receta: int = None):
+        try:
+            filas = await self.db.obtener_filas(self._SQL_INSUMOS, (self.id if id_receta is None else id_receta,))
+        except Exception as e:
+            print(f"[ERROR]: No se pudieron obtener insumos de la receta -> {e}.")
+            return []
+        return [(FilaInsumo(*fila[:5]), fila[5]) for fila in filas]
+
+    async def _insumos_de_recetas(self, ids: list) -> list:
+        """Filas de _SQL_INSUMOS_RECETAS de las recetas indicadas, en una consulta por cada MAX_IN ids."""
+        filas = []
+        for inicio in range(0, len(ids), self.MAX_IN):
+            bloque = ids[inicio:inicio + self.MAX_IN]
+            binds = ", ".join(f":{i + 1}" for i in range(len(bloque)))
+            filtro = f"WHERE ri.id_receta IN ({binds})"
+            filas.extend(await self.db.obtener_filas(self._SQL_INSUMOS_RECETAS.format(filtro=filtro), bloque))
+        return filas
+
+    async def cargar_insumos(self, recetas: list) -> list:
+        """Carga de una vez los insumos de una lista de recetas; ver RecetasModel.cargar_insumos."""
+        recetas = sorted(recetas, key=lambda receta: receta.id)
+        ids = [receta.id for receta in recetas]
+        try:
+            filas = await self._insumos_de_recetas(ids) if ids else []
+        except Exception as e:
+            print(f"[ERROR]: No se pudieron obtener insumos de las recetas -> {e}.")
+            return recetas
+        return list(self._unir_insumos(recetas, filas))
+
+    async def agregar_insumo(self, id_insumo: int, cantidad: int = 1) -> bool:
+        if not self.id:
+            print("[ERROR]: La receta debe existir antes de asociar insumos.")
+            return False
+        try:
+            await self.db.ejecutar(self._SQL_AGREGAR_INSUMO, (self.id, id_insumo, cantidad))
+            print(f"[INFO]: Insumo {id_insumo} agregado a receta {self.id} (cantidad {cantidad}).")
+            return True
+        except Exception as e:
+            print(f"[ERROR]: No se pudo asociar el insumo -> {e}.")
+            return False
+
+    async def obtener_receta(self, id_receta: int):
+        """Obtiene una receta médica por su ID."""
+        try:
+            return await self.db.obtener_fila(self._SQL_OBTENER, (id_receta,))
+        except Exception as e:
+            print(f"[ERROR]: No se pudo obtener la receta -> {e}.")
+            return None
+
+    async def eliminar_receta(self, id_receta: int) -> bool:
+        """Elimina una receta médica por su ID."""
+        try:
+            eliminadas = await self.db.ejecutar(self._SQL_ELIMINAR, (id_receta,))
+        except Exception as e:
+            print(f"[ERROR]: No se pudo eliminar la receta. {e}")
+            return False
+        if eliminadas > 0:
+            print(f"[INFO]: Receta con ID '{id_receta}' eliminada correctamente.")
+            return True
+        print(f"[ERROR]: No se encontró receta con ID '{id_receta}'.")
+        return False
+
+    async def iterar_recetas_paciente(self, nombre_usuario: str, mapa: MapaIdentidad = None):
+        """Genera (async for) las recetas de un paciente a medida que llegan desde la BD.
+
+        Los insumos no se cargan (insumos queda en None): la conexión sigue tomada por la
+        iteración y, sin pool, otra consulta tendría que esperarla. listar_recetas_paciente
+        los carga con una segunda consulta.
+        """
+        fabrica = self._fabrica_paciente(MapaIdentidad() if mapa is None else mapa)
+        try:
+            async for receta in self.db.iterar_filas(self._SQL_RECETAS_PACIENTE, (nombre_usuario.strip(),),
+                                                     fabrica=fabrica):
+                yield receta
+        except Exception as e:
+            print(f"[ERROR]: No se pudieron listar las recetas del paciente -> {e}.")
+
+    async def listar_recetas_paciente(self, nombre_usuario: str, mapa: MapaIdentidad = None,
+                                      con_insumos: bool = True):
+        """Lista todas las recetas asociadas a un paciente por su nombre de usuario."""
+        recetas = [receta async for receta in self.iterar_recetas_paciente(nombre_usuario, mapa)]
+        if con_insumos and recetas:
+            consulta = self._SQL_INSUMOS_RECETAS.format(filtro=self._FILTRO_INSUMOS_PACIENTE)
+            await self._unir_insumos_async(recetas, consulta, (nombre_usuario.strip(),))
+        return recetas
+
+    async def _unir_insumos_async(self, recetas: list, consulta: str, parametros=None):
+        try:
+            filas = await self.db.obtener_filas(consulta, parametros)
+        except Exception as e:
+            print(f"[ERROR]: No se pudieron obtener insumos de las recetas -> {e}.")
+            return
+        for _ in self._unir_insumos(recetas, filas):
+            pass
+
+    async def iterar_recetas(self, mapa: MapaIdentidad = None):
+        """Genera (async for) todas las recetas; insumos queda en None, ver iterar_recetas_paciente."""
+        fabrica = self._fabrica(MapaIdentidad() if mapa is None else mapa)
+        try:
+            async for receta in self.db.iterar_filas(f"{self._SQL_LISTADO} {self._ORDEN}", fabrica=fabrica):
+                yield receta
+        except Exception as e:
+            print(f"[ERROR]: No se pudieron listar las recetas -> {e}.")
+
+    async def listar_recetas(self, mapa: MapaIdentidad = None, con_insumos: bool = True):
+        """Lista todas las recetas."""
+        recetas = [receta async for receta in self.iterar_recetas(mapa)]
+        if con_insumos and recetas:
+            await self._unir_insumos_async(recetas, self._SQL_INSUMOS_RECETAS.format(filtro=""))
+        return recetas
+
+    async def pagina_recetas(self, tamano: int = 10, despues_de: tuple = None, mapa: MapaIdentidad = None,
+                             con_insumos: bool = True):
+        """Devuelve una página de recetas y la clave de la siguiente; ver RecetasModel.pagina_recetas."""
+        fabrica = self._fabrica(MapaIdentidad() if mapa is None else mapa)
+        consulta, parametros = self._sql_pagina(despues_de)
+        try:
+            recetas, hay_mas = await self.db.pagina_filas(consulta, parametros, tamano, fabrica)
+        except Exception as e:
+            print(f"[ERROR]: No se pudieron listar las recetas -> {e}.")
+            return [], None
+        if con_insumos:
+            await self.cargar_insumos(recetas)
+        return recetas, ((recetas[-1].id,) if hay_mas else None)
+
+
+class ConsultasModelAsync(ConsultasModel):
+    """Modelo asyncio de las Consultas Médicas."""
+
+    async def crear_consulta(self) -> bool:
+        """Crea una nueva consulta médica en la base de datos."""
+        try:
+            await self.db.ejecutar(self._SQL_CREAR, self._valores_creacion())
+            print(f"[INFO]: Consulta creada correctamente.")
+            return True
+        except Exception as e:
+            print(f"[ERROR]: No se pudo crear la consulta -> {e}.")
+            return False
+
+    async def iterar_consultas(self, mapa: MapaIdentidad = None):
+        """Genera (async for) todas las consultas a medida que llegan desde la BD."""
+        fabrica = self._fabrica(MapaIdentidad() if mapa is None else mapa)
+        try:
+            for consulta in self._segmentos():
+                async for fila in self.db.iterar_filas(consulta, fabrica=fabrica):
+                    yield fila
+        except Exception as e:
+            print(f"[ERROR]: No se pudieron listar las consultas -> {e}.")
+
+    async def listar_consultas(self, mapa: MapaIdentidad = None):
+        """Lista todas las consultas."""
+        return [consulta async for consulta in self.iterar_consultas(mapa)]
+
+    async def pagina_consultas(self, tamano: int = 10, despues_de: tuple = None, mapa: MapaIdentidad = None):
+        """Devuelve una página de consultas y la clave de la siguiente; ver ConsultasModel.pagina_consultas."""
+        fabrica = self._fabrica(MapaIdentidad() if mapa is None else mapa)
+        try:
+            consultas, hay_mas = await self.db.pagina_segmentos(self._segmentos_pagina(despues_de), tamano, fabrica)
+        except Exception as e:
+            print(f"[ERROR]: No se pudieron listar las consultas -> {e}.")
+            return [], None
+        if not hay_mas:
+            return consultas, None
+        return consultas, (consultas[-1].fecha, consultas[-1].id)
+
+    async def iterar_consultas_paciente(self, nombre_usuario: str, mapa: MapaIdentidad = None):
+        """Genera (async for) las consultas de un paciente a medida que llegan desde la BD."""
+        fabrica = self._fabrica(MapaIdentidad() if mapa is None else mapa)
+        try:
+            for consulta in self._segmentos("u.nombre_usuario = :1"):
+                async for fila in self.db.iterar_filas(consulta, (nombre_usuario.strip(),), fabrica=fabrica):
+                    yield fila
+        except Exception as e:
+            print(f"[ERROR]: No se pudieron listar las consultas del paciente -> {e}.")
+
+    async def listar_consultas_paciente(self, nombre_usuario: str, mapa: MapaIdentidad = None):
+        """Lista todas las consultas asociadas a un paciente por su nombre de usuario."""
+        return [consulta async for consulta in self.iterar_consultas_paciente(nombre_usuario, mapa)]
+
+
+class AgendaModelAsync(AgendaModel):
+    """Modelo asyncio de la Agenda Médica."""
+
+    async def agendar_consulta(self) -> bool:
+        """Agrega una nueva consulta a la agenda."""
+        try:
+            await self.db.ejecutar(self._SQL_AGENDAR, self._valores_agenda())
+            print(f"[INFO]: Consulta agendada correctamente.")
+            return True
+        except Exception as e:
+            print(f"[ERROR]: No se pudo agendar la consulta -> {e}.")
+            return False
+
+    async def actualizar_estado(self, nuevo_estado: str) -> bool:
+        """Actualiza el estado de una consulta en la agenda."""
+        try:
+            await self.db.ejecutar(self._SQL_ACTUALIZAR_ESTADO, {'estado': nuevo_estado, 'id': self.id})
+            print(f"[INFO]: Estado actualizado para agenda ID {self.id}.")
+            return True
+        except Exception as e:
+            print(f"[ERROR]: No se pudo actualizar el estado -> {e}.")
+            return False
+
+    async def iterar_agenda(self, mapa: MapaIdentidad = None):
+        """Genera (async for) toda la agenda a medida que llega desde la BD."""
+        fabrica = self._fabrica(MapaIdentidad() if mapa is None else mapa)
+        try:
+            for consulta in self._segmentos():
+                async for fila in self.db.iterar_filas(consulta, fabrica=fabrica):
+                    yield fila
+        except Exception as e:
+            print(f"[ERROR]: No se pudieron listar la agenda -> {e}.")
+
+    async def listar_agenda(self, mapa: MapaIdentidad = None):
+        """Lista toda la agenda."""
+        return [agenda async for agenda in self.iterar_agenda(mapa)]
+
+    async def pagina_agenda(self, tamano: int = 10, despues_de: tuple = None, mapa: MapaIdentidad = None):
+        """Devuelve una página de la agenda y la clave de la siguiente; ver AgendaModel.pagina_agenda."""
+        fabrica = self._fabrica(MapaIdentidad() if mapa is None else mapa)
+        try:
+            agenda, hay_mas = await self.db.pagina_segmentos(self._segmentos_pagina(despues_de), tamano, fabrica)
+        except Exception as e:
+            print(f"[ERROR]: No se pudieron listar la agenda -> {e}.")
+            return [], None
+        if not hay_mas:
+            return agenda, None
+        return agenda, (agenda[-1].fecha_consulta, agenda[-1].id)
+
+
+class ResumenPacienteModelAsync(ResumenPacienteModel):
+    """Modelo asyncio del panel del paciente."""
+
+    async def obtener_resumen(self, paciente, max_recetas: int = 5, max_consultas: int = 5,
+                              max_agenda: int = 5, mapa: MapaIdentidad = None):
+        """Devuelve el ResumenPaciente del paciente; ver ResumenPacienteModel.obtener_resumen."""
+        fabrica = self._fabrica(paciente, MapaIdentidad() if mapa is None else mapa)
+        parametros = self._parametros(paciente, max_recetas, max_consultas, max_agenda)
+        total = max_recetas + max_consultas + max_agenda
+        try:
+            filas = [fila async for fila in self.db.iterar_filas(self._SQL_RESUMEN, parametros, arraysize=total + 1,
+                                                                 prefetchrows=total + 2, fabrica=fabrica)]
+        except Exception as e:
+            print(f"[ERROR]: No se pudo obtener el resumen del paciente -> {e}.")
+            return None
+        resumen = self._armar(paciente, filas)
+        await RecetasModelAsync(self.db).cargar_insumos(resumen.recetas)
+        return resumen
@@ -1,8 +1,147 @@
+import math
+import os
+import threading
+import time
+from datetime import date, datetime
+
 from model.personas_m import PacienteModel, MedicoModel
+from model.filas_m import Persona, FilaInsumo, FilaReceta, FilaConsulta, FilaAgenda, ResumenPaciente
+
+
+TTL_CATALOGO_POR_DEFECTO = 60
+
+
+def _leer_ttl_catalogo() -> float:
+    """Lee MEDIPLUS_CACHE_INSUMOS_TTL; un valor negativo o no numérico deja el ttl por defecto."""
+    valor = os.environ.get("MEDIPLUS_CACHE_INSUMOS_TTL")
+    if not valor:
+        return TTL_CATALOGO_POR_DEFECTO
+    try:
+        ttl = float(valor)
+    except ValueError:
+        ttl = -1
+    if not (math.isfinite(ttl) and ttl >= 0):
+        print(f"[WARN]: MEDIPLUS_CACHE_INSUMOS_TTL='{valor}' no es válido (segundos >= 0), "
+              f"se usará {TTL_CATALOGO_POR_DEFECTO}.")
+        return TTL_CATALOGO_POR_DEFECTO
+    return ttl
+
+
+class CatalogoInsumos:
+    """Caché del catálogo de insumos compartida por todo el proceso.
+
+    El catálogo se lee completo la primera vez que se consulta y luego las búsquedas por
+    id o por nombre se resuelven en memoria. Las escrituras de InsumosModel lo actualizan
+    o lo invalidan; los cambios hechos por otros procesos se ven al vencer el ttl, por eso
+    el listado de insumos (que muestra el stock) se sigue leyendo desde la BD.
+    """
+
+    def __init__(self, ttl: float = 60):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._db = None
+        self._vence = 0.0
+        self._por_id = {}
+        self._por_nombre = {}
+
+    def _vigente(self, db) -> bool:
+        return self._db is db and time.monotonic() < self._vence
+
+    def _cargar(self, db):
+        """Lee el catálogo desde la BD si la copia en memoria no está vigente."""
+        if self._vigente(db):
+            return
+        insumos = list(InsumosModel(db).iterar_insumos())
+        self._por_id = {insumo.id: insumo for insumo in insumos}
+        self._por_nombre = {}
+        for insumo in insumos:
+            self._por_nombre.setdefault(self._clave(insumo.nombre), []).append(insumo)
+        self._db = db
+        self._vence = time.monotonic() + self.ttl
+
+    @staticmethod
+    def _clave(nombre) -> str:
+        """Clave de búsqueda por nombre; el esquema permite insumos sin nombre."""
+        return (nombre or "").strip().lower()
+
+    def por_id(self, db, id_insumo):
+        with self._lock:
+            self._cargar(db)
+            return self._por_id.get(id_insumo)
+
+    def por_nombre(self, db, nombre: str) -> list:
+        """Insumos con ese nombre (sin distinguir mayúsculas); puede haber uno por tipo."""
+        with self._lock:
+            self._cargar(db)
+            return list(self._por_nombre.get(self._clave(nombre), []))
+
+    def listar(self, db) -> list:
+        """Insumos del catálogo ordenados por id."""
+        with self._lock:
+            self._cargar(db)
+            return list(self._por_id.values())
+
+    def actualizar_stock(self, id_insumo, stock):
+        with self._lock:
+            insumo = self._por_id.get(id_insumo)
+            if insumo is not None:
+                insumo.stock = stock
+
+    def quitar(self, id_insumo):
+        with self._lock:
+            insumo = self._por_id.pop(id_insumo, None)
+            if insumo is not None:
+                clave = self._clave(insumo.nombre)
+                self._por_nombre[clave] = [i for i in self._por_nombre.get(clave, []) if i.id != id_insumo]
+
+    def invalidar(self):
+        with self._lock:
+            self._vence = 0.0
+
+
+class MapaIdentidad:
+    """Mapa de identidad para los listados: una sola fila por clase e id.
+
+    Las filas de un listado que se refieren al mismo paciente, médico o receta comparten
+    el mismo objeto (Persona, FilaReceta) en vez de crear una copia por fila. Cada listado usa su propio mapa;
+    pasar el mismo mapa a varios listados (p. ej. durante una sesión) comparte las
+    instancias entre ellos.
+    """
+
+    def __init__(self):
+        self._objetos = {}
+
+    def obtener(self, clase, id, **datos):
+        """Devuelve la fila de clase con ese id, creándola con datos la primera vez.
+
+        Si la instancia ya existía, solo se completan los atributos que seguían en None.
+        """
+        clave = (clase, id)
+        objeto = self._objetos.get(clave)
+        if objeto is None:
+            objeto = clase(id=id, **datos)
+            self._objetos[clave] = objeto
+        else:
+            for atributo, valor in datos.items():
+                if valor is not None and getattr(objeto, atributo, None) is None:
+                    setattr(objeto, atributo, valor)
+        return objeto
+
+    def __len__(self):
+        return len(self._objetos)
+
 
 class InsumosModel:
     """Modelo de los Insumos Médicos."""
 
+    _SQL_CREAR = """INSERT INTO rr_insumos (nombre,tipo,stock,costo_usd) VALUES (:1, :2, :3, :4)"""
+    _SQL_LISTADO = """SELECT id, nombre, tipo, stock, costo_usd FROM rr_insumos {filtro} ORDER BY id"""
+    _SQL_ELIMINAR = """DELETE FROM rr_insumos WHERE id = :1"""
+    _SQL_ACTUALIZAR_STOCK = """UPDATE rr_insumos SET stock = :1 WHERE id = :2"""
+
+    # MEDIPLUS_CACHE_INSUMOS_TTL fija cada cuántos segundos se relee el catálogo.
+    catalogo = CatalogoInsumos(_leer_ttl_catalogo())
+
     def __init__(self, db, id=None, nombre=None, tipo=None, stock=0, costo_usd= 0.0 or None):
         """Inicializa un insumo con sus atributos básicos."""
         self.db = db
@@ -14,73 +153,133 @@ class InsumosModel:
     
     def crear_insumo(self) -> bool:
         """Crea un nuevo insumo médico en la base de datos."""
-        cursor = self.db.obtener_cursor()
-        consulta = """INSERT INTO rr_insumos (nombre,tipo,stock,costo_usd) VALUES (:1, :2, :3, :4)"""
+        consulta = self._SQL_CREAR
         try:
-            cursor.execute(consulta, (self.nombre, self.tipo, self.stock, self.costo_usd))
-            self.db.connection.commit()
+            with self.db.transaccion() as conn, conn.cursor() as cursor:
+                cursor.execute(consulta, (self.nombre, self.tipo, self.stock, self.costo_usd))
+            self.catalogo.invalidar()
             print(f"[INFO]: Insumo '{self.nombre}' creado correctamente.")
             return True
         except Exception as e:
             print(f"[ERROR]: No se pudo crear el insumo. {e}")
-            self.db.connection.rollback()
             return False
-        finally:
-            cursor.close()
             
+    def iterar_insumos(self):
+        """Genera los insumos registrados a medida que llegan desde la BD."""
+        consulta = self._SQL_LISTADO.format(filtro="")
+        try:
+            yield from self.db.iterar_filas(consulta, fabrica=FilaInsumo)
+        except Exception as e:
+            print(f"[ERROR]: No se pudo listar los insumos. {e}")
+
     def listar_insumos(self):
-        """Obtiene y devuelve todos los insumos médicos registrados."""
-        cursor = self.db.obtener_cursor()
-        consulta = """SELECT id, nombre, tipo, stock, costo_usd FROM rr_insumos"""
+        """Obtiene y devuelve todos los insumos médicos registrados, leídos desde la BD."""
+        return list(self.iterar_insumos())
+
+    def listar_catalogo(self) -> list:
+        """Devuelve los insumos desde el catálogo en caché, para elegir uno sin leer la BD.
+
+        El stock puede estar atrasado hasta el ttl del catálogo; para mostrarlo usar listar_insumos.
+        """
+        return self.catalogo.listar(self.db)
+
+    def obtener_insumo(self, id_insumo: int):
+        """Devuelve el insumo con ese id desde el catálogo en caché, o None si no existe."""
+        return self.catalogo.por_id(self.db, id_insumo)
+
+    def buscar_por_nombre(self, nombre: str) -> list:
+        """Devuelve los insumos con ese nombre desde el catálogo en caché."""
+        return self.catalogo.por_nombre(self.db, nombre)
+
+    def pagina_insumos(self, tamano: int = 10, despues_de: tuple = None):
+        """Devuelve una página de insumos ordenada por id y la clave de la siguiente.
+
+        despues_de es la clave entregada por la página anterior (None para la primera);
+        la clave devuelta es None cuando no quedan más insumos.
+        """
+        consulta, parametros = self._sql_pagina(despues_de)
         try:
-            cursor.execute(consulta)
-            insumos = cursor.fetchall()
-            lista_insumos = []
-            for insumo in insumos:
-                lista_insumos.append(InsumosModel(self.db, insumo[0], insumo[1], insumo[2], insumo[3], insumo[4]))
-            return lista_insumos
+            insumos, hay_mas = self.db.pagina_filas(consulta, parametros, tamano, FilaInsumo)
         except Exception as e:
             print(f"[ERROR]: No se pudo listar los insumos. {e}")
-            return []
-        finally:
-            cursor.close()
-        
+            return [], None
+        return insumos, ((insumos[-1].id,) if hay_mas else None)
+
+    def _sql_pagina(self, despues_de):
+        """Arma la consulta de una página y sus binds a partir de la clave."""
+        filtro, parametros = "", {}
+        if despues_de:
+            filtro, parametros = "WHERE id > :id", {'id': despues_de[0]}
+        return self._SQL_LISTADO.format(filtro=filtro) + " FETCH FIRST :limite ROWS ONLY", parametros
+
     def eliminar_insumo(self) -> bool:
         """Elimina un insumo médico por su ID."""
-        cursor = self.db.obtener_cursor()
-        consulta = """DELETE FROM rr_insumos WHERE id = :1"""
+        consulta = self._SQL_ELIMINAR
         try:
-            cursor.execute(consulta, (self.id,))
-            self.db.connection.commit()
+            with self.db.transaccion() as conn, conn.cursor() as cursor:
+                cursor.execute(consulta, (self.id,))
+            self.catalogo.quitar(self.id)
             print(f"[INFO]: Insumo con ID '{self.id}' eliminado correctamente.")
             return True
         except Exception as e:
             print(f"[ERROR]: No se pudo eliminar el insumo. {e}")
-            self.db.connection.rollback()
             return False
-        finally:
-            cursor.close()
 
     def actualizar_stock(self, nuevo_stock: int) -> bool:
         """Actualiza el stock de un insumo."""
-        cursor = self.db.obtener_cursor()
-        consulta = """UPDATE rr_insumos SET stock = :1 WHERE id = :2"""
+        consulta = self._SQL_ACTUALIZAR_STOCK
         try:
-            cursor.execute(consulta, (nuevo_stock, self.id))
-            self.db.connection.commit()
+            with self.db.transaccion() as conn, conn.cursor() as cursor:
+                cursor.execute(consulta, (nuevo_stock, self.id))
+            self.catalogo.actualizar_stock(self.id, nuevo_stock)
             print(f"[INFO]: Stock del insumo ID '{self.id}' actualizado a {nuevo_stock}.")
             return True
         except Exception as e:
             print(f"[ERROR]: No se pudo actualizar el stock. {e}")
-            self.db.connection.rollback()
             return False
-        finally:
-            cursor.close()
 
 
 class RecetasModel:
     """Modelo de las Recetas Médicas."""
 
+    _SQL_CREAR = """INSERT INTO rr_recetas (id_paciente, id_medico, descripcion, medicamentos_recetados, costo_clp)
+                             VALUES (:1, :2, :3, :4, :5) RETURNING id INTO :6"""
+    _SQL_INSUMOS = """
+                SELECT i.id, i.nombre, i.tipo, i.stock, i.costo_usd, ri.cantidad
+                FROM rr_receta_insumos ri
+                JOIN rr_insumos i ON ri.id_insumo = i.id
+                WHERE ri.id_receta = :1
+    """
+    # Insumos de varias recetas en una consulta, ordenados por receta para unirlos a un
+    # listado ordenado por r.id en un solo recorrido. filtro acota las recetas.
+    _SQL_INSUMOS_RECETAS = """
+                SELECT ri.id_receta, i.id, i.nombre, i.tipo, i.stock, i.costo_usd, ri.cantidad
+                FROM rr_receta_insumos ri
+                JOIN rr_insumos i ON ri.id_insumo = i.id
+                {filtro}
+                ORDER BY ri.id_receta
+    """
+    _FILTRO_INSUMOS_PACIENTE = """
+                JOIN rr_recetas r ON ri.id_receta = r.id
+                JOIN rr_usuario u ON r.id_paciente = u.id
+                WHERE u.nombre_usuario = :1
+    """
+    MAX_IN = 1000  # Límite de elementos de una lista IN en Oracle.
+    _SQL_AGREGAR_INSUMO = """
+            INSERT INTO rr_receta_insumos (id_receta, id_insumo, cantidad)
+            VALUES (:1, :2, :3)
+    """
+    _SQL_OBTENER = "SELECT id, id_paciente, id_medico, descripcion, medicamentos_recetados, costo_clp FROM rr_recetas WHERE id=:1"
+    _SQL_ELIMINAR = "DELETE FROM rr_recetas WHERE id=:1"
+    _SQL_RECETAS_PACIENTE = """
+            SELECT r.id, r.descripcion, r.medicamentos_recetados, r.costo_clp, r.id_medico, u.id, u.nombre_usuario
+            FROM rr_recetas r
+            JOIN rr_paciente p ON r.id_paciente = p.id_paciente
+            JOIN rr_usuario u ON p.id_paciente = u.id
+            WHERE u.nombre_usuario = :1
+            ORDER BY r.id
+    """
+
     def __init__(self, db, id=None, paciente: PacienteModel=None, medico: MedicoModel=None, descripcion=None, medicamentos_recetados=None, costo_clp=0.0, insumos=None):
         self.db = db
         self.id = id
@@ -92,174 +291,222 @@ class RecetasModel:
         self.insumos = insumos if insumos else []  
 
     def crear_receta(self) -> bool:
-        cursor = self.db.obtener_cursor()
+        consulta_receta = self._SQL_CREAR
         try:
-           
-            consulta_receta = """INSERT INTO rr_recetas (id_paciente, id_medico, descripcion, medicamentos_recetados, costo_clp)
-                                 VALUES (:1, :2, :3, :4, :5) RETURNING id INTO :6"""
-            id_var = cursor.var(int)
-            cursor.execute(consulta_receta, (self.paciente.id, self.medico.id, self.descripcion, self.medicamentos_recetados, self.costo_clp, id_var))
-            self.id = id_var.getvalue()[0]
-
-          
-
-            self.db.connection.commit()
+            with self.db.transaccion() as conn, conn.cursor() as cursor:
+                id_var = cursor.var(int)
+                cursor.execute(consulta_receta, (self.paciente.id, self.medico.id, self.descripcion, self.medicamentos_recetados, self.costo_clp, id_var))
+                self.id = id_var.getvalue()[0]
             print(f"[INFO]: Receta creada correctamente con ID {self.id}.")
             return True
         except Exception as e:
             print(f"[ERROR]: No se pudo crear la receta -> {e}.")
-            self.db.connection.rollback()
             return False
-        finally:
-            cursor.close()
-
-    def obtener_insumos(self):
-        cursor = self.db.obtener_cursor()
-        consulta = """
-            SELECT i.id, i.nombre, i.tipo, i.stock, i.costo_usd, ri.cantidad
-            FROM rr_receta_insumos ri
-            JOIN rr_insumos i ON ri.id_insumo = i.id
-            WHERE ri.id_receta = :1
+
+    def obtener_insumos(self, id_receta: int = None):
+        """Devuelve los insumos de la receta (por defecto, la propia) como lista de (FilaInsumo, cantidad)."""
+        with self.db.conexion() as conn:
+            cursor = conn.cursor()
+            consulta = self._SQL_INSUMOS
+            try:
+                cursor.execute(consulta, (self.id if id_receta is None else id_receta,))
+                return [(FilaInsumo(*fila[:5]), fila[5]) for fila in cursor.fetchall()]
+            except Exception as e:
+                print(f"[ERROR]: No se pudieron obtener insumos de la receta -> {e}.")
+                return []
+            finally:
+                cursor.close()
+
+    @staticmethod
+    def _unir_insumos(recetas, filas_insumos):
+        """Asigna a cada receta sus insumos recorriendo ambas secuencias una sola vez.
+
+        recetas y filas_insumos (filas de _SQL_INSUMOS_RECETAS) deben venir ordenadas por
+        id de receta; ninguna se carga completa en memoria.
         """
+        insumos = iter(filas_insumos)
         try:
-            cursor.execute(consulta, (self.id,))
-            filas = cursor.fetchall()
-            insumos = []
-            for fila in filas:
-                insumo = InsumosModel(self.db, id=fila[0], nombre=fila[1], tipo=fila[2], stock=fila[3], costo_usd=fila[4])
-                insumos.append((insumo, fila[5]))
-            return insumos
-        except Exception as e:
-            print(f"[ERROR]: No se pudieron obtener insumos de la receta -> {e}.")
-            return []
+            actual = next(insumos, None)
+            for receta in recetas:
+                receta.insumos = []
+                while actual is not None and actual[0] < receta.id:
+                    actual = next(insumos, None)
+                while actual is not None and actual[0] == receta.id:
+                    receta.insumos.append((FilaInsumo(*actual[1:6]), actual[6]))
+                    actual = next(insumos, None)
+                yield receta
         finally:
-            cursor.close()
+            if hasattr(insumos, "close"):
+                insumos.close()
+
+    def _insumos_de_recetas(self, ids: list) -> list:
+        """Filas de _SQL_INSUMOS_RECETAS de las recetas indicadas, en una consulta por cada MAX_IN ids."""
+        filas = []
+        for inicio in range(0, len(ids), self.MAX_IN):
+            bloque = ids[inicio:inicio + self.MAX_IN]
+            binds = ", ".join(f":{i + 1}" for i in range(len(bloque)))
+            filtro = f"WHERE ri.id_receta IN ({binds})"
+            filas.extend(self.db.iterar_filas(self._SQL_INSUMOS_RECETAS.format(filtro=filtro), bloque))
+        return filas
+
+    def cargar_insumos(self, recetas: list) -> list:
+        """Carga de una vez los insumos de una lista de recetas (p. ej. una página) y la devuelve."""
+        recetas = sorted(recetas, key=lambda receta: receta.id)
+        ids = [receta.id for receta in recetas]
+        try:
+            filas = self._insumos_de_recetas(ids) if ids else []
+        except Exception as e:
+            print(f"[ERROR]: No se pudieron obtener insumos de las recetas -> {e}.")
+            return recetas
+        return list(self._unir_insumos(recetas, filas))
 
     def agregar_insumo(self, id_insumo:int, cantidad:int=1) -> bool:
         if not self.id:
             print("[ERROR]: La receta debe existir antes de asociar insumos.")
             return False
-        cursor = self.db.obtener_cursor()
-        consulta = """
-            INSERT INTO rr_receta_insumos (id_receta, id_insumo, cantidad)
-            VALUES (:1, :2, :3)
-        """
+        consulta = self._SQL_AGREGAR_INSUMO
         try:
-            cursor.execute(consulta, (self.id, id_insumo, cantidad))
-            self.db.connection.commit()
+            with self.db.transaccion() as conn, conn.cursor() as cursor:
+                cursor.execute(consulta, (self.id, id_insumo, cantidad))
             print(f"[INFO]: Insumo {id_insumo} agregado a receta {self.id} (cantidad {cantidad}).")
             return True
         except Exception as e:
             print(f"[ERROR]: No se pudo asociar el insumo -> {e}.")
-            self.db.connection.rollback()
             return False
-        finally:
-            cursor.close()
     
     def obtener_receta(self, id_receta:int):
         """Obtiene una receta médica por su ID."""
-        cursor = self.db.obtener_cursor()
-        consulta = "SELECT id, id_paciente, id_medico, descripcion, medicamentos_recetados, costo_clp FROM rr_recetas WHERE id=:1"
-        try:
-            cursor.execute(consulta, (id_receta,))
-            return cursor.fetchone()
-        except Exception as e:
-            print(f"[ERROR]: No se pudo obtener la receta -> {e}.")
-            return None
-        finally:
-            cursor.close()
+        consulta = self._SQL_OBTENER
+        with self.db.conexion() as conn:
+            cursor = self.db.cursor_reutilizable(conn, consulta)
+            try:
+                cursor.execute(consulta, (id_receta,))
+                return cursor.fetchone()
+            except Exception as e:
+                print(f"[ERROR]: No se pudo obtener la receta -> {e}.")
+                return None
     
     def eliminar_receta(self, id_receta:int) -> bool:
         """Elimina una receta médica por su ID."""
-        cursor = self.db.obtener_cursor()
-        consulta = "DELETE FROM rr_recetas WHERE id=:1"
+        consulta = self._SQL_ELIMINAR
         try:
-            cursor.execute(consulta, (id_receta,))
-            if cursor.rowcount > 0:
-                self.db.connection.commit()
-                print(f"[INFO]: Receta con ID '{id_receta}' eliminada correctamente.")
-                return True
-            else:
-                print(f"[ERROR]: No se encontró receta con ID '{id_receta}'.")
-                return False
+            with self.db.transaccion() as conn, conn.cursor() as cursor:
+                cursor.execute(consulta, (id_receta,))
+                eliminadas = cursor.rowcount
         except Exception as e:
             print(f"[ERROR]: No se pudo eliminar la receta. {e}")
-            self.db.connection.rollback()
             return False
-        finally:
-            cursor.close()
+        if eliminadas > 0:
+            print(f"[INFO]: Receta con ID '{id_receta}' eliminada correctamente.")
+            return True
+        print(f"[ERROR]: No se encontró receta con ID '{id_receta}'.")
+        return False
             
-    def listar_recetas_paciente(self, nombre_usuario: str):
-        """Lista todas las recetas asociadas a un paciente por su nombre de usuario."""
-        cursor = self.db.obtener_cursor()
-        consulta = """
-            SELECT r.id, r.descripcion, r.medicamentos_recetados, r.costo_clp, r.id_medico, u.id, u.nombre_usuario
-            FROM rr_recetas r
-            JOIN rr_paciente p ON r.id_paciente = p.id_paciente
-            JOIN rr_usuario u ON p.id_paciente = u.id
-            WHERE u.nombre_usuario = :1
+    def iterar_recetas_paciente(self, nombre_usuario: str, mapa: MapaIdentidad = None, con_insumos: bool = True):
+        """Genera las recetas de un paciente a medida que llegan desde la BD.
+
+        Con con_insumos, los insumos de todas sus recetas llegan en una segunda consulta
+        que se recorre a la par del listado (dos consultas en total, no una por receta).
         """
+        fabrica = self._fabrica_paciente(MapaIdentidad() if mapa is None else mapa)
+        usuario = (nombre_usuario.strip(),)
         try:
-            cursor.execute(consulta, (nombre_usuario.strip(),))
-            resultados = cursor.fetchall()
-            recetas = []
-            for fila in resultados:
-                receta = RecetasModel(
-                    self.db,
-                    id=fila[0],
-                    descripcion=fila[1],
-                    medicamentos_recetados=fila[2],
-                    costo_clp=fila[3],
-                    medico=MedicoModel(self.db, id=fila[4]),
-                    paciente=PacienteModel(self.db, id=fila[5], nombre_usuario=fila[6])
-                )
-                recetas.append(receta)
-            return recetas
+            recetas = self.db.iterar_filas(self._SQL_RECETAS_PACIENTE, usuario, fabrica=fabrica)
+            if con_insumos:
+                consulta = self._SQL_INSUMOS_RECETAS.format(filtro=self._FILTRO_INSUMOS_PACIENTE)
+                recetas = self._unir_insumos(recetas, self.db.iterar_filas(consulta, usuario))
+            yield from recetas
         except Exception as e:
             print(f"[ERROR]: No se pudieron listar las recetas del paciente -> {e}.")
-            return []
-        finally:
-            cursor.close()
 
-    def listar_recetas(self):
-        """Lista todas las recetas."""
-        cursor = self.db.obtener_cursor()
-        consulta = """
+    def listar_recetas_paciente(self, nombre_usuario: str, mapa: MapaIdentidad = None, con_insumos: bool = True):
+        """Lista todas las recetas asociadas a un paciente por su nombre de usuario."""
+        return list(self.iterar_recetas_paciente(nombre_usuario, mapa, con_insumos))
+
+    @staticmethod
+    def _fabrica_paciente(mapa: MapaIdentidad):
+        """rowfactory de _SQL_RECETAS_PACIENTE: arma una FilaReceta desde las columnas del cursor."""
+        def fila(id, descripcion, medicamentos, costo_clp, id_medico, id_paciente, paciente_usuario):
+            return FilaReceta(id, mapa.obtener(Persona, id_paciente, nombre_usuario=paciente_usuario),
+                              mapa.obtener(Persona, id_medico), descripcion, medicamentos, costo_clp)
+        return fila
+
+    _SQL_LISTADO = """
             SELECT r.id, r.id_paciente, r.id_medico, r.descripcion, r.medicamentos_recetados, r.costo_clp,
                    u.nombre_usuario as paciente_usuario, u.nombre as paciente_nombre, u.apellido as paciente_apellido,
                    m.nombre_usuario as medico_usuario, m.nombre as medico_nombre, m.apellido as medico_apellido
             FROM rr_recetas r
             JOIN rr_usuario u ON r.id_paciente = u.id
             JOIN rr_usuario m ON r.id_medico = m.id
-            ORDER BY r.id
+    """
+    _ORDEN = "ORDER BY r.id"
+
+    @staticmethod
+    def _fabrica(mapa: MapaIdentidad):
+        """rowfactory de _SQL_LISTADO: arma una FilaReceta desde las columnas del cursor."""
+        def fila(id, id_paciente, id_medico, descripcion, medicamentos, costo_clp,
+                 paciente_usuario, paciente_nombre, paciente_apellido, medico_usuario, medico_nombre, medico_apellido):
+            return FilaReceta(
+                id,
+                mapa.obtener(Persona, id_paciente, nombre_usuario=paciente_usuario, nombre=paciente_nombre,
+                             apellido=paciente_apellido),
+                mapa.obtener(Persona, id_medico, nombre_usuario=medico_usuario, nombre=medico_nombre,
+                             apellido=medico_apellido),
+                descripcion, medicamentos, costo_clp
+            )
+        return fila
+
+    def iterar_recetas(self, mapa: MapaIdentidad = None, con_insumos: bool = True):
+        """Genera todas las recetas a medida que llegan desde la BD; ver iterar_recetas_paciente."""
+        fabrica = self._fabrica(MapaIdentidad() if mapa is None else mapa)
+        consulta = f"{self._SQL_LISTADO} {self._ORDEN}"
+        try:
+            recetas = self.db.iterar_filas(consulta, fabrica=fabrica)
+            if con_insumos:
+                recetas = self._unir_insumos(recetas, self.db.iterar_filas(self._SQL_INSUMOS_RECETAS.format(filtro="")))
+            yield from recetas
+        except Exception as e:
+            print(f"[ERROR]: No se pudieron listar las recetas -> {e}.")
+
+    def listar_recetas(self, mapa: MapaIdentidad = None, con_insumos: bool = True):
+        """Lista todas las recetas."""
+        return list(self.iterar_recetas(mapa, con_insumos))
+
+    def pagina_recetas(self, tamano: int = 10, despues_de: tuple = None, mapa: MapaIdentidad = None,
+                       con_insumos: bool = True):
+        """Devuelve una página de recetas ordenada por id y la clave de la siguiente.
+
+        despues_de es la clave entregada por la página anterior (None para la primera);
+        la clave devuelta es None cuando no quedan más recetas.
         """
+        fabrica = self._fabrica(MapaIdentidad() if mapa is None else mapa)
+        consulta, parametros = self._sql_pagina(despues_de)
         try:
-            cursor.execute(consulta)
-            resultados = cursor.fetchall()
-            recetas = []
-            for fila in resultados:
-                receta = RecetasModel(
-                    self.db,
-                    id=fila[0],
-                    descripcion=fila[3],
-                    medicamentos_recetados=fila[4],
-                    costo_clp=fila[5],
-                    paciente=PacienteModel(self.db, id=fila[1], nombre_usuario=fila[6], nombre=fila[7], apellido=fila[8]),
-                    medico=MedicoModel(self.db, id=fila[2], nombre_usuario=fila[9], nombre=fila[10], apellido=fila[11])
-                )
-                recetas.append(receta)
-            return recetas
+            recetas, hay_mas = self.db.pagina_filas(consulta, parametros, tamano, fabrica)
         except Exception as e:
             print(f"[ERROR]: No se pudieron listar las recetas -> {e}.")
-            return []
-        finally:
-            cursor.close()
+            return [], None
+        if con_insumos:
+            self.cargar_insumos(recetas)
+        return recetas, ((recetas[-1].id,) if hay_mas else None)
+
+    def _sql_pagina(self, despues_de):
+        """Arma la consulta de una página y sus binds a partir de la clave."""
+        filtro, parametros = "", {}
+        if despues_de:
+            filtro, parametros = "WHERE r.id > :id", {'id': despues_de[0]}
+        return f"{self._SQL_LISTADO} {filtro} {self._ORDEN} FETCH FIRST :limite ROWS ONLY", parametros
 
 
 
 class ConsultasModel:
     """Modelo de las Consultas Médicas."""
 
+    _SQL_CREAR = """
+            INSERT INTO rr_consultas (id_paciente, id_medico, id_receta, fecha, comentarios, valor)
+            VALUES (:id_paciente, :id_medico, :id_receta, TO_DATE(:fecha, 'YYYY-MM-DD'), :comentarios, :valor)
+    """
+
     def __init__(self, db, id=None, paciente: PacienteModel=None, medico: MedicoModel=None, receta: RecetasModel=None, fecha=None, comentarios=None, valor=0.0):
         """Inicializa una consulta con paciente, médico, receta, fecha y comentarios."""
         self.db = db
@@ -273,105 +520,134 @@ class ConsultasModel:
     
     def crear_consulta(self) -> bool: 
         """Crea una nueva consulta médica en la base de datos."""
-        cursor = self.db.obtener_cursor()
-        consulta = """
-            INSERT INTO rr_consultas (id_paciente, id_medico, id_receta, fecha, comentarios, valor)
-            VALUES (:id_paciente, :id_medico, :id_receta, TO_DATE(:fecha, 'YYYY-MM-DD'), :comentarios, :valor)
-        """
         try:
-            cursor.execute(consulta, {
-                'id_paciente': self.paciente.id,
-                'id_medico': self.medico.id,
-                'id_receta': self.receta.id if self.receta else None,
-                'fecha': self.fecha,
-                'comentarios': self.comentarios,
-                'valor': self.valor
-            })
-            self.db.connection.commit()
+            with self.db.transaccion() as conn, conn.cursor() as cursor:
+                cursor.execute(self._SQL_CREAR, self._valores_creacion())
             print(f"[INFO]: Consulta creada correctamente.")
             return True
         except Exception as e:
             print(f"[ERROR]: No se pudo crear la consulta -> {e}.")
-            self.db.connection.rollback()
             return False
-        finally:
-            cursor.close()
 
-    def listar_consultas(self):
-        """Lista todas las consultas."""
-        cursor = self.db.obtener_cursor()
-        consulta = """
+    def _valores_creacion(self) -> dict:
+        """Arma los binds de _SQL_CREAR con los datos de la consulta."""
+        return {
+            'id_paciente': self.paciente.id,
+            'id_medico': self.medico.id,
+            'id_receta': self.receta.id if self.receta else None,
+            'fecha': self.fecha,
+            'comentarios': self.comentarios,
+            'valor': self.valor
+        }
+
+    _SQL_LISTADO = """
             SELECT c.id, c.id_paciente, c.id_medico, c.id_receta, c.fecha, c.comentarios, c.valor,
                    u.nombre_usuario as paciente_usuario, u.nombre as paciente_nombre, u.apellido as paciente_apellido,
                    m.nombre_usuario as medico_usuario, m.nombre as medico_nombre, m.apellido as medico_apellido
             FROM rr_consultas c
             JOIN rr_usuario u ON c.id_paciente = u.id
             JOIN rr_usuario m ON c.id_medico = m.id
-            ORDER BY c.fecha DESC
+    """
+    _ORDEN = "ORDER BY c.fecha DESC, c.id DESC"
+    _ORDEN_SIN_FECHA = "ORDER BY c.id DESC"
+
+    @staticmethod
+    def _fabrica(mapa: MapaIdentidad):
+        """rowfactory de _SQL_LISTADO: arma una FilaConsulta desde las columnas del cursor."""
+        def fila(id, id_paciente, id_medico, id_receta, fecha, comentarios, valor,
+                 paciente_usuario, paciente_nombre, paciente_apellido, medico_usuario, medico_nombre, medico_apellido):
+            return FilaConsulta(
+                id,
+                mapa.obtener(Persona, id_paciente, nombre_usuario=paciente_usuario, nombre=paciente_nombre,
+                             apellido=paciente_apellido),
+                mapa.obtener(Persona, id_medico, nombre_usuario=medico_usuario, nombre=medico_nombre,
+                             apellido=medico_apellido),
+                mapa.obtener(FilaReceta, id_receta) if id_receta else None,
+                fecha, comentarios, valor
+            )
+        return fila
+
+    def iterar_consultas(self, mapa: MapaIdentidad = None):
+        """Genera todas las consultas a medida que llegan desde la BD."""
+        fabrica = self._fabrica(MapaIdentidad() if mapa is None else mapa)
+        try:
+            for consulta in self._segmentos():
+                yield from self.db.iterar_filas(consulta, fabrica=fabrica)
+        except Exception as e:
+            print(f"[ERROR]: No se pudieron listar las consultas -> {e}.")
+
+    def listar_consultas(self, mapa: MapaIdentidad = None):
+        """Lista todas las consultas."""
+        return list(self.iterar_consultas(mapa))
+
+    def pagina_consultas(self, tamano: int = 10, despues_de: tuple = None, mapa: MapaIdentidad = None):
+        """Devuelve una página de consultas, de la más reciente a la más antigua.
+
+        La clave es (fecha, id) de la última consulta de la página anterior (None para
+        la primera); la clave devuelta es None cuando no quedan más consultas. Las
+        consultas sin fecha van al final, de la más nueva a la más antigua por id.
         """
+        fabrica = self._fabrica(MapaIdentidad() if mapa is None else mapa)
         try:
-            cursor.execute(consulta)
-            resultados = cursor.fetchall()
-            consultas = []
-            for fila in resultados:
-                consulta_obj = ConsultasModel(
-                    self.db,
-                    id=fila[0],
-                    fecha=fila[4],
-                    comentarios=fila[5],
-                    valor=fila[6],
-                    paciente=PacienteModel(self.db, id=fila[1], nombre_usuario=fila[7], nombre=fila[8], apellido=fila[9]),
-                    medico=MedicoModel(self.db, id=fila[2], nombre_usuario=fila[10], nombre=fila[11], apellido=fila[12]),
-                    receta=RecetasModel(self.db, id=fila[3]) if fila[3] else None
-                )
-                consultas.append(consulta_obj)
-            return consultas
+            consultas, hay_mas = self.db.pagina_segmentos(self._segmentos_pagina(despues_de), tamano, fabrica)
         except Exception as e:
             print(f"[ERROR]: No se pudieron listar las consultas -> {e}.")
-            return []
-        finally:
-            cursor.close()
+            return [], None
+        if not hay_mas:
+            return consultas, None
+        return consultas, (consultas[-1].fecha, consultas[-1].id)
 
-    def listar_consultas_paciente(self, nombre_usuario: str):
-        """Lista todas las consultas asociadas a un paciente por su nombre de usuario."""
-        cursor = self.db.obtener_cursor()
-        consulta = """
-            SELECT c.id, c.id_paciente, c.id_medico, c.id_receta, c.fecha, c.comentarios, c.valor,
-                   u.nombre_usuario as paciente_usuario, u.nombre as paciente_nombre, u.apellido as paciente_apellido,
-                   m.nombre_usuario as medico_usuario, m.nombre as medico_nombre, m.apellido as medico_apellido
-            FROM rr_consultas c
-            JOIN rr_usuario u ON c.id_paciente = u.id
-            JOIN rr_usuario m ON c.id_medico = m.id
-            WHERE u.nombre_usuario = :1
-            ORDER BY c.fecha DESC
+    def _segmentos(self, filtro: str = "") -> list:
+        """Arma el listado en dos consultas: primero las consultas con fecha y luego las sin fecha.
+
+        Cada tramo se ordena como el índice (fecha, id) lo entrega, sin NULLS LAST, así
+        el motor lo recorre en orden en vez de ordenar el resultado completo.
+        """
+        condicion = f"{filtro} AND " if filtro else ""
+        return [f"{self._SQL_LISTADO} WHERE {condicion}c.fecha IS NOT NULL {self._ORDEN}",
+                f"{self._SQL_LISTADO} WHERE {condicion}c.fecha IS NULL {self._ORDEN_SIN_FECHA}"]
+
+    def _segmentos_pagina(self, despues_de) -> list:
+        """Arma los tramos (consulta, binds) de una página a partir de la clave.
+
+        Una clave con fecha sigue por el rango con fecha y después por las consultas
+        sin fecha desde el comienzo; una clave sin fecha solo sigue por estas últimas.
         """
+        con_fecha, sin_fecha = self._segmentos()
+        if not despues_de:
+            tramos = [(con_fecha, {}), (sin_fecha, {})]
+        elif despues_de[0] is None:
+            tramos = [(f"{self._SQL_LISTADO} WHERE c.fecha IS NULL AND c.id < :id {self._ORDEN_SIN_FECHA}",
+                       {'id': despues_de[1]})]
+        else:
+            tramos = [(f"{self._SQL_LISTADO} WHERE c.fecha <= :fecha AND (c.fecha < :fecha OR c.id < :id)"
+                       f" {self._ORDEN}", {'fecha': despues_de[0], 'id': despues_de[1]}),
+                      (sin_fecha, {})]
+        return [(f"{consulta} FETCH FIRST :limite ROWS ONLY", parametros) for consulta, parametros in tramos]
+
+    def iterar_consultas_paciente(self, nombre_usuario: str, mapa: MapaIdentidad = None):
+        """Genera las consultas de un paciente a medida que llegan desde la BD."""
+        fabrica = self._fabrica(MapaIdentidad() if mapa is None else mapa)
         try:
-            cursor.execute(consulta, (nombre_usuario.strip(),))
-            resultados = cursor.fetchall()
-            consultas = []
-            for fila in resultados:
-                consulta_obj = ConsultasModel(
-                    self.db,
-                    id=fila[0],
-                    fecha=fila[4],
-                    comentarios=fila[5],
-                    valor=fila[6],
-                    paciente=PacienteModel(self.db, id=fila[1], nombre_usuario=fila[7], nombre=fila[8], apellido=fila[9]),
-                    medico=MedicoModel(self.db, id=fila[2], nombre_usuario=fila[10], nombre=fila[11], apellido=fila[12]),
-                    receta=RecetasModel(self.db, id=fila[3]) if fila[3] else None
-                )
-                consultas.append(consulta_obj)
-            return consultas
+            for consulta in self._segmentos("u.nombre_usuario = :1"):
+                yield from self.db.iterar_filas(consulta, (nombre_usuario.strip(),), fabrica=fabrica)
         except Exception as e:
             print(f"[ERROR]: No se pudieron listar las consultas del paciente -> {e}.")
-            return []
-        finally:
-            cursor.close()
+
+    def listar_consultas_paciente(self, nombre_usuario: str, mapa: MapaIdentidad = None):
+        """Lista todas las consultas asociadas a un paciente por su nombre de usuario."""
+        return list(self.iterar_consultas_paciente(nombre_usuario, mapa))
 
 
 class AgendaModel:
     """Modelo de la Agenda Médica."""
 
+    _SQL_AGENDAR = """
+            INSERT INTO rr_agenda (id_paciente, id_medico, fecha_consulta, estado)
+            VALUES (:id_paciente, :id_medico, TO_DATE(:fecha_consulta, 'YYYY-MM-DD'), :estado)
+    """
+    _SQL_ACTUALIZAR_ESTADO = "UPDATE rr_agenda SET estado=:estado WHERE id=:id"
+
     def __init__(self, db, id=None, paciente:PacienteModel=None, medico:MedicoModel=None, fecha_consulta=None, estado=None):
         """Inicializa la agenda con paciente, médico, fecha y estado."""
         self.db = db
@@ -383,73 +659,221 @@ class AgendaModel:
         
     def agendar_consulta(self) -> bool:
         """Agrega una nueva consulta a la agenda."""
-        cursor = self.db.obtener_cursor()
-        consulta = """
-            INSERT INTO rr_agenda (id_paciente, id_medico, fecha_consulta, estado)
-            VALUES (:id_paciente, :id_medico, TO_DATE(:fecha_consulta, 'YYYY-MM-DD'), :estado)
-        """
         try:
-            cursor.execute(consulta, {
-                'id_paciente': self.paciente.id,
-                'id_medico': self.medico.id,
-                'fecha_consulta': self.fecha_consulta,
-                'estado': self.estado
-            })
-            self.db.connection.commit()
+            with self.db.transaccion() as conn, conn.cursor() as cursor:
+                cursor.execute(self._SQL_AGENDAR, self._valores_agenda())
             print(f"[INFO]: Consulta agendada correctamente.")
             return True
         except Exception as e:
             print(f"[ERROR]: No se pudo agendar la consulta -> {e}.")
-            self.db.connection.rollback()
             return False
-        finally:
-            cursor.close()
+
+    def _valores_agenda(self) -> dict:
+        """Arma los binds de _SQL_AGENDAR con los datos de la agenda."""
+        return {
+            'id_paciente': self.paciente.id,
+            'id_medico': self.medico.id,
+            'fecha_consulta': self.fecha_consulta,
+            'estado': self.estado
+        }
 
     def actualizar_estado(self, nuevo_estado: str) -> bool:
         """Actualiza el estado de una consulta en la agenda."""
-        cursor = self.db.obtener_cursor()
-        consulta = "UPDATE rr_agenda SET estado=:estado WHERE id=:id"
+        consulta = self._SQL_ACTUALIZAR_ESTADO
         try:
-            cursor.execute(consulta, {'estado': nuevo_estado, 'id': self.id})
-            self.db.connection.commit()
+            with self.db.transaccion() as conn, conn.cursor() as cursor:
+                cursor.execute(consulta, {'estado': nuevo_estado, 'id': self.id})
             print(f"[INFO]: Estado actualizado para agenda ID {self.id}.")
             return True
         except Exception as e:
             print(f"[ERROR]: No se pudo actualizar el estado -> {e}.")
-            self.db.connection.rollback()
             return False
-        finally:
-            cursor.close()
 
-    def listar_agenda(self):
-        """Lista toda la agenda."""
-        cursor = self.db.obtener_cursor()
-        consulta = """
+    _SQL_LISTADO = """
             SELECT a.id, a.id_paciente, a.id_medico, a.fecha_consulta, a.estado,
                    u.nombre_usuario as paciente_usuario, u.nombre as paciente_nombre, u.apellido as paciente_apellido,
                    m.nombre_usuario as medico_usuario, m.nombre as medico_nombre, m.apellido as medico_apellido
             FROM rr_agenda a
             JOIN rr_usuario u ON a.id_paciente = u.id
             JOIN rr_usuario m ON a.id_medico = m.id
-            ORDER BY a.fecha_consulta
+    """
+    _ORDEN = "ORDER BY a.fecha_consulta, a.id"
+    _ORDEN_SIN_FECHA = "ORDER BY a.id"
+
+    @staticmethod
+    def _fabrica(mapa: MapaIdentidad):
+        """rowfactory de _SQL_LISTADO: arma una FilaAgenda desde las columnas del cursor."""
+        def fila(id, id_paciente, id_medico, fecha_consulta, estado,
+                 paciente_usuario, paciente_nombre, paciente_apellido, medico_usuario, medico_nombre, medico_apellido):
+            return FilaAgenda(
+                id,
+                mapa.obtener(Persona, id_paciente, nombre_usuario=paciente_usuario, nombre=paciente_nombre,
+                             apellido=paciente_apellido),
+                mapa.obtener(Persona, id_medico, nombre_usuario=medico_usuario, nombre=medico_nombre,
+                             apellido=medico_apellido),
+                fecha_consulta, estado
+            )
+        return fila
+
+    def iterar_agenda(self, mapa: MapaIdentidad = None):
+        """Genera toda la agenda a medida que llega desde la BD."""
+        fabrica = self._fabrica(MapaIdentidad() if mapa is None else mapa)
+        try:
+            for consulta in self._segmentos():
+                yield from self.db.iterar_filas(consulta, fabrica=fabrica)
+        except Exception as e:
+            print(f"[ERROR]: No se pudieron listar la agenda -> {e}.")
+
+    def listar_agenda(self, mapa: MapaIdentidad = None):
+        """Lista toda la agenda."""
+        return list(self.iterar_agenda(mapa))
+
+    def pagina_agenda(self, tamano: int = 10, despues_de: tuple = None, mapa: MapaIdentidad = None):
+        """Devuelve una página de la agenda ordenada por fecha y la clave de la siguiente.
+
+        La clave es (fecha_consulta, id) de la última entrada de la página anterior
+        (None para la primera); la clave devuelta es None cuando no quedan más. Las
+        entradas sin fecha van al final, por id.
         """
+        fabrica = self._fabrica(MapaIdentidad() if mapa is None else mapa)
         try:
-            cursor.execute(consulta)
-            resultados = cursor.fetchall()
-            agendas = []
-            for fila in resultados:
-                agenda_obj = AgendaModel(
-                    self.db,
-                    id=fila[0],
-                    fecha_consulta=fila[3],
-                    estado=fila[4],
-                    paciente=PacienteModel(self.db, id=fila[1], nombre_usuario=fila[5], nombre=fila[6], apellido=fila[7]),
-                    medico=MedicoModel(self.db, id=fila[2], nombre_usuario=fila[8], nombre=fila[9], apellido=fila[10])
-                )
-                agendas.append(agenda_obj)
-            return agendas
+            agenda, hay_mas = self.db.pagina_segmentos(self._segmentos_pagina(despues_de), tamano, fabrica)
         except Exception as e:
             print(f"[ERROR]: No se pudieron listar la agenda -> {e}.")
-            return []
-        finally:
-            cursor.close()
+            return [], None
+        if not hay_mas:
+            return agenda, None
+        return agenda, (agenda[-1].fecha_consulta, agenda[-1].id)
+
+    def _segmentos(self) -> list:
+        """Arma el listado en dos consultas: primero las entradas con fecha y luego las sin fecha.
+
+        Igual que en ConsultasModel, cada tramo sigue el orden del índice (fecha_consulta, id).
+        """
+        return [f"{self._SQL_LISTADO} WHERE a.fecha_consulta IS NOT NULL {self._ORDEN}",
+                f"{self._SQL_LISTADO} WHERE a.fecha_consulta IS NULL {self._ORDEN_SIN_FECHA}"]
+
+    def _segmentos_pagina(self, despues_de) -> list:
+        """Arma los tramos (consulta, binds) de una página a partir de la clave."""
+        con_fecha, sin_fecha = self._segmentos()
+        if not despues_de:
+            tramos = [(con_fecha, {}), (sin_fecha, {})]
+        elif despues_de[0] is None:
+            tramos = [(f"{self._SQL_LISTADO} WHERE a.fecha_consulta IS NULL AND a.id > :id {self._ORDEN_SIN_FECHA}",
+                       {'id': despues_de[1]})]
+        else:
+            tramos = [(f"{self._SQL_LISTADO} WHERE a.fecha_consulta >= :fecha"
+                       f" AND (a.fecha_consulta > :fecha OR a.id > :id) {self._ORDEN}",
+                       {'fecha': despues_de[0], 'id': despues_de[1]}),
+                      (sin_fecha, {})]
+        return [(f"{consulta} FETCH FIRST :limite ROWS ONLY", parametros) for consulta, parametros in tramos]
+
+
+class ResumenPacienteModel:
+    """Panel del paciente armado en dos consultas.
+
+    La primera trae, con UNION ALL, las últimas recetas, las últimas consultas con fecha y
+    las citas pendientes desde hoy. Cada rama ordena por la columna de su índice por
+    paciente ((id_paciente, id) en recetas, (id_paciente, fecha) en consultas y
+    (id_paciente, fecha_consulta) en agenda) y se corta con FETCH FIRST, así el motor lee
+    solo las filas pedidas y el costo no depende del historial. La segunda trae los
+    insumos de esas recetas. El perfil no se consulta: es el de la sesión.
+    """
+
+    _SQL_RESUMEN = """
+            SELECT * FROM (
+                SELECT 'C' AS seccion, c.id, c.id_medico, c.fecha, c.comentarios AS texto,
+                       CAST(NULL AS VARCHAR2(500)) AS detalle, c.valor AS monto, c.id_receta,
+                       m.nombre_usuario, m.nombre, m.apellido
+                FROM rr_consultas c
+                JOIN rr_usuario m ON c.id_medico = m.id
+                WHERE c.id_paciente = :id_paciente AND c.fecha IS NOT NULL
+                ORDER BY c.fecha DESC FETCH FIRST :max_consultas ROWS ONLY
+            )
+            UNION ALL
+            SELECT * FROM (
+                SELECT 'R' AS seccion, r.id, r.id_medico, CAST(NULL AS DATE) AS fecha, r.descripcion AS texto,
+                       r.medicamentos_recetados AS detalle, r.costo_clp AS monto, CAST(NULL AS NUMBER) AS id_receta,
+                       m.nombre_usuario, m.nombre, m.apellido
+                FROM rr_recetas r
+                JOIN rr_usuario m ON r.id_medico = m.id
+                WHERE r.id_paciente = :id_paciente
+                ORDER BY r.id DESC FETCH FIRST :max_recetas ROWS ONLY
+            )
+            UNION ALL
+            SELECT * FROM (
+                SELECT 'A' AS seccion, a.id, a.id_medico, a.fecha_consulta AS fecha, a.estado AS texto,
+                       CAST(NULL AS VARCHAR2(500)) AS detalle, CAST(NULL AS NUMBER) AS monto,
+                       CAST(NULL AS NUMBER) AS id_receta,
+                       m.nombre_usuario, m.nombre, m.apellido
+                FROM rr_agenda a
+                JOIN rr_usuario m ON a.id_medico = m.id
+                WHERE a.id_paciente = :id_paciente AND a.estado = 'pendiente' AND a.fecha_consulta >= :desde
+                ORDER BY a.fecha_consulta FETCH FIRST :max_agenda ROWS ONLY
+            )
+    """
+
+    def __init__(self, db):
+        self.db = db
+
+    def _parametros(self, paciente: PacienteModel, max_recetas: int, max_consultas: int, max_agenda: int) -> dict:
+        """Binds de _SQL_RESUMEN; las citas cuentan desde el inicio del día de hoy."""
+        return {
+            'id_paciente': paciente.id,
+            'max_recetas': max_recetas,
+            'max_consultas': max_consultas,
+            'max_agenda': max_agenda,
+            'desde': datetime.combine(date.today(), datetime.min.time()),
+        }
+
+    @staticmethod
+    def _fabrica(paciente: PacienteModel, mapa: MapaIdentidad):
+        """rowfactory de _SQL_RESUMEN: arma una FilaReceta, FilaConsulta o FilaAgenda según la sección."""
+        persona = mapa.obtener(Persona, paciente.id, nombre_usuario=paciente.nombre_usuario,
+                               nombre=paciente.nombre, apellido=paciente.apellido)
+
+        def fila(seccion, id, id_medico, fecha, texto, detalle, monto, id_receta,
+                 medico_usuario, medico_nombre, medico_apellido):
+            medico = mapa.obtener(Persona, id_medico, nombre_usuario=medico_usuario, nombre=medico_nombre,
+                                  apellido=medico_apellido)
+            if seccion == 'R':
+                return mapa.obtener(FilaReceta, id, paciente=persona, medico=medico, descripcion=texto,
+                                    medicamentos_recetados=detalle, costo_clp=monto)
+            if seccion == 'C':
+                receta = mapa.obtener(FilaReceta, id_receta) if id_receta else None
+                return FilaConsulta(id, persona, medico, receta, fecha, texto, monto)
+            return FilaAgenda(id, persona, medico, fecha, texto)
+        return fila
+
+    @staticmethod
+    def _armar(paciente: PacienteModel, filas: list) -> ResumenPaciente:
+        """Reparte las filas de _SQL_RESUMEN en un ResumenPaciente y ordena cada sección.
+
+        UNION ALL no garantiza el orden de las ramas; cada sección trae a lo sumo su límite.
+        """
+        recetas = [fila for fila in filas if isinstance(fila, FilaReceta)]
+        consultas = [fila for fila in filas if isinstance(fila, FilaConsulta)]
+        agenda = [fila for fila in filas if isinstance(fila, FilaAgenda)]
+        return ResumenPaciente(
+            paciente,
+            sorted(recetas, key=lambda receta: receta.id, reverse=True),
+            sorted(consultas, key=lambda consulta: (consulta.fecha, consulta.id), reverse=True),
+            sorted(agenda, key=lambda cita: (cita.fecha_consulta, cita.id)),
+        )
+
+    def obtener_resumen(self, paciente: PacienteModel, max_recetas: int = 5, max_consultas: int = 5,
+                        max_agenda: int = 5, mapa: MapaIdentidad = None):
+        """Devuelve el ResumenPaciente del paciente (perfil de la sesión), o None si falla la consulta."""
+        fabrica = self._fabrica(paciente, MapaIdentidad() if mapa is None else mapa)
+        parametros = self._parametros(paciente, max_recetas, max_consultas, max_agenda)
+        total = max_recetas + max_consultas + max_agenda
+        try:
+            # Con prefetchrows mayor que el total, las filas llegan junto con la ejecución.
+            filas = list(self.db.iterar_filas(self._SQL_RESUMEN, parametros, arraysize=total + 1,
+                                              prefetchrows=total + 2, fabrica=fabrica))
+        except Exception as e:
+            print(f"[ERROR]: No se pudo obtener el resumen del paciente -> {e}.")
+            return None
+        resumen = self._armar(paciente, filas)
+        RecetasModel(self.db).cargar_insumos(resumen.recetas)
+        return resumen
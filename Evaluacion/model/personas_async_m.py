@@ -0,0 +1,241 @@
+import asyncio
+
+from model.claves_m import requiere_rehash, verificar_clave
+from model.personas_m import UsuarioModel, PacienteModel, MedicoModel, AdministradorModel
+
+# Variantes asyncio de los modelos de personas. Usan las mismas sentencias SQL que
+# model/personas_m.py y se instancian con una ConexionOracleAsync.
+
+
+class UsuarioModelAsync(UsuarioModel):
+    async def obtener_datos_login(self, nombre_usuario):
+        try:
+            return await self.db.obtener_fila(self._SQL_LOGIN, (nombre_usuario.strip(),))
+        except Exception:
+            return None
+
+    async def obtener_sesion(self, nombre_usuario):
+        try:
+            return await self.db.obtener_fila(self._SQL_SESION, (nombre_usuario.strip(),))
+        except Exception:
+            return None
+
+    async def autenticar(self, nombre_usuario, clave):
+        fila = await self.obtener_sesion(nombre_usuario)
+        if not fila:
+            return None
+        hash_guardado = fila[0]
+        if not await asyncio.to_thread(verificar_clave, clave, hash_guardado):
+            return False
+        if requiere_rehash(hash_guardado):
+            await self.rehashear_clave(fila[1], clave, hash_guardado)
+        return fila
+
+    async def rehashear_clave(self, id_usuario, clave, hash_anterior):
+        clave_encriptada = await asyncio.to_thread(self._encriptar_clave, clave)
+        return bool(await self._ejecutar(self._SQL_ACTUALIZAR_CLAVE, (clave_encriptada, id_usuario, hash_anterior)))
+
+    async def _ejecutar(self, sql, parametros):
+        """Ejecuta una sentencia DML en su propia transacción; devuelve rowcount o None si falla."""
+        try:
+            return await self.db.ejecutar(sql, parametros)
+        except Exception:
+            return None
+
+    async def _insertar_usuario(self, cursor, usuario, clave_encriptada, nombre, apellido, fecha_nacimiento, tipo,
+                                telefono=None, email=None):
+        """Inserta el usuario y su fila de rol dentro de la transacción en curso; devuelve el id generado."""
+        id_var = cursor.var(int)
+        await cursor.execute(self._SQL_INSERTAR, self._valores_insercion(usuario, clave_encriptada, nombre, apellido,
+                                                                         fecha_nacimiento, tipo, telefono, email, id_var))
+        nuevo_id = id_var.getvalue()[0]
+
+        if tipo in self._SQL_ROL:
+            await cursor.execute(self._SQL_ROL[tipo], {'id': nuevo_id})
+        return nuevo_id
+
+    async def crear_usuario(self, usuario, clave, nombre, apellido, fecha_nacimiento, tipo, telefono=None, email=None):
+        # bcrypt es CPU intensivo: se calcula en un hilo para no bloquear el bucle de eventos.
+        clave_encriptada = await asyncio.to_thread(self._encriptar_clave, clave)
+        try:
+            async with self.db.transaccion() as conn:
+                with conn.cursor() as cursor:
+                    await self._insertar_usuario(cursor, usuario, clave_encriptada, nombre, apellido, fecha_nacimiento,
+                                                 tipo, telefono, email)
+            return True
+        except Exception:
+            return False
+
+    async def ver_usuario(self, nombre_usuario):
+        try:
+            return await self.db.obtener_fila(self._SQL_VER, (nombre_usuario.strip(),))
+        except Exception:
+            return None
+
+    async def actualizar_usuario(self, nombre_usuario, nombre=None, apellido=None, fecha_nacimiento=None, telefono=None,
+                                 email=None):
+        sentencia = self._sql_actualizacion(nombre_usuario, nombre, apellido, fecha_nacimiento, telefono, email)
+        if sentencia is None:
+            return False
+        consulta, valores = sentencia
+        try:
+            async with self.db.transaccion() as conn:
+                with conn.cursor() as cursor:
+                    await cursor.execute(consulta, valores)
+                    return cursor.rowcount > 0
+        except Exception as e:
+            print(f"[DEBUG]: Error en actualizar_usuario: {e}")
+            return False
+
+    async def eliminar_usuario(self, nombre_usuario):
+        try:
+            async with self.db.transaccion() as conn:
+                with conn.cursor() as cursor:
+                    await cursor.execute(self._SQL_ID_TIPO, (nombre_usuario.strip(),))
+                    resultado = await cursor.fetchone()
+                    if not resultado:
+                        return False
+                    user_id, user_type = resultado
+
+                    if user_type in self._SQL_ELIMINAR_ROL:
+                        await cursor.execute(self._SQL_ELIMINAR_ROL[user_type], (user_id,))
+
+                    await cursor.execute(self._SQL_ELIMINAR, (user_id,))
+                    return cursor.rowcount > 0
+        except Exception:
+            return False
+
+
+class PacienteModelAsync(UsuarioModelAsync, PacienteModel):
+    async def crear_paciente(self, nombre_usuario, clave, nombre, apellido, fecha_nacimiento, comuna,
+                             fecha_primera_visita, telefono=None, email=None):
+        clave_encriptada = await asyncio.to_thread(self._encriptar_clave, clave)
+        try:
+            async with self.db.transaccion() as conn:
+                with conn.cursor() as cursor:
+                    id_paciente = await self._insertar_usuario(cursor, nombre_usuario, clave_encriptada, nombre,
+                                                               apellido, fecha_nacimiento, "paciente", telefono, email)
+                    await cursor.execute(self._SQL_DATOS_ROL, {
+                        'comuna': comuna,
+                        'fecha_primera_visita': fecha_primera_visita,
+                        'id': id_paciente
+                    })
+            return True
+        except Exception:
+            return False
+
+    async def actualizar_paciente(self, id_paciente, comuna=None, fecha_primera_visita=None):
+        sentencia = self._sql_actualizacion_paciente(id_paciente, comuna, fecha_primera_visita)
+        if sentencia is None:
+            return False
+        return await self._ejecutar(*sentencia) is not None
+
+    async def eliminar_paciente(self, id_paciente):
+        return bool(await self._ejecutar(self._SQL_ELIMINAR_ROL["paciente"], (id_paciente,)))
+
+    async def obtener_paciente(self, nombre_usuario):
+        try:
+            return await self.db.obtener_fila(self._SQL_OBTENER, (nombre_usuario.strip(),))
+        except Exception:
+            return None
+
+    async def obtener_paciente_por_id(self, id_paciente):
+        try:
+            return await self.db.obtener_fila(self._SQL_OBTENER_POR_ID, (id_paciente,))
+        except Exception:
+            return None
+
+
+class MedicoModelAsync(UsuarioModelAsync, MedicoModel):
+    async def crear_medico(self, nombre_usuario, clave, nombre, apellido, fecha_nacimiento, especialidad,
+                           horario_atencion, fecha_ingreso, telefono=None, email=None):
+        clave_encriptada = await asyncio.to_thread(self._encriptar_clave, clave)
+        try:
+            async with self.db.transaccion() as conn:
+                with conn.cursor() as cursor:
+                    id_medico = await self._insertar_usuario(cursor, nombre_usuario, clave_encriptada, nombre,
+                                                             apellido, fecha_nacimiento, "medico", telefono, email)
+                    await cursor.execute(self._SQL_DATOS_ROL, {
+                        'especialidad': especialidad,
+                        'horario': horario_atencion,
+                        'fecha_ingreso': fecha_ingreso,
+                        'id': id_medico
+                    })
+            return True
+        except Exception:
+            return False
+
+    async def actualizar_medico(self, id_medico, especialidad=None, horario_atencion=None, fecha_ingreso=None):
+        sentencia = self._sql_actualizacion_medico(id_medico, especialidad, horario_atencion, fecha_ingreso)
+        if sentencia is None:
+            return False
+        return await self._ejecutar(*sentencia) is not None
+
+    async def eliminar_medico(self, id_medico):
+        return bool(await self._ejecutar(self._SQL_ELIMINAR_ROL["medico"], (id_medico,)))
+
+    async def obtener_medico(self, nombre_usuario):
+        try:
+            return await self.db.obtener_fila(self._SQL_OBTENER, (nombre_usuario.strip(),))
+        except Exception:
+            return None
+
+    async def iterar_pacientes(self):
+        """Genera (async for) las filas de pacientes a medida que llegan desde la BD."""
+        try:
+            async for fila in self.db.iterar_filas(self._SQL_PACIENTES):
+                yield fila
+        except Exception:
+            return
+
+    async def listar_pacientes(self):
+        return [fila async for fila in self.iterar_pacientes()]
+
+
+class AdministradorModelAsync(UsuarioModelAsync, AdministradorModel):
+    async def crear_administrador(self, nombre_usuario, clave, nombre, apellido, fecha_nacimiento):
+        return await self.crear_usuario(nombre_usuario, clave, nombre, apellido, fecha_nacimiento, "administrador")
+
+    async def iterar_usuarios(self):
+        """Genera (async for) las filas de usuarios a medida que llegan desde la BD."""
+        try:
+            for consulta in self._segmentos_usuarios():
+                async for fila in self.db.iterar_filas(consulta):
+                    yield fila
+        except Exception:
+            return
+
+    async def listar_usuarios(self):
+        return [fila async for fila in self.iterar_usuarios()]
+
+    async def pagina_usuarios(self, tamano: int = 10, despues_de: tuple = None):
+        """Devuelve una página de usuarios y la clave de la siguiente; ver AdministradorModel.pagina_usuarios."""
+        try:
+            filas, hay_mas = await self.db.pagina_segmentos(self._segmentos_pagina_usuarios(despues_de), tamano)
+        except Exception:
+            return [], None
+        return filas, ((filas[-1][2], filas[-1][0]) if hay_mas else None)
+
+    async def iterar_pacientes(self):
+        """Genera (async for) las filas de pacientes con su información completa."""
+        try:
+            async for fila in self.db.iterar_filas(self._SQL_PACIENTES):
+                yield fila
+        except Exception:
+            return
+
+    async def listar_pacientes(self):
+        """Lista todos los pacientes con su información completa."""
+        return [fila async for fila in self.iterar_pacientes()]
+
+    async def iterar_medicos(self):
+        """Genera (async for) las filas de médicos a medida que llegan desde la BD."""
+        try:
+            async for fila in self.db.iterar_filas(self._SQL_MEDICOS):
+                yield fila
+        except Exception:
+            return
+
+    async def listar_medicos(self):
+        """Lista todos los médicos con su información completa."""
+        return [fila async for fila in self.iterar_medicos()]
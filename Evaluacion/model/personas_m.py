@@ -1,6 +1,35 @@
-import bcrypt
+from model.claves_m import encriptar_clave, requiere_rehash, verificar_clave
 
 class UsuarioModel:
+    _SQL_LOGIN = "SELECT clave, tipo FROM rr_usuario WHERE nombre_usuario=:1"
+    _SQL_VER = "SELECT id, nombre_usuario, nombre, apellido, fecha_nacimiento, tipo, telefono, email FROM rr_usuario WHERE nombre_usuario=:1"
+    # Hash, datos del usuario y fila de su rol en un solo viaje a la BD para el inicio de sesión.
+    _SQL_SESION = """
+            SELECT u.clave, u.id, u.nombre_usuario, u.nombre, u.apellido, u.fecha_nacimiento, u.tipo, u.telefono,
+                   u.email, p.comuna, p.fecha_primera_visita, m.especialidad, m.horario_atencion, m.fecha_ingreso
+            FROM rr_usuario u
+            LEFT JOIN rr_paciente p ON p.id_paciente = u.id
+            LEFT JOIN rr_medico m ON m.id_medico = u.id
+            WHERE u.nombre_usuario = :1
+    """
+    _SQL_INSERTAR = """
+            INSERT INTO rr_usuario (nombre_usuario, clave, nombre, apellido, fecha_nacimiento, tipo, telefono, email)
+            VALUES (:usuario, :clave, :nombre, :apellido, TO_DATE(:fecha_nacimiento, 'YYYY-MM-DD'), :tipo, :telefono, :email)
+            RETURNING id INTO :id
+    """
+    _SQL_ROL = {
+        "paciente": "INSERT INTO rr_paciente (id_paciente, comuna, fecha_primera_visita) VALUES (:id, NULL, SYSDATE)",
+        "medico": "INSERT INTO rr_medico (id_medico, especialidad, horario_atencion, fecha_ingreso) VALUES (:id, NULL, NULL, SYSDATE)",
+    }
+    _SQL_ID_TIPO = "SELECT id, tipo FROM rr_usuario WHERE nombre_usuario=:1"
+    _SQL_ELIMINAR_ROL = {
+        "paciente": "DELETE FROM rr_paciente WHERE id_paciente=:1",
+        "medico": "DELETE FROM rr_medico WHERE id_medico=:1",
+    }
+    _SQL_ELIMINAR = "DELETE FROM rr_usuario WHERE id=:1"
+    # Solo reemplaza el hash si nadie cambió la clave entre la verificación y el UPDATE.
+    _SQL_ACTUALIZAR_CLAVE = "UPDATE rr_usuario SET clave=:1 WHERE id=:2 AND clave=:3"
+
     def __init__(self, db, id=None, nombre_usuario=None, clave=None, nombre=None, apellido=None,
                  fecha_nacimiento=None, tipo=None, telefono=None, email=None):
         self.db = db
@@ -15,74 +44,142 @@ class UsuarioModel:
         self.email = email
 
     def obtener_datos_login(self, nombre_usuario):
-        cursor = self.db.obtener_cursor()
-        consulta = "SELECT clave, tipo FROM rr_usuario WHERE nombre_usuario=:1"
-        try:
-            cursor.execute(consulta, (nombre_usuario.strip(),))
-            resultado = cursor.fetchone()
-            if resultado:
-                return resultado
-            return None
-        except Exception:
+        consulta = self._SQL_LOGIN
+        with self.db.conexion() as conn:
+            cursor = self.db.cursor_reutilizable(conn, consulta)
+            try:
+                cursor.execute(consulta, (nombre_usuario.strip(),))
+                resultado = cursor.fetchone()
+                if resultado:
+                    return resultado
+                return None
+            except Exception:
+                return None
+
+    def obtener_sesion(self, nombre_usuario):
+        """Devuelve en una sola consulta el hash, el usuario y los datos de su rol (fila de _SQL_SESION)."""
+        consulta = self._SQL_SESION
+        with self.db.conexion() as conn:
+            cursor = self.db.cursor_reutilizable(conn, consulta)
+            try:
+                cursor.execute(consulta, (nombre_usuario.strip(),))
+                return cursor.fetchone()
+            except Exception:
+                return None
+
+    def autenticar(self, nombre_usuario, clave):
+        """Verifica la clave del usuario.
+
+        Devuelve la fila de _SQL_SESION si la clave es correcta, False si no lo es y None si
+        el usuario no existe. bcrypt libera el GIL mientras verifica, así los demás hilos
+        siguen corriendo; si el hash se generó con un costo distinto de COSTO_BCRYPT, se
+        recalcula y se guarda.
+        """
+        fila = self.obtener_sesion(nombre_usuario)
+        if not fila:
             return None
-        finally:
-            if cursor:
-                cursor.close()
+        hash_guardado = fila[0]
+        if not verificar_clave(clave, hash_guardado):
+            return False
+        if requiere_rehash(hash_guardado):
+            self.rehashear_clave(fila[1], clave, hash_guardado)
+        return fila
+
+    def rehashear_clave(self, id_usuario, clave, hash_anterior):
+        """Guarda la clave con el costo vigente; devuelve True si se actualizó el hash."""
+        clave_encriptada = self._encriptar_clave(clave)
+        try:
+            with self.db.transaccion() as conn, conn.cursor() as cursor:
+                cursor.execute(self._SQL_ACTUALIZAR_CLAVE, (clave_encriptada, id_usuario, hash_anterior))
+                return cursor.rowcount > 0
+        except Exception as e:
+            print(f"[WARN]: No se pudo actualizar el hash de la clave → {e}")
+            return False
 
-    def crear_usuario(self, usuario, clave, nombre, apellido, fecha_nacimiento, tipo):
-        cursor = self.db.obtener_cursor()
-        clave_encriptada = bcrypt.hashpw(clave.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+    def perfil_desde_sesion(self, fila):
+        """Construye el perfil (PacienteModel, MedicoModel o AdministradorModel) desde una fila de _SQL_SESION."""
+        datos = dict(db=self.db, id=fila[1], nombre_usuario=fila[2], nombre=fila[3], apellido=fila[4],
+                     fecha_nacimiento=fila[5])
+        tipo = fila[6]
+        if tipo == "paciente":
+            perfil = PacienteModel(**datos, comuna=fila[9], fecha_primera_visita=fila[10])
+        elif tipo == "medico":
+            perfil = MedicoModel(**datos, especialidad=fila[11], horario_atencion=fila[12], fecha_ingreso=fila[13])
+        elif tipo == "administrador":
+            perfil = AdministradorModel(**datos)
+        else:
+            perfil = UsuarioModel(**datos, tipo=tipo)
+        perfil.telefono = fila[7]
+        perfil.email = fila[8]
+        return perfil
+
+    @staticmethod
+    def _encriptar_clave(clave):
+        return encriptar_clave(clave)
+
+    def _insertar_usuario(self, cursor, usuario, clave_encriptada, nombre, apellido, fecha_nacimiento, tipo,
+                          telefono=None, email=None):
+        """Inserta el usuario y su fila de rol dentro de la transacción en curso; devuelve el id generado."""
+        id_var = cursor.var(int)
+        cursor.execute(self._SQL_INSERTAR, self._valores_insercion(usuario, clave_encriptada, nombre, apellido,
+                                                                   fecha_nacimiento, tipo, telefono, email, id_var))
+        nuevo_id = id_var.getvalue()[0]
+
+        if tipo in self._SQL_ROL:
+            cursor.execute(self._SQL_ROL[tipo], {'id': nuevo_id})
+        return nuevo_id
+
+    @staticmethod
+    def _valores_insercion(usuario, clave_encriptada, nombre, apellido, fecha_nacimiento, tipo, telefono, email, id_var):
+        """Arma los binds de _SQL_INSERTAR."""
+        return {
+            'usuario': usuario,
+            'clave': clave_encriptada,
+            'nombre': nombre,
+            'apellido': apellido,
+            'fecha_nacimiento': fecha_nacimiento,
+            'tipo': tipo,
+            'telefono': telefono or None,
+            'email': email or None,
+            'id': id_var
+        }
+
+    def crear_usuario(self, usuario, clave, nombre, apellido, fecha_nacimiento, tipo, telefono=None, email=None):
+        clave_encriptada = self._encriptar_clave(clave)
         try:
-            sql_usuario = """
-                INSERT INTO rr_usuario (nombre_usuario, clave, nombre, apellido, fecha_nacimiento, tipo)
-                VALUES (:usuario, :clave, :nombre, :apellido, TO_DATE(:fecha_nacimiento, 'YYYY-MM-DD'), :tipo)
-                RETURNING id INTO :id
-            """
-            id_var = cursor.var(int)
-            cursor.execute(sql_usuario, {
-                'usuario': usuario,
-                'clave': clave_encriptada,
-                'nombre': nombre,
-                'apellido': apellido,
-                'fecha_nacimiento': fecha_nacimiento,
-                'tipo': tipo,
-                'id': id_var
-            })
-            nuevo_id = id_var.getvalue()[0]
-
-            if tipo == "paciente":
-                cursor.execute(
-                    "INSERT INTO rr_paciente (id_paciente, comuna, fecha_primera_visita) VALUES (:id, NULL, SYSDATE)",
-                    {'id': nuevo_id}
-                )
-            elif tipo == "medico":
-                cursor.execute(
-                    "INSERT INTO rr_medico (id_medico, especialidad, horario_atencion, fecha_ingreso) VALUES (:id, NULL, NULL, SYSDATE)",
-                    {'id': nuevo_id}
-                )
-
-            self.db.connection.commit()
+            with self.db.transaccion() as conn, conn.cursor() as cursor:
+                self._insertar_usuario(cursor, usuario, clave_encriptada, nombre, apellido, fecha_nacimiento, tipo,
+                                       telefono, email)
             return True
         except Exception:
-            self.db.connection.rollback()
             return False
-        finally:
-            cursor.close()
 
     def ver_usuario(self, nombre_usuario):
-        cursor = self.db.obtener_cursor()
-        consulta = "SELECT id, nombre_usuario, nombre, apellido, fecha_nacimiento, tipo, telefono, email FROM rr_usuario WHERE nombre_usuario=:1"
-        try:
-            cursor.execute(consulta, (nombre_usuario.strip(),))
-            return cursor.fetchone()
-        except Exception:
-            return None
-        finally:
-            if cursor:
-                cursor.close()
+        consulta = self._SQL_VER
+        with self.db.conexion() as conn:
+            cursor = self.db.cursor_reutilizable(conn, consulta)
+            try:
+                cursor.execute(consulta, (nombre_usuario.strip(),))
+                return cursor.fetchone()
+            except Exception:
+                return None
 
     def actualizar_usuario(self, nombre_usuario, nombre=None, apellido=None, fecha_nacimiento=None, telefono=None, email=None):
-        cursor = self.db.obtener_cursor()
+        sentencia = self._sql_actualizacion(nombre_usuario, nombre, apellido, fecha_nacimiento, telefono, email)
+        if sentencia is None:
+            return False
+        consulta, valores = sentencia
+        try:
+            with self.db.transaccion() as conn, conn.cursor() as cursor:
+                cursor.execute(consulta, valores)
+                return cursor.rowcount > 0
+        except Exception as e:
+            print(f"[DEBUG]: Error en actualizar_usuario: {e}")
+            return False
+
+    @staticmethod
+    def _sql_actualizacion(nombre_usuario, nombre=None, apellido=None, fecha_nacimiento=None, telefono=None, email=None):
+        """Arma el UPDATE con los campos informados; devuelve (consulta, valores) o None si no hay cambios."""
         datos = []
         valores = {'nombre_usuario': nombre_usuario.strip()}
         
@@ -105,91 +202,86 @@ class UsuarioModel:
             valores['email'] = email if email else None
             
         if not datos:
-            return False
+            return None
         
         consulta = f"UPDATE rr_usuario SET {', '.join(datos)} WHERE nombre_usuario = :nombre_usuario"
-        try:
-            cursor.execute(consulta, valores)
-            self.db.connection.commit()
-            return cursor.rowcount > 0
-        except Exception as e:
-            print(f"[DEBUG]: Error en actualizar_usuario: {e}")
-            self.db.connection.rollback()
-            return False
-        finally:
-            if cursor:
-                cursor.close()
+        return consulta, valores
 
     def eliminar_usuario(self, nombre_usuario):
-        cursor = self.db.obtener_cursor()
         try:
-            consulta_select = "SELECT id, tipo FROM rr_usuario WHERE nombre_usuario=:1"
-            cursor.execute(consulta_select, (nombre_usuario.strip(),))
-            resultado = cursor.fetchone()
-            if not resultado:
-                return False
-            user_id, user_type = resultado
-
-            if user_type == "paciente":
-                cursor.execute("DELETE FROM rr_paciente WHERE id_paciente=:1", (user_id,))
-            elif user_type == "medico":
-                cursor.execute("DELETE FROM rr_medico WHERE id_medico=:1", (user_id,))
-
-            consulta_delete = "DELETE FROM rr_usuario WHERE id=:1"
-            cursor.execute(consulta_delete, (user_id,))
-            
-            if cursor.rowcount > 0:
-                self.db.connection.commit()
-                return True
-            else:
-                self.db.connection.rollback()
-                return False
+            with self.db.transaccion() as conn, conn.cursor() as cursor:
+                cursor.execute(self._SQL_ID_TIPO, (nombre_usuario.strip(),))
+                resultado = cursor.fetchone()
+                if not resultado:
+                    return False
+                user_id, user_type = resultado
+
+                if user_type in self._SQL_ELIMINAR_ROL:
+                    cursor.execute(self._SQL_ELIMINAR_ROL[user_type], (user_id,))
+
+                cursor.execute(self._SQL_ELIMINAR, (user_id,))
+                return cursor.rowcount > 0
         except Exception:
-            self.db.connection.rollback()
             return False
-        finally:
-            if cursor:
-                cursor.close()
 
 class PacienteModel(UsuarioModel):
+    _SQL_DATOS_ROL = """
+            UPDATE rr_paciente
+            SET comuna = :comuna,
+                fecha_primera_visita = TO_DATE(:fecha_primera_visita, 'YYYY-MM-DD')
+            WHERE id_paciente = :id
+    """
+    _SQL_OBTENER = """
+            SELECT u.id, u.nombre_usuario, u.nombre, u.apellido, u.fecha_nacimiento, p.comuna, p.fecha_primera_visita
+            FROM rr_usuario u
+            JOIN rr_paciente p ON u.id=p.id_paciente
+            WHERE u.nombre_usuario = :1
+    """
+    _SQL_OBTENER_POR_ID = """
+            SELECT u.id, u.nombre_usuario, u.nombre, u.apellido, u.fecha_nacimiento, p.comuna, p.fecha_primera_visita
+            FROM rr_usuario u
+            JOIN rr_paciente p ON u.id=p.id_paciente
+            WHERE u.id = :1
+    """
+
     def __init__(self, db, id=None, nombre_usuario=None, clave=None, nombre=None, apellido=None,
                  fecha_nacimiento=None, comuna=None, fecha_primera_visita=None):
         super().__init__(db, id, nombre_usuario, clave, nombre, apellido, fecha_nacimiento, tipo="paciente")
         self.comuna = comuna
         self.fecha_primera_visita = fecha_primera_visita
 
-    def crear_paciente(self, nombre_usuario, clave, nombre, apellido, fecha_nacimiento, comuna, fecha_primera_visita):
-        exito_usuario = super().crear_usuario(nombre_usuario, clave, nombre, apellido, fecha_nacimiento, "paciente")
-        if not exito_usuario:
+    def crear_paciente(self, nombre_usuario, clave, nombre, apellido, fecha_nacimiento, comuna, fecha_primera_visita,
+                       telefono=None, email=None):
+        clave_encriptada = self._encriptar_clave(clave)
+        consulta = self._SQL_DATOS_ROL
+        try:
+            with self.db.transaccion() as conn, conn.cursor() as cursor:
+                id_paciente = self._insertar_usuario(cursor, nombre_usuario, clave_encriptada, nombre, apellido,
+                                                     fecha_nacimiento, "paciente", telefono, email)
+                cursor.execute(consulta, {
+                    'comuna': comuna,
+                    'fecha_primera_visita': fecha_primera_visita,
+                    'id': id_paciente
+                })
+            return True
+        except Exception:
             return False
 
-        cursor = self.db.obtener_cursor()
+    def actualizar_paciente(self, id_paciente, comuna=None, fecha_primera_visita=None):
+        sentencia = self._sql_actualizacion_paciente(id_paciente, comuna, fecha_primera_visita)
+        if sentencia is None:
+            return False
+        consulta, valores = sentencia
         try:
-            consulta_id = "SELECT id FROM rr_usuario WHERE nombre_usuario = :1"
-            cursor.execute(consulta_id, (nombre_usuario,))
-            id_paciente = cursor.fetchone()[0]
-
-            consulta = """
-                UPDATE rr_paciente
-                SET comuna = :comuna,
-                    fecha_primera_visita = TO_DATE(:fecha_primera_visita, 'YYYY-MM-DD')
-                WHERE id_paciente = :id
-            """
-            cursor.execute(consulta, {
-                'comuna': comuna,
-                'fecha_primera_visita': fecha_primera_visita,
-                'id': id_paciente
-            })
-            self.db.connection.commit()
+            with self.db.transaccion() as conn, conn.cursor() as cursor:
+                cursor.execute(consulta, valores)
             return True
         except Exception:
-            self.db.connection.rollback()
             return False
-        finally:
-            cursor.close()
 
-    def actualizar_paciente(self, id_paciente, comuna=None, fecha_primera_visita=None):
-        cursor = self.db.obtener_cursor()
+    @staticmethod
+    def _sql_actualizacion_paciente(id_paciente, comuna=None, fecha_primera_visita=None):
+        """Arma el UPDATE con los campos informados; devuelve (consulta, valores) o None si no hay cambios."""
         campos, valores = [], {'id': id_paciente}
         if comuna:
             campos.append("comuna = :comuna")
@@ -198,68 +290,59 @@ class PacienteModel(UsuarioModel):
             campos.append("fecha_primera_visita = TO_DATE(:fecha, 'YYYY-MM-DD')")
             valores['fecha'] = fecha_primera_visita
         if not campos:
-            return False
-        consulta = f"UPDATE rr_paciente SET {', '.join(campos)} WHERE id_paciente = :id"
-        try:
-            cursor.execute(consulta, valores)
-            self.db.connection.commit()
-            return True
-        except Exception:
-            self.db.connection.rollback()
-            return False
-        finally:
-            cursor.close()
+            return None
+        return f"UPDATE rr_paciente SET {', '.join(campos)} WHERE id_paciente = :id", valores
 
     def eliminar_paciente(self, id_paciente):
-        cursor = self.db.obtener_cursor()
         try:
-            cursor.execute("DELETE FROM rr_paciente WHERE id_paciente = :1", (id_paciente,))
-            if cursor.rowcount > 0:
-                self.db.connection.commit()
-                return True
-            else:
-                return False
+            with self.db.transaccion() as conn, conn.cursor() as cursor:
+                cursor.execute(self._SQL_ELIMINAR_ROL["paciente"], (id_paciente,))
+                return cursor.rowcount > 0
         except Exception:
-            self.db.connection.rollback()
             return False
-        finally:
-            cursor.close()
 
     def obtener_paciente(self, nombre_usuario):
-        cursor = self.db.obtener_cursor()
-        consulta = """
-            SELECT u.id, u.nombre_usuario, u.nombre, u.apellido, u.fecha_nacimiento, p.comuna, p.fecha_primera_visita
-            FROM rr_usuario u
-            JOIN rr_paciente p ON u.id=p.id_paciente
-            WHERE u.nombre_usuario = :1
-        """
-        try:
-            cursor.execute(consulta, (nombre_usuario.strip(),))
-            return cursor.fetchone()
-        except Exception:
-            return None
-        finally:
-            if cursor:
-                cursor.close()
+        consulta = self._SQL_OBTENER
+        with self.db.conexion() as conn:
+            cursor = self.db.cursor_reutilizable(conn, consulta)
+            try:
+                cursor.execute(consulta, (nombre_usuario.strip(),))
+                return cursor.fetchone()
+            except Exception:
+                return None
 
     def obtener_paciente_por_id(self, id_paciente):
-        cursor = self.db.obtener_cursor()
-        consulta = """
-            SELECT u.id, u.nombre_usuario, u.nombre, u.apellido, u.fecha_nacimiento, p.comuna, p.fecha_primera_visita
-            FROM rr_usuario u
-            JOIN rr_paciente p ON u.id=p.id_paciente
-            WHERE u.id = :1
-        """
-        try:
-            cursor.execute(consulta, (id_paciente,))
-            return cursor.fetchone()
-        except Exception:
-            return None
-        finally:
-            if cursor:
-                cursor.close()
+        consulta = self._SQL_OBTENER_POR_ID
+        with self.db.conexion() as conn:
+            cursor = self.db.cursor_reutilizable(conn, consulta)
+            try:
+                cursor.execute(consulta, (id_paciente,))
+                return cursor.fetchone()
+            except Exception:
+                return None
 
 class MedicoModel(UsuarioModel):
+    _SQL_DATOS_ROL = """
+            UPDATE rr_medico
+            SET especialidad = :especialidad,
+                horario_atencion = :horario,
+                fecha_ingreso = TO_DATE(:fecha_ingreso, 'YYYY-MM-DD')
+            WHERE id_medico = :id
+    """
+    _SQL_OBTENER = """
+            SELECT u.id, u.nombre_usuario, u.nombre, u.apellido, u.fecha_nacimiento,
+                   m.especialidad, m.horario_atencion, m.fecha_ingreso
+            FROM rr_usuario u
+            JOIN rr_medico m ON u.id = m.id_medico
+            WHERE u.nombre_usuario = :1
+    """
+    _SQL_PACIENTES = """
+            SELECT p.id_paciente, u.nombre_usuario, u.nombre, u.apellido, u.fecha_nacimiento, p.comuna, p.fecha_primera_visita
+            FROM rr_paciente p
+            INNER JOIN rr_usuario u ON p.id_paciente = u.id
+            ORDER BY u.nombre ASC
+    """
+
     def __init__(self, db, id=None, nombre_usuario=None, clave=None, nombre=None, apellido=None,
                  fecha_nacimiento=None, especialidad=None, horario_atencion=None, fecha_ingreso=None):
         super().__init__(db, id, nombre_usuario, clave, nombre, apellido, fecha_nacimiento, tipo="medico")
@@ -268,39 +351,37 @@ class MedicoModel(UsuarioModel):
         self.fecha_ingreso = fecha_ingreso
 
     def crear_medico(self, nombre_usuario, clave, nombre, apellido, fecha_nacimiento, especialidad, horario_atencion, fecha_ingreso, telefono=None, email=None):
-        exito_usuario = super().crear_usuario(nombre_usuario, clave, nombre, apellido, fecha_nacimiento, "medico")
-        if not exito_usuario:
+        clave_encriptada = self._encriptar_clave(clave)
+        consulta = self._SQL_DATOS_ROL
+        try:
+            with self.db.transaccion() as conn, conn.cursor() as cursor:
+                id_medico = self._insertar_usuario(cursor, nombre_usuario, clave_encriptada, nombre, apellido,
+                                                   fecha_nacimiento, "medico", telefono, email)
+                cursor.execute(consulta, {
+                    'especialidad': especialidad,
+                    'horario': horario_atencion,
+                    'fecha_ingreso': fecha_ingreso,
+                    'id': id_medico
+                })
+            return True
+        except Exception:
             return False
 
-        cursor = self.db.obtener_cursor()
+    def actualizar_medico(self, id_medico, especialidad=None, horario_atencion=None, fecha_ingreso=None):
+        sentencia = self._sql_actualizacion_medico(id_medico, especialidad, horario_atencion, fecha_ingreso)
+        if sentencia is None:
+            return False
+        consulta, valores = sentencia
         try:
-            consulta_id = "SELECT id FROM rr_usuario WHERE nombre_usuario = :1"
-            cursor.execute(consulta_id, (nombre_usuario,))
-            id_medico = cursor.fetchone()[0]
-
-            consulta = """
-                UPDATE rr_medico
-                SET especialidad = :especialidad,
-                    horario_atencion = :horario,
-                    fecha_ingreso = TO_DATE(:fecha_ingreso, 'YYYY-MM-DD')
-                WHERE id_medico = :id
-            """
-            cursor.execute(consulta, {
-                'especialidad': especialidad,
-                'horario': horario_atencion,
-                'fecha_ingreso': fecha_ingreso,
-                'id': id_medico
-            })
-            self.db.connection.commit()
+            with self.db.transaccion() as conn, conn.cursor() as cursor:
+                cursor.execute(consulta, valores)
             return True
         except Exception:
-            self.db.connection.rollback()
             return False
-        finally:
-            cursor.close()
 
-    def actualizar_medico(self, id_medico, especialidad=None, horario_atencion=None, fecha_ingreso=None):
-        cursor = self.db.obtener_cursor()
+    @staticmethod
+    def _sql_actualizacion_medico(id_medico, especialidad=None, horario_atencion=None, fecha_ingreso=None):
+        """Arma el UPDATE con los campos informados; devuelve (consulta, valores) o None si no hay cambios."""
         campos, valores = [], {'id': id_medico}
         if especialidad:
             campos.append("especialidad = :esp")
@@ -312,68 +393,61 @@ class MedicoModel(UsuarioModel):
             campos.append("fecha_ingreso = TO_DATE(:fecha, 'YYYY-MM-DD')")
             valores['fecha'] = fecha_ingreso
         if not campos:
-            return False
-        consulta = f"UPDATE rr_medico SET {', '.join(campos)} WHERE id_medico = :id"
-        try:
-            cursor.execute(consulta, valores)
-            self.db.connection.commit()
-            return True
-        except Exception:
-            self.db.connection.rollback()
-            return False
-        finally:
-            cursor.close()
+            return None
+        return f"UPDATE rr_medico SET {', '.join(campos)} WHERE id_medico = :id", valores
 
     def eliminar_medico(self, id_medico):
-        cursor = self.db.obtener_cursor()
         try:
-            cursor.execute("DELETE FROM rr_medico WHERE id_medico = :1", (id_medico,))
-            if cursor.rowcount > 0:
-                self.db.connection.commit()
-                return True
-            else:
-                return False
+            with self.db.transaccion() as conn, conn.cursor() as cursor:
+                cursor.execute(self._SQL_ELIMINAR_ROL["medico"], (id_medico,))
+                return cursor.rowcount > 0
         except Exception:
-            self.db.connection.rollback()
             return False
-        finally:
-            cursor.close()
 
     def obtener_medico(self, nombre_usuario):
-        cursor = self.db.obtener_cursor()
-        consulta = """
-            SELECT u.id, u.nombre_usuario, u.nombre, u.apellido, u.fecha_nacimiento,
-                   m.especialidad, m.horario_atencion, m.fecha_ingreso
-            FROM rr_usuario u
-            JOIN rr_medico m ON u.id = m.id_medico
-            WHERE u.nombre_usuario = :1
-        """
+        consulta = self._SQL_OBTENER
+        with self.db.conexion() as conn:
+            cursor = self.db.cursor_reutilizable(conn, consulta)
+            try:
+                cursor.execute(consulta, (nombre_usuario.strip(),))
+                return cursor.fetchone()
+            except Exception:
+                return None
+
+    def iterar_pacientes(self):
+        """Genera las filas de pacientes a medida que llegan desde la BD."""
         try:
-            cursor.execute(consulta, (nombre_usuario.strip(),))
-            return cursor.fetchone()
+            yield from self.db.iterar_filas(self._SQL_PACIENTES)
         except Exception:
-            return None
-        finally:
-            if cursor:
-                cursor.close()
+            return
 
     def listar_pacientes(self):
-        cursor = self.db.obtener_cursor()
-        consulta = """
-            SELECT p.id_paciente, u.nombre_usuario, u.nombre, u.apellido, u.fecha_nacimiento, p.comuna, p.fecha_primera_visita
-            FROM rr_paciente p
-            INNER JOIN rr_usuario u ON p.id_paciente = u.id
-            ORDER BY u.nombre ASC
-        """
-        try:
-            cursor.execute(consulta)
-            return cursor.fetchall()
-        except Exception:
-            return []
-        finally:
-            cursor.close()
+        return list(self.iterar_pacientes())
 
 class AdministradorModel(UsuarioModel):
+    _SQL_USUARIOS = """
+            SELECT id, nombre_usuario, nombre, apellido, fecha_nacimiento, tipo, telefono, email
+            FROM rr_usuario
+            {filtro}
+            {orden}
+    """
+    _ORDEN_USUARIOS = "ORDER BY nombre ASC, id ASC"
+    _ORDEN_SIN_NOMBRE = "ORDER BY id ASC"
+    _SQL_PACIENTES = """
+            SELECT u.id, u.nombre_usuario, u.nombre, u.apellido, u.fecha_nacimiento, 
+                   u.tipo, u.telefono, u.email, p.comuna, p.fecha_primera_visita
+            FROM rr_usuario u
+            JOIN rr_paciente p ON u.id = p.id_paciente
+            ORDER BY u.nombre ASC
+    """
+    _SQL_MEDICOS = """
+            SELECT u.id, u.nombre_usuario, u.nombre, u.apellido, u.fecha_nacimiento,
+                   u.tipo, u.telefono, u.email, m.especialidad, m.horario_atencion, m.fecha_ingreso
+            FROM rr_usuario u
+            JOIN rr_medico m ON u.id = m.id_medico
+            ORDER BY u.nombre ASC
+    """
+
     def __init__(self, db, id=None, nombre_usuario=None, clave=None, nombre=None, apellido=None,
                  fecha_nacimiento=None):
         super().__init__(db, id, nombre_usuario, clave, nombre, apellido, fecha_nacimiento, tipo="administrador")
@@ -385,53 +459,72 @@ class AdministradorModel(UsuarioModel):
 
         return True
 
+    def iterar_usuarios(self):
+        """Genera las filas de usuarios a medida que llegan desde la BD."""
+        try:
+            for consulta in self._segmentos_usuarios():
+                yield from self.db.iterar_filas(consulta)
+        except Exception:
+            return
+
     def listar_usuarios(self):
-        cursor = self.db.obtener_cursor()
-        consulta = """
-            SELECT id, nombre_usuario, nombre, apellido, fecha_nacimiento, tipo, telefono, email
-            FROM rr_usuario
-            ORDER BY nombre ASC
+        return list(self.iterar_usuarios())
+
+    def pagina_usuarios(self, tamano: int = 10, despues_de: tuple = None):
+        """Devuelve una página de usuarios ordenada por nombre y la clave de la siguiente.
+
+        La clave es (nombre, id) del último usuario de la página anterior (None para la
+        primera); la clave devuelta es None cuando no quedan más usuarios. Los
+        usuarios sin nombre van al final, por id.
         """
         try:
-            cursor.execute(consulta)
-            return cursor.fetchall()
+            filas, hay_mas = self.db.pagina_segmentos(self._segmentos_pagina_usuarios(despues_de), tamano)
         except Exception:
-            return []
-        finally:
-            cursor.close()
+            return [], None
+        return filas, ((filas[-1][2], filas[-1][0]) if hay_mas else None)
+
+    def _segmentos_usuarios(self) -> list:
+        """Arma el listado en dos consultas: primero los usuarios con nombre y luego los sin nombre.
+
+        Cada tramo sigue el orden del índice (nombre, id), sin NULLS LAST, que obligaría
+        a ordenar la tabla completa en el motor que ubica los NULL al comienzo.
+        """
+        return [self._SQL_USUARIOS.format(filtro="WHERE nombre IS NOT NULL", orden=self._ORDEN_USUARIOS),
+                self._SQL_USUARIOS.format(filtro="WHERE nombre IS NULL", orden=self._ORDEN_SIN_NOMBRE)]
+
+    def _segmentos_pagina_usuarios(self, despues_de) -> list:
+        """Arma los tramos (consulta, binds) de una página de usuarios a partir de la clave."""
+        con_nombre, sin_nombre = self._segmentos_usuarios()
+        if not despues_de:
+            tramos = [(con_nombre, {}), (sin_nombre, {})]
+        elif despues_de[0] is None:
+            tramos = [(self._SQL_USUARIOS.format(filtro="WHERE nombre IS NULL AND id > :id",
+                                                 orden=self._ORDEN_SIN_NOMBRE), {'id': despues_de[1]})]
+        else:
+            tramos = [(self._SQL_USUARIOS.format(filtro="WHERE nombre >= :nombre AND (nombre > :nombre OR id > :id)",
+                                                 orden=self._ORDEN_USUARIOS),
+                       {'nombre': despues_de[0], 'id': despues_de[1]}),
+                      (sin_nombre, {})]
+        return [(f"{consulta} FETCH FIRST :limite ROWS ONLY", parametros) for consulta, parametros in tramos]
+
+    def iterar_pacientes(self):
+        """Genera las filas de pacientes con su información completa a medida que llegan desde la BD."""
+        try:
+            yield from self.db.iterar_filas(self._SQL_PACIENTES)
+        except Exception:
+            return
 
     def listar_pacientes(self):
         """Lista todos los pacientes con su información completa."""
-        cursor = self.db.obtener_cursor()
-        consulta = """
-            SELECT u.id, u.nombre_usuario, u.nombre, u.apellido, u.fecha_nacimiento, 
-                   u.tipo, u.telefono, u.email, p.comuna, p.fecha_primera_visita
-            FROM rr_usuario u
-            JOIN rr_paciente p ON u.id = p.id_paciente
-            ORDER BY u.nombre ASC
-        """
+        return list(self.iterar_pacientes())
+
+    def iterar_medicos(self):
+        """Genera las filas de médicos a medida que llegan desde la BD."""
         try:
-            cursor.execute(consulta)
-            return cursor.fetchall()
+            yield from self.db.iterar_filas(self._SQL_MEDICOS)
         except Exception:
-            return []
-        finally:
-            cursor.close()
+            return
 
     def listar_medicos(self):
         """Lista todos los médicos con su información completa."""
-        cursor = self.db.obtener_cursor()
-        consulta = """
-            SELECT u.id, u.nombre_usuario, u.nombre, u.apellido, u.fecha_nacimiento,
-                   u.tipo, u.telefono, u.email, m.especialidad, m.horario_atencion, m.fecha_ingreso
-            FROM rr_usuario u
-            JOIN rr_medico m ON u.id = m.id_medico
-            ORDER BY u.nombre ASC
-        """
-        try:
-            cursor.execute(consulta)
-            return cursor.fetchall()
-        except Exception:
-            return []
-        finally:
-            cursor.close()
\ No newline at end of file
+        return list(self.iterar_medicos())
@@ -0,0 +1,186 @@
+import hashlib
+import json
+import os
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime
+
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
+
+
+class Sesion:
+    """Usuario autenticado con su perfil completo.
+
+    El perfil (PacienteModel, MedicoModel o AdministradorModel, con los datos de su rol)
+    se carga una sola vez al iniciar sesión y acompaña al usuario por los menús, que lo
+    usan sin volver a consultar la BD. token y expira los asigna AlmacenSesiones.abrir().
+    """
+
+    def __init__(self, perfil):
+        self.perfil = perfil
+        self.inicio = datetime.now()
+        self.token = None
+        self.expira = None
+
+    @property
+    def id(self):
+        return self.perfil.id
+
+    @property
+    def nombre_usuario(self):
+        return self.perfil.nombre_usuario
+
+    @property
+    def tipo(self):
+        return self.perfil.tipo
+
+
+def _huella_token(token: str) -> str:
+    """En el archivo compartido se guarda el SHA-256 del token, nunca el token."""
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+@contextmanager
+def _bloqueo_exclusivo(ruta: str):
+    """Toma un bloqueo exclusivo entre procesos sobre ruta (se crea vacía) y espera si está ocupado."""
+    with open(ruta, "a+b") as archivo:
+        if os.name == "nt":
+            archivo.seek(0)
+            msvcrt.locking(archivo.fileno(), msvcrt.LK_LOCK, 1)
+        else:
+            fcntl.flock(archivo.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if os.name == "nt":
+                archivo.seek(0)
+                msvcrt.locking(archivo.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(archivo.fileno(), fcntl.LOCK_UN)
+
+
+class AlmacenSesiones:
+    """Sesiones abiertas indexadas por token: LRU con vencimiento.
+
+    Tras un inicio de sesión correcto, abrir() entrega un token; obtener(token) autoriza
+    las solicitudes siguientes con una búsqueda en un diccionario, sin volver a pasar por
+    bcrypt. Cada sesión vence ttl segundos después de abrirse y, si hay más de maximo,
+    se descarta la usada hace más tiempo.
+
+    Con ruta, las sesiones también se guardan en un archivo JSON compartido entre
+    terminales o procesos; una sesión abierta en otro proceso se reconstruye con
+    cargar_perfil(nombre_usuario), una consulta sin verificar la clave.
+    """
+
+    def __init__(self, ttl: int = 1800, maximo: int = 1000, ruta: str = None, cargar_perfil=None):
+        self.ttl = ttl
+        self.maximo = maximo
+        self.ruta = ruta
+        self.cargar_perfil = cargar_perfil
+        self._sesiones = OrderedDict()
+        self._lock = threading.Lock()
+
+    def abrir(self, sesion: Sesion) -> str:
+        """Registra la sesión y devuelve su token."""
+        sesion.token = secrets.token_urlsafe(32)
+        sesion.expira = time.time() + self.ttl
+        with self._lock:
+            self._guardar_en_memoria(sesion)
+            if self.ruta:
+                self._persistir(lambda entradas: entradas.__setitem__(_huella_token(sesion.token), {
+                    "id": sesion.id, "nombre_usuario": sesion.nombre_usuario, "tipo": sesion.tipo,
+                    "expira": sesion.expira,
+                }))
+        return sesion.token
+
+    def obtener(self, token: str):
+        """Devuelve la sesión vigente del token o None si no existe o ya venció."""
+        if not token:
+            return None
+        with self._lock:
+            sesion = self._sesiones.get(token)
+            if sesion is None and self.ruta:
+                sesion = self._recuperar(token)
+            if sesion is None:
+                return None
+            if sesion.expira <= time.time():
+                del self._sesiones[token]
+                return None
+            self._sesiones.move_to_end(token)
+            return sesion
+
+    def cerrar(self, token: str):
+        """Elimina la sesión (cierre de sesión explícito)."""
+        with self._lock:
+            self._sesiones.pop(token, None)
+            if self.ruta:
+                self._persistir(lambda entradas: entradas.pop(_huella_token(token), None))
+
+    def purgar(self) -> int:
+        """Descarta las sesiones vencidas y devuelve cuántas se eliminaron."""
+        ahora = time.time()
+        with self._lock:
+            vencidas = [token for token, sesion in self._sesiones.items() if sesion.expira <= ahora]
+            for token in vencidas:
+                del self._sesiones[token]
+            if self.ruta:
+                self._persistir(lambda entradas: None)
+        return len(vencidas)
+
+    def __len__(self):
+        return len(self._sesiones)
+
+    def _guardar_en_memoria(self, sesion: Sesion):
+        self._sesiones[sesion.token] = sesion
+        self._sesiones.move_to_end(sesion.token)
+        while len(self._sesiones) > self.maximo:
+            self._sesiones.popitem(last=False)
+
+    def _recuperar(self, token: str):
+        """Reconstruye desde el archivo compartido una sesión abierta en otro proceso."""
+        entrada = self._leer_archivo().get(_huella_token(token))
+        if not entrada or entrada["expira"] <= time.time() or self.cargar_perfil is None:
+            return None
+        perfil = self.cargar_perfil(entrada["nombre_usuario"])
+        if perfil is None or perfil.id != entrada["id"]:
+            return None
+        sesion = Sesion(perfil)
+        sesion.token = token
+        sesion.expira = entrada["expira"]
+        self._guardar_en_memoria(sesion)
+        return sesion
+
+    def _leer_archivo(self) -> dict:
+        try:
+            with open(self.ruta, "r", encoding="utf-8") as archivo:
+                return json.load(archivo)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            print(f"[WARN]: No se pudo leer el archivo de sesiones → {e}")
+            return {}
+
+    def _persistir(self, cambio):
+        """Relee el archivo, aplica el cambio, descarta lo vencido y lo reemplaza de forma atómica.
+
+        Todo ocurre bajo el bloqueo de ruta.lock, así dos procesos que guardan a la vez
+        no pierden la sesión que abrió o cerró el otro.
+        """
+        try:
+            with _bloqueo_exclusivo(f"{self.ruta}.lock"):
+                entradas = self._leer_archivo()
+                cambio(entradas)
+                ahora = time.time()
+                entradas = {huella: e for huella, e in entradas.items() if e["expira"] > ahora}
+                temporal = f"{self.ruta}.{os.getpid()}.tmp"
+                with open(temporal, "w", encoding="utf-8") as archivo:
+                    json.dump(entradas, archivo)
+                os.replace(temporal, self.ruta)
+        except OSError as e:
+            print(f"[WARN]: No se pudo guardar el archivo de sesiones → {e}")
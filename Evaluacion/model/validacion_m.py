@@ -0,0 +1,155 @@
+import json
+import os
+from datetime import datetime
+
+# Validación en memoria de los lotes de las cargas masivas: los registros se revisan
+# columna por columna antes de que el lote llegue a la BD.
+
+
+class Columna:
+    """Columna de un lote: tipo al que se convierte, si es obligatoria y su valor por defecto.
+
+    tipo es "texto", "entero", "decimal" o "fecha" (YYYY-MM-DD); valores restringe los
+    textos admitidos y recortar=False conserva los espacios de un texto (p. ej. claves).
+    """
+
+    def __init__(self, nombre: str, tipo: str = "texto", obligatoria: bool = False, por_defecto=None,
+                 valores: tuple = None, recortar: bool = True):
+        self.nombre = nombre
+        self.tipo = tipo
+        self.obligatoria = obligatoria
+        self.por_defecto = por_defecto
+        self.valores = valores
+        self.recortar = recortar
+
+
+def _a_texto(valor):
+    texto = str(valor).strip()
+    return texto or None
+
+
+def _a_entero(valor):
+    if isinstance(valor, bool) or (isinstance(valor, float) and not valor.is_integer()):
+        raise ValueError
+    return int(valor.strip()) if isinstance(valor, str) else int(valor)
+
+
+def _a_decimal(valor):
+    if isinstance(valor, bool):
+        raise ValueError
+    return float(valor.strip()) if isinstance(valor, str) else float(valor)
+
+
+def _a_fecha(valor):
+    """Valida la fecha y la devuelve normalizada como texto YYYY-MM-DD, el formato de TO_DATE."""
+    if isinstance(valor, datetime):
+        return valor.strftime("%Y-%m-%d")
+    return datetime.strptime(str(valor).strip(), "%Y-%m-%d").strftime("%Y-%m-%d")
+
+
+_CONVERSORES = {"texto": _a_texto, "entero": _a_entero, "decimal": _a_decimal, "fecha": _a_fecha}
+_DESCRIPCIONES = {"entero": "un entero", "decimal": "un número", "fecha": "una fecha YYYY-MM-DD"}
+
+
+class ValidadorLote:
+    """Convierte y valida un lote completo columna por columna.
+
+    Cada columna se recorre de una vez para todo el lote (conversión de tipos, fechas y
+    valores admitidos); luego, si hay clave, se detectan las repetidas dentro del lote. validar()
+    devuelve los registros limpios, con sus columnas ya convertidas, y los rechazados
+    con el motivo.
+    """
+
+    def __init__(self, columnas: list, clave: tuple = None, mensaje_repetido: str = None):
+        self.columnas = columnas
+        self.clave = clave
+        self.mensaje_repetido = mensaje_repetido
+
+    def validar(self, registros: list):
+        """Devuelve (limpios, rechazados) donde rechazados es una lista de (registro, motivo)."""
+        rechazados = [(r, "el registro no es un objeto") for r in registros if not isinstance(r, dict)]
+        registros = [r for r in registros if isinstance(r, dict)]
+        faltantes = [[] for _ in registros]
+        invalidos = [[] for _ in registros]
+        convertidos = {}
+
+        for columna in self.columnas:
+            conversor = _CONVERSORES[columna.tipo] if columna.recortar else str
+            valores = []
+            for i, registro in enumerate(registros):
+                valor = registro.get(columna.nombre)
+                if valor is not None and not (isinstance(valor, str) and not valor.strip()):
+                    try:
+                        valor = conversor(valor)
+                    except (TypeError, ValueError):
+                        invalidos[i].append(f"{columna.nombre} debe ser {_DESCRIPCIONES[columna.tipo]}")
+                        valor = None
+                    else:
+                        if columna.valores and valor not in columna.valores:
+                            invalidos[i].append(f"{columna.nombre} inválido '{valor}'")
+                elif columna.obligatoria:
+                    faltantes[i].append(columna.nombre)
+                else:
+                    valor = columna.por_defecto
+                valores.append(valor)
+            convertidos[columna.nombre] = valores
+
+        limpios, vistos = [], set()
+        for i, registro in enumerate(registros):
+            if faltantes[i]:
+                rechazados.append((registro, f"faltan campos: {', '.join(faltantes[i])}"))
+                continue
+            if invalidos[i]:
+                rechazados.append((registro, "; ".join(invalidos[i])))
+                continue
+            fila = dict(registro)
+            fila.update((nombre, valores[i]) for nombre, valores in convertidos.items())
+            if self.clave:
+                clave = tuple(fila[c] for c in self.clave)
+                if clave in vistos:
+                    rechazados.append((registro, self.mensaje_repetido))
+                    continue
+                vistos.add(clave)
+            limpios.append(fila)
+        return limpios, rechazados
+
+
+class ArchivoRechazos:
+    """Archivo NDJSON con los registros rechazados por la validación y su motivo.
+
+    Cada línea es el registro original más el campo "_motivo", así el archivo puede
+    corregirse y volver a cargarse con el mismo importador. Se crea solo si hay rechazos.
+    """
+
+    def __init__(self, ruta: str, anexar: bool = False):
+        self.ruta = ruta
+        self.anexar = anexar
+        self.total = 0
+        self._archivo = None
+
+    @classmethod
+    def para(cls, ruta_origen: str, anexar: bool = False):
+        """Ubica el archivo de rechazos junto al archivo de origen."""
+        return cls(f"{os.path.splitext(ruta_origen)[0]}.rechazos.ndjson", anexar)
+
+    def escribir(self, registro, motivo: str):
+        if self._archivo is None:
+            self._archivo = open(self.ruta, "a" if self.anexar else "w", encoding="utf-8")
+        if isinstance(registro, dict):
+            linea = dict(registro, _motivo=motivo)
+        else:
+            linea = {"_registro": registro, "_motivo": motivo}
+        self._archivo.write(json.dumps(linea, ensure_ascii=False, default=str) + "\n")
+        self.total += 1
+
+    def cerrar(self):
+        if self._archivo is not None:
+            self._archivo.close()
+            self._archivo = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+        return False
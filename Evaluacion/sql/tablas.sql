@@ -2,6 +2,8 @@ SELECT * from RR_USUARIO;
 SELECT * from RR_MEDICO;
 
 -- Código para eliminar todas las tablas y constraints residuales
+DROP TABLE rr_version_esquema CASCADE CONSTRAINTS;
+DROP TABLE rr_receta_insumos CASCADE CONSTRAINTS;
 DROP TABLE rr_agenda CASCADE CONSTRAINTS;
 DROP TABLE rr_consultas CASCADE CONSTRAINTS;
 DROP TABLE rr_recetas CASCADE CONSTRAINTS;
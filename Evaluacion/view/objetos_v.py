@@ -1,9 +1,10 @@
-from model.objetos_m import InsumosModel, RecetasModel, ConsultasModel, AgendaModel
+from itertools import chain
+from model.filas_m import FilaInsumo, FilaReceta, FilaConsulta, FilaAgenda
 
 class InsumosView:
     """Vista para mostrar información de insumos médicos."""
 
-    def mostrar_insumo(self, insumo: InsumosModel):
+    def mostrar_insumo(self, insumo: FilaInsumo):
         """
         Muestra en pantalla la información detallada de un insumo específico.
         """
@@ -18,17 +19,20 @@ class InsumosView:
     def mostrar_insumos(self, insumos):
         """
         Muestra en pantalla la información de una lista de insumos.
-        Si la lista está vacía, informa que no hay insumos registrados.
+        Acepta listas o generadores y los recorre una sola vez.
+        Si no hay elementos, informa que no hay insumos registrados.
         """
-        if not insumos:
-            print("[INFO]: No hay insumos registrados.")
+        hay_insumos = False
         for insumo in insumos:
+            hay_insumos = True
             self.mostrar_insumo(insumo)
+        if not hay_insumos:
+            print("[INFO]: No hay insumos registrados.")
 
 
 class RecetasView:
     """Vista para mostrar información de recetas."""
-    def mostrar_receta(self, receta: RecetasModel):
+    def mostrar_receta(self, receta: FilaReceta):
         """Muestra una receta."""
         paciente_nombre = f"{receta.paciente.nombre} {receta.paciente.apellido}" if receta.paciente.nombre else receta.paciente.nombre_usuario
         medico_nombre = f"{receta.medico.nombre} {receta.medico.apellido}" if receta.medico.nombre else receta.medico.nombre_usuario
@@ -39,10 +43,9 @@ class RecetasView:
         print(f"Descripción: {receta.descripcion}")
         print(f"Medicamentos Recetados: {receta.medicamentos_recetados}")
         print(f"Costo: ${receta.costo_clp:,.0f} CLP")
-        insumos = receta.obtener_insumos()
-        if insumos:
+        if receta.insumos:
             print("Insumos asociados:")
-            for insumo, cantidad in insumos:
+            for insumo, cantidad in receta.insumos:
                 costo_insumo_clp = insumo.costo_usd * 950
                 print(f" - {insumo.nombre} ({insumo.tipo}), cantidad: {cantidad}, costo: ${costo_insumo_clp:,.0f} CLP")
         else:
@@ -52,18 +55,21 @@ class RecetasView:
     def mostrar_recetas(self, recetas):
         """
         Muestra en pantalla la información de una lista de recetas.
-        Si la lista está vacía, informa que no hay recetas registradas.
+        Acepta listas o generadores y los recorre una sola vez.
+        Si no hay elementos, informa que no hay recetas registradas.
         """
-        if not recetas:
-            print("[INFO]: No hay recetas registradas.")
+        hay_recetas = False
         for receta in recetas:
+            hay_recetas = True
             self.mostrar_receta(receta)
+        if not hay_recetas:
+            print("[INFO]: No hay recetas registradas.")
 
 
 class ConsultasView:
     """Vista para mostrar información de consultas médicas."""
 
-    def mostrar_consulta(self, consulta: ConsultasModel):
+    def mostrar_consulta(self, consulta: FilaConsulta):
         """
         Muestra en pantalla la información detallada de una consulta médica.
         """
@@ -81,18 +87,21 @@ class ConsultasView:
     def mostrar_consultas(self, consultas):
         """
         Muestra en pantalla la información de una lista de consultas médicas.
-        Si la lista está vacía, informa que no hay consultas registradas.
+        Acepta listas o generadores y los recorre una sola vez.
+        Si no hay elementos, informa que no hay consultas registradas.
         """
-        if not consultas:
-            print("[INFO]: No hay consultas registradas.")
+        hay_consultas = False
         for consulta in consultas:
+            hay_consultas = True
             self.mostrar_consulta(consulta)
+        if not hay_consultas:
+            print("[INFO]: No hay consultas registradas.")
 
 
 class AgendaView:
     """Vista para mostrar información de agendas médicas."""
 
-    def mostrar_agenda(self, agenda: AgendaModel):
+    def mostrar_agenda(self, agenda: FilaAgenda):
         """
         Muestra en pantalla la información detallada de una agenda médica.
         """
@@ -108,9 +117,12 @@ class AgendaView:
     def mostrar_agendas(self, agendas):
         """
         Muestra en pantalla la información de una lista de agendas médicas.
-        Si la lista está vacía, informa que no hay agendas registradas.
+        Acepta listas o generadores y los recorre una sola vez.
+        Si no hay elementos, informa que no hay agendas registradas.
         """
-        if not agendas:
+        agendas = iter(agendas)
+        primera = next(agendas, None)
+        if primera is None:
             print("\n[INFO]: No hay agendas registradas.")
             return
         print("\n" + "="*80)
@@ -118,7 +130,7 @@ class AgendaView:
         print("="*80)
         print(f"{'ID':<5} {'Paciente':<20} {'Médico':<20} {'Fecha Consulta':<20} {'Estado':<10}")
         print("-"*80)
-        for agenda in agendas:
+        for agenda in chain([primera], agendas):
             paciente_display = f"{agenda.paciente.nombre} {agenda.paciente.apellido}" if agenda.paciente.nombre and agenda.paciente.apellido else agenda.paciente.nombre_usuario
             medico_display = f"{agenda.medico.nombre} {agenda.medico.apellido}" if agenda.medico.nombre and agenda.medico.apellido else agenda.medico.nombre_usuario
             print(f"{agenda.id:<5} {paciente_display:<20} {medico_display:<20} {agenda.fecha_consulta.strftime('%Y-%m-%d %H:%M'):<20} {agenda.estado:<10}")
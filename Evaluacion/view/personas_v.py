@@ -1,4 +1,6 @@
 from model.personas_m import PacienteModel, MedicoModel, UsuarioModel
+from model.filas_m import ResumenPaciente
+from view.objetos_v import RecetasView, ConsultasView, AgendaView
 
 class UsuarioView:
     """Vista para mostrar información de usuarios."""
@@ -18,12 +20,15 @@ class UsuarioView:
     def mostrar_usuarios(self, usuarios):
         """
         Muestra en pantalla la información de una lista de usuarios.
-        Si la lista está vacía, informa que no hay usuarios registrados.
+        Acepta listas o generadores y los recorre una sola vez.
+        Si no hay elementos, informa que no hay usuarios registrados.
         """
-        if not usuarios:
-            print("[INFO]: No hay usuarios registrados.")
+        hay_usuarios = False
         for usuario in usuarios:
+            hay_usuarios = True
             self.mostrar_usuario(usuario)
+        if not hay_usuarios:
+            print("[INFO]: No hay usuarios registrados.")
 
 class PacienteView:
     """Vista para mostrar información de pacientes."""
@@ -44,12 +49,28 @@ class PacienteView:
     def mostrar_pacientes(self, pacientes):
         """
         Muestra en pantalla la información de una lista de pacientes.
-        Si la lista está vacía, informa que no hay pacientes registrados.
+        Acepta listas o generadores y los recorre una sola vez.
+        Si no hay elementos, informa que no hay pacientes registrados.
         """
-        if not pacientes:
-            print("[INFO]: No hay pacientes registrados.")
+        hay_pacientes = False
         for paciente in pacientes:
+            hay_pacientes = True
             self.mostrar_paciente(paciente)
+        if not hay_pacientes:
+            print("[INFO]: No hay pacientes registrados.")
+
+    def mostrar_resumen(self, resumen: ResumenPaciente):
+        """
+        Muestra el panel del paciente: sus datos, sus citas pendientes y sus últimas
+        recetas y consultas.
+        """
+        self.mostrar_paciente(resumen.paciente)
+        print(f"\n=== Próximas citas ({len(resumen.agenda)}) ===")
+        AgendaView().mostrar_agendas(resumen.agenda)
+        print(f"\n=== Últimas recetas ({len(resumen.recetas)}) ===")
+        RecetasView().mostrar_recetas(resumen.recetas)
+        print(f"\n=== Últimas consultas ({len(resumen.consultas)}) ===")
+        ConsultasView().mostrar_consultas(resumen.consultas)
 
 
 class MedicoView:
@@ -72,9 +93,12 @@ class MedicoView:
     def mostrar_medicos(self, medicos):
         """
         Muestra en pantalla la información de una lista de médicos.
-        Si la lista está vacía, informa que no hay médicos registrados.
+        Acepta listas o generadores y los recorre una sola vez.
+        Si no hay elementos, informa que no hay médicos registrados.
         """
-        if not medicos:
-            print("[INFO]: No hay médicos registrados.")
+        hay_medicos = False
         for medico in medicos:
+            hay_medicos = True
             self.mostrar_medico(medico)
+        if not hay_medicos:
+            print("[INFO]: No hay médicos registrados.")
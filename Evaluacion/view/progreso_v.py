@@ -0,0 +1,34 @@
+import time
+
+
+class ProgresoView:
+    """Muestra en una sola línea el avance de una carga o exportación en filas por segundo.
+
+    inicial indica las filas ya procesadas en una ejecución anterior (p. ej. al reanudar
+    una importación), que no cuentan para la velocidad.
+    """
+
+    def __init__(self, etiqueta: str, inicial: int = 0, intervalo: float = 0.5):
+        self.etiqueta = etiqueta
+        self.inicial = inicial
+        self.intervalo = intervalo
+        self.filas = inicial
+        self.inicio = time.perf_counter()
+        self._ultimo = 0.0
+
+    def __call__(self, filas: int):
+        """Actualiza la línea de avance, como máximo una vez por intervalo."""
+        self.filas = filas
+        ahora = time.perf_counter()
+        if ahora - self._ultimo >= self.intervalo:
+            self._ultimo = ahora
+            print(f"\r{self._linea(ahora)}", end="", flush=True)
+
+    def terminar(self):
+        """Muestra el total y la velocidad promedio."""
+        print(f"\r{self._linea(time.perf_counter())}")
+
+    def _linea(self, ahora: float) -> str:
+        transcurrido = max(ahora - self.inicio, 1e-9)
+        velocidad = (self.filas - self.inicial) / transcurrido
+        return f"[INFO]: {self.etiqueta}: {self.filas:,} filas ({velocidad:,.0f} filas/s)"